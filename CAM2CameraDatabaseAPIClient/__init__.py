@@ -2,5 +2,21 @@
 Configure init file to allow user to
 'import CAM2CameraDatabaseAPIClient as cam2'
 '''
+import sys
 
+from .auth import TokenStore, FileTokenStore
+from .breaker import CircuitBreaker
+from .bulk import WriteCheckpoint
+from .cache import CameraCache, SQLiteCameraCache
 from .client import Client
+from .codec import JSONCodec, get_codec
+from .compression import TransferStats
+from .ratelimit import RateLimiter, TokenBucket
+from .replica import CameraReplica
+from .retry import RetryPolicy
+from .table import CameraTable
+from .transport import Transport
+from .upsert import UpsertPipeline, UpsertResult
+
+if sys.version_info >= (3, 5):
+    from .async_client import AsyncClient, AsyncTransport
@@ -0,0 +1,456 @@
+"""
+Represents a CAM2 client application for asyncio programs.
+"""
+import asyncio
+from .codec import JSONCodec, get_codec
+from .config import SECRET_LENGTH, CLIENTID_LENGTH, POOL_MAXSIZE, MAX_IN_FLIGHT
+from .error import AuthenticationError, InternalError, InvalidClientIdError, \
+    InvalidClientSecretError, ResourceNotFoundError, FormatError, \
+    AuthorizationError, ResourceConflictError
+from .camera import Camera
+from .client import Client
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncResponse(object):
+    """Class representing a fully read API response.
+
+    Attributes
+    ----------
+    status_code : int
+        HTTP status code of the response.
+    headers : dict
+        Headers of the response.
+    content : bytes
+        Body of the response.
+    json_codec : :obj:`JSONCodec`
+        Codec :meth:`json` decodes the body with.
+    """
+
+    def __init__(self, status_code, headers, content, json_codec=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.json_codec = json_codec or JSONCodec()
+
+    def json(self):
+        return self.json_codec.loads(self.content)
+
+
+class AsyncTransport(object):
+    """Class representing a pooled asyncio HTTP transport backed by aiohttp.
+
+    Attributes
+    ----------
+    limit : int
+        Maximum number of simultaneous connections.
+    limit_per_host : int
+        Maximum number of simultaneous connections to a single host.
+    json_codec : :obj:`JSONCodec`
+        Codec the responses are decoded with, see :func:`get_codec`.
+
+    Note
+    ----
+
+        This transport requires the optional ``aiohttp`` package.
+
+    """
+
+    def __init__(self, limit=MAX_IN_FLIGHT, limit_per_host=POOL_MAXSIZE, json_codec='auto'):
+        if aiohttp is None:
+            raise ImportError('AsyncTransport requires the aiohttp package.')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.json_codec = get_codec(json_codec)
+        self._session = None
+
+    @staticmethod
+    def _form(mapping):
+        # Mirror requests: drop None values and send booleans as 'True'/'False'.
+        if mapping is None:
+            return None
+        return {k: str(v) if isinstance(v, bool) else v
+                for k, v in mapping.items() if v is not None}
+
+    async def request(self, method, url, headers=None, params=None, data=None):
+        """
+        Send a request and read the whole response body.
+
+        Returns
+        -------
+        :obj:`AsyncResponse`
+            Response of the API.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+        async with self._session.request(method, url, headers=headers,
+                                         params=self._form(params),
+                                         data=self._form(data)) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, response.headers, content, self.json_codec)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncClient(object):
+    """Class representing a CAM2 client application for asyncio programs.
+
+    The coroutines of this class mirror the methods of
+    :class:`~CAM2CameraDatabaseAPIClient.client.Client`; please refer to them for the
+    parameters, return values and errors of each route.
+
+    Attributes
+    ----------
+    clientID : str
+        Id of the client application.
+    clientSecret : str
+        Secret of the client application.
+    token : str
+        Token for the client to access the CAM2 database.
+        Concurrent coroutines that find the token missing or expired share a single
+        token request.
+
+        [User does not need to provide this attribute]
+    transport : :obj:`AsyncTransport`
+        Asyncio HTTP transport every request of this client goes through.
+    max_in_flight : int
+        Maximum number of requests this client has in flight at the same time.
+
+    Example
+    -------
+
+        async with AsyncClient(clientID, clientSecret) as client:
+            cameras = await asyncio.gather(*[client.camera_by_id(ID) for ID in cameraIDs])
+
+    """
+
+    base_URL = Client.base_URL
+
+    def __init__(self, clientID, clientSecret, transport=None, max_in_flight=MAX_IN_FLIGHT):
+
+        """AsyncClient initialization method.
+
+        Parameters
+        ----------
+        clientID : str
+            Id of the client application.
+        clientSecret : str
+            Secret of the client application.
+        transport : :obj:`AsyncTransport`, optional
+            Transport to send requests through.
+            A new :obj:`AsyncTransport` is created if not provided.
+        max_in_flight : int, optional
+            Maximum number of requests this client has in flight at the same time.
+
+        Raises
+        ------
+        InvalidClientIdError
+            If the clientID is not in the correct format.
+        InvalidClientSecretError
+            If the client secret is not in the correct format.
+
+        """
+        if len(clientID) != CLIENTID_LENGTH:
+            raise InvalidClientIdError
+        if len(clientSecret) < SECRET_LENGTH:
+            raise InvalidClientSecretError
+        self.clientID = clientID
+        self.clientSecret = clientSecret
+        self.token = None
+        self._owns_transport = transport is None
+        self.transport = AsyncTransport() if transport is None else transport
+        self.max_in_flight = max_in_flight
+        self._loop = None
+        self._in_flight = None
+        self._token_lock = None
+
+    async def close(self):
+        """
+        Release the connections held by this client.
+        A transport passed in by the caller is left open.
+        """
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _bind_loop(self):
+        # Before Python 3.10, a semaphore or lock belongs to the event loop current
+        # when it is created, so they are created in the running loop, once per loop.
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._token_lock = asyncio.Lock()
+
+    def header_builder(self):
+        head = {'Authorization': 'Bearer ' + str(self.token)}
+        return head
+
+    async def _request_token(self):
+        url = self.base_URL + 'auth'
+        param = {'clientID': self.clientID, 'clientSecret': self.clientSecret}
+        async with self._in_flight:
+            response = await self.transport.request('GET', url, params=param)
+        if response.status_code == 200:
+            self.token = response.json()['token']
+        elif response.status_code == 404:
+            raise ResourceNotFoundError(response.json()['message'])
+        elif response.status_code == 401:
+            raise AuthenticationError(response.json()['message'])
+        else:
+            raise InternalError()
+
+    async def _refresh_token(self, stale_token):
+        # Only the first coroutine holding the stale token asks for a new one,
+        # the others wait on the lock and reuse its result.
+        self._bind_loop()
+        async with self._token_lock:
+            if self.token == stale_token:
+                await self._request_token()
+
+    async def _send(self, method, url, params=None, data=None):
+        self._bind_loop()
+        if self.token is None:
+            await self._refresh_token(None)
+        counter = 0
+        while True:
+            token = self.token
+            async with self._in_flight:
+                response = await self.transport.request(method, url,
+                                                        headers=self.header_builder(),
+                                                        params=params, data=data)
+            if response.status_code != 401 or counter >= 2 or \
+                    response.json()['message'] != 'Token expired.':
+                return response
+            await self._refresh_token(token)
+            counter += 1
+
+    # Functions for webUI
+
+    async def register(self, owner, permissionLevel='user'):
+        """
+        Create a client to use CamraDatabaseAPI.
+        See :meth:`Client.register`.
+        """
+        url = self.base_URL + 'apps/register'
+        data = {'owner': owner, 'permissionLevel': permissionLevel}
+        response = await self._send('POST', url, data=data)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['clientID'], response.json()['clientSecret']
+
+    async def update_owner(self, clientID, owner):
+        """
+        Update owner's username for the given clientID.
+        See :meth:`Client.update_owner`.
+        """
+        url = self.base_URL + 'apps/' + clientID
+        response = await self._send('PUT', url, data={'owner': owner})
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['message']
+
+    async def update_permission(self, clientID, permissionLevel):
+        """
+        Update owner's permissionLevel for the given clientID.
+        See :meth:`Client.update_permission`.
+        """
+        url = self.base_URL + 'apps/' + clientID
+        response = await self._send('PUT', url, data={'permissionLevel': permissionLevel})
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['message']
+
+    async def reset_secret(self, clientID):
+        """
+        Reset client secret.
+        See :meth:`Client.reset_secret`.
+        """
+        url = self.base_URL + 'apps/' + clientID + '/secret'
+        response = await self._send('PUT', url)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['clientSecret']
+
+    async def client_ids_by_owner(self, owner):
+        """
+        Get all client ids for a specific owner.
+        See :meth:`Client.client_ids_by_owner`.
+        """
+        url = self.base_URL + 'apps/by-owner'
+        response = await self._send('GET', url, params={'owner': owner})
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            else:
+                raise InternalError()
+        return [ct['clientID'] for ct in response.json()]
+
+    async def usage_by_client(self, clientID, owner):
+        """
+        Get number of API requests made by a given clientID.
+        See :meth:`Client.usage_by_client`.
+        """
+        url = self.base_URL + 'apps/' + clientID + '/usage'
+        response = await self._send('GET', url, params={'owner': owner})
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 403:
+                raise AuthorizationError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['api_usage']
+
+    async def write_camera(self, **kwargs):
+        """
+        Add or update camera in the database.
+        See :meth:`Client.write_camera`.
+        """
+        Client._check_args(kwargs=kwargs, legal_args=Client._camera_fields)
+        operation, url, data = Client._camera_payload(
+            kwargs, getattr(self.transport, 'json_codec', JSONCodec()).dumps)
+        response = await self._send(operation, url, data=data)
+
+        if response.status_code != 201 and response.status_code != 200:
+            if response.status_code == 403:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            elif response.status_code == 409:
+                raise ResourceConflictError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()['cameraID']
+
+    async def _camera_by_url(self, url):
+        response = await self._send('GET', url)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 404:
+                raise ResourceNotFoundError(response.json()['message'])
+            elif response.status_code == 403:
+                raise AuthorizationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+        return Camera.process_json_entry(response.json())
+
+    async def camera_by_id(self, cameraID):
+        """
+        Get a camera object by using camera's ID.
+        See :meth:`Client.camera_by_id`.
+        """
+        return await self._camera_by_url(self.base_URL + 'cameras/' + cameraID)
+
+    async def camera_by_legacy_id(self, legacy_cameraID):
+        """
+        Get a camera object by using camera's legacy ID.
+        See :meth:`Client.camera_by_legacy_id`.
+        """
+        return await self._camera_by_url(self.base_URL + 'cameras/legacy/' + legacy_cameraID)
+
+    async def camera_by_list_id(self, cameraID_list=None, legacy_cameraID_list=None):
+        """
+        Get a list of camera objects concurrently, in the order of the given IDs.
+        See :meth:`Client.camera_by_list_id`.
+        """
+        lookups = [self.camera_by_id(ID) for ID in cameraID_list or []]
+        lookups += [self.camera_by_legacy_id(ID) for ID in legacy_cameraID_list or []]
+        return list(await asyncio.gather(*lookups))
+
+    async def search_camera(self, **kwargs):
+        """
+        Search camera by attributes and location.
+        See :meth:`Client.search_camera`.
+        """
+        Client._check_args(kwargs, Client._search_fields)
+        kwargs['type'] = kwargs.pop('camera_type', None)
+        search_params = {k: v for k, v in kwargs.items() if v is not None}
+
+        response = await self._send('GET', self.base_URL + 'cameras/search',
+                                    params=search_params)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+        return Camera.process_json_array(response.json())
+
+    async def check_cam_exist(self, camera_type, **kwargs):
+        """
+        Get camera objects that have the given retrieval method.
+        See :meth:`Client.check_cam_exist`.
+        """
+        Client._check_args(kwargs, Client._retrieval_fields)
+        kwargs['type'] = camera_type
+
+        response = await self._send('GET', self.base_URL + 'cameras/exist', params=kwargs)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+        return Camera.process_json_array(response.json())
+
+    async def get_change_log(self, start=None, end=None, offset=None):
+        """
+        Get change_log for a specific time period.
+        See :meth:`Client.get_change_log`.
+        """
+        param = {'start': start,
+                 'end': end,
+                 'offset': offset}
+        response = await self._send('GET', self.base_URL + 'apps/db-change', params=param)
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+        return response.json()
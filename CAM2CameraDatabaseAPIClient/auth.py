@@ -0,0 +1,126 @@
+"""
+Helpers to manage the access tokens of a CAM2 client application.
+"""
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from .config import TOKEN_LIFETIME
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def token_expiry(token, issued_at):
+    """Compute when a token expires.
+
+    Parameters
+    ----------
+    token : str
+        Token returned by the API.
+    issued_at : float
+        Time the token was received, in seconds since the epoch.
+
+    Returns
+    -------
+    float
+        Expiration time of the token in seconds since the epoch. This is the ``exp``
+        claim if the token is a JWT carrying one, otherwise ``issued_at`` plus the
+        lifetime of API tokens.
+
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode('ascii')).decode('utf-8'))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+        return issued_at + TOKEN_LIFETIME
+
+
+class TokenStore(object):
+    """Class representing a place where clients share their tokens.
+
+    Clients created with the same clientID and the same token store reuse a valid
+    token saved by any of them instead of requesting their own.
+    Subclass it and override :meth:`load`, :meth:`save` and optionally :meth:`lock`
+    to share tokens through another medium.
+    """
+
+    def load(self, clientID):
+        """
+        Return the saved ``(token, expiry)`` of a client, or None if there is none.
+        """
+        raise NotImplementedError
+
+    def save(self, clientID, token, expiry):
+        """
+        Save the token of a client and its expiration time in seconds since the epoch.
+        """
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def lock(self, clientID):
+        """
+        Context manager held while a client checks the store and requests a new token,
+        so that only one of the clients sharing the store requests it.
+        The default implementation does not lock.
+        """
+        yield
+
+
+class FileTokenStore(TokenStore):
+    """Class representing a token store shared by the processes of a node.
+
+    Each clientID is saved in its own file under the cache directory, named after a
+    hash of the clientID. Access is serialized with an advisory file lock
+    (not available on Windows, where the store works without locking).
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory holding the token files.
+    """
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                                     os.path.join(os.path.expanduser('~'), '.cache'),
+                                     'cam2')
+        self.cache_dir = cache_dir
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0o700)
+
+    def _path(self, clientID):
+        return os.path.join(self.cache_dir,
+                            hashlib.sha256(clientID.encode('utf-8')).hexdigest())
+
+    def load(self, clientID):
+        try:
+            with open(self._path(clientID) + '.json') as token_file:
+                saved = json.load(token_file)
+            return saved['token'], saved['expiry']
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+    def save(self, clientID, token, expiry):
+        path = self._path(clientID) + '.json'
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(handle, 'w') as token_file:
+            json.dump({'token': token, 'expiry': expiry}, token_file)
+        getattr(os, 'replace', os.rename)(temp_path, path)
+
+    @contextlib.contextmanager
+    def lock(self, clientID):
+        with open(self._path(clientID) + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
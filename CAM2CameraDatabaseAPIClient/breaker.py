@@ -0,0 +1,155 @@
+"""
+Circuit breaking of the requests sent to an unavailable CAM2 Database API.
+"""
+import threading
+import time
+from .config import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+from .error import CircuitOpenError
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker(object):
+    """Class representing circuit breakers protecting the API and the caller from
+    requests that are bound to fail.
+
+    Each route family, named after the first segment of the route ('auth', 'cameras'
+    or 'apps'), has its own circuit. A circuit is closed while requests succeed.
+    After ``failure_threshold`` consecutive failures, which are connection errors,
+    timeouts and 5xx responses, it opens: requests of the family fail at once with
+    :obj:`CircuitOpenError` instead of waiting for a timeout. After ``reset_timeout``
+    seconds the circuit is half-open and lets a single probe request through; the
+    circuit closes if the probe succeeds and opens again if it fails.
+
+    A circuit breaker is set on a :obj:`Transport`, or through the ``circuit_breaker``
+    argument of :obj:`Client`.
+
+    Attributes
+    ----------
+    failure_threshold : int
+        Number of consecutive failures that open a circuit.
+    reset_timeout : float
+        Number of seconds a circuit stays open before a probe.
+
+    Example
+    -------
+
+        breaker = CircuitBreaker(failure_threshold=3)
+        client = Client(clientID, clientSecret, circuit_breaker=breaker)
+        ...
+        print(breaker.states()['cameras']['state'])
+
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clock():
+        return getattr(time, 'monotonic', time.time)()
+
+    @staticmethod
+    def route_family(url):
+        """
+        Return the route family of a url.
+        """
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        return segments[0] if segments else ''
+
+    def _circuit(self, family):
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = {'state': CLOSED, 'failures': 0, 'opened_at': None, 'trips': 0,
+                       'probe': None}
+            self._circuits[family] = circuit
+        return circuit
+
+    def before_request(self, family):
+        """
+        Check that a request of the route family may be sent.
+
+        Returns
+        -------
+        object
+            A token marking the request as the probe of a half-open circuit, to be
+            passed to :meth:`record`, or None for a request of a closed circuit.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit of the family is open, or half-open with a probe in flight.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            if circuit['state'] == CLOSED:
+                return None
+            remaining = circuit['opened_at'] + self.reset_timeout - self._clock()
+            if circuit['state'] == OPEN and remaining <= 0:
+                circuit['state'] = HALF_OPEN
+            if circuit['state'] == HALF_OPEN and circuit['probe'] is None:
+                circuit['probe'] = object()
+                return circuit['probe']
+            raise CircuitOpenError(family, max(0, remaining))
+
+    def record(self, family, success, probe=None):
+        """
+        Record the outcome of a request of the route family: True if the API answered,
+        False if it failed, None if the request was given up for another reason.
+
+        Only the probe, identified by the token :meth:`before_request` returned for it,
+        decides whether a half-open circuit closes. Requests started before the circuit
+        opened do not change it once it is open.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            if probe is not None:
+                if probe is not circuit['probe']:
+                    return
+                circuit['probe'] = None
+            elif circuit['state'] != CLOSED:
+                return
+            if success is None:
+                return
+            if success:
+                circuit['state'] = CLOSED
+                circuit['failures'] = 0
+                return
+            circuit['failures'] += 1
+            if circuit['state'] == HALF_OPEN or \
+                    circuit['failures'] >= self.failure_threshold:
+                circuit['trips'] += 1
+                circuit['state'] = OPEN
+                circuit['opened_at'] = self._clock()
+
+    def states(self):
+        """
+        Return the state of the circuit of each route family that sent a request.
+
+        Returns
+        -------
+        dict
+            For each route family, a dict with 'state', one of 'closed', 'open' and
+            'half_open', 'failures', the number of consecutive failures, and 'trips',
+            the number of times the circuit opened.
+        """
+        with self._lock:
+            result = {}
+            for family, circuit in self._circuits.items():
+                state = circuit['state']
+                if state == OPEN and \
+                        circuit['opened_at'] + self.reset_timeout <= self._clock():
+                    state = HALF_OPEN
+                result[family] = {'state': state, 'failures': circuit['failures'],
+                                  'trips': circuit['trips']}
+            return result
@@ -0,0 +1,75 @@
+"""
+Helpers for writing many cameras to the CAM2 Database API at once.
+"""
+import hashlib
+import json
+import os
+import threading
+
+
+def row_digest(row):
+    """
+    Return a digest identifying the content of a camera row.
+    """
+    encoded = json.dumps(row, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class WriteCheckpoint(object):
+    """Class representing the progress of a bulk camera write, saved to a file.
+
+    Every camera written successfully is appended to the file as one JSON line
+    holding its row index, a digest of the row and the cameraID the API returned.
+    When a bulk write is run again with the same file, rows found in it with an
+    identical content are not sent again.
+
+    Attributes
+    ----------
+    path : str
+        Path of the checkpoint file. It is created if it does not exist.
+
+    Example
+    -------
+
+        results = client.write_cameras(rows, checkpoint='onboarding.checkpoint')
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._done = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as checkpoint_file:
+                for line in checkpoint_file:
+                    try:
+                        index, digest, cameraID = json.loads(line)
+                    except ValueError:
+                        # Last line cut short by a crash while it was written.
+                        continue
+                    self._done[index] = (digest, cameraID)
+
+    def __len__(self):
+        return len(self._done)
+
+    def lookup(self, index, row):
+        """
+        Return the cameraID recorded for a row, or None if it was not written.
+        """
+        digest, cameraID = self._done.get(index, (None, None))
+        if digest is not None and digest == row_digest(row):
+            return cameraID
+        return None
+
+    def record(self, index, row, cameraID):
+        """
+        Save that a row was written as the camera cameraID.
+        """
+        digest = row_digest(row)
+        line = json.dumps([index, digest, cameraID]) + '\n'
+        with self._lock:
+            self._done[index] = (digest, cameraID)
+            with open(self.path, 'a') as checkpoint_file:
+                checkpoint_file.write(line)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
@@ -0,0 +1,220 @@
+"""
+Represents caches of camera lookups made by a CAM2 client application.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .camera import IPCamera, NonIPCamera, StreamCamera, IPCameraRecord, \
+    NonIPCameraRecord, StreamCameraRecord
+from .config import CACHE_TTL, CACHE_MAXSIZE, CACHE_MAX_AGE
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class CameraCache(object):
+    """Class representing an in-memory cache of camera lookups.
+
+    Results of ``camera_by_id``, ``camera_by_legacy_id`` and ``check_cam_exist`` are kept
+    for ``ttl`` seconds. Once ``maxsize`` lookups are cached, the least recently used one
+    is evicted. Cached cameras are shared between callers and should not be modified.
+
+    Attributes
+    ----------
+    ttl : float
+        Number of seconds a lookup stays valid.
+    maxsize : int
+        Maximum number of lookups kept.
+    hits : int
+        Number of lookups answered from the cache.
+    misses : int
+        Number of lookups that had to be sent to the API.
+
+    Example
+    -------
+
+        client = Client(clientID, clientSecret, cache=CameraCache(ttl=60, maxsize=5000))
+
+    """
+
+    def __init__(self, ttl=CACHE_TTL, maxsize=CACHE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the cached result of a lookup, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= _clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.pop(key)
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """
+        Cache the result of a lookup.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (_clock() + self.ttl, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def set_many(self, items):
+        """
+        Cache the results of several lookups given as ``(key, value)`` pairs.
+        """
+        for key, value in items:
+            self.set(key, value)
+
+    def invalidate_camera(self, cameraID=None):
+        """
+        Drop every lookup that may return a camera that was just added or updated.
+
+        Parameters
+        ----------
+        cameraID : str, optional
+            Id of the updated camera. Not provided when a camera was added.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                value = self._entries[key][1]
+                if key[0] == 'exist' or \
+                        (cameraID is not None and value.get('cameraID') == cameraID):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_CAMERA_CLASSES = {cls.__name__: cls for cls in (IPCamera, NonIPCamera, StreamCamera,
+                                                  IPCameraRecord, NonIPCameraRecord,
+                                                  StreamCameraRecord)}
+
+
+def _dump(value):
+    if isinstance(value, list):
+        return json.dumps([(type(camera).__name__, camera.to_dict()) for camera in value])
+    return json.dumps((type(value).__name__, value.to_dict()))
+
+
+def _load(value):
+    value = json.loads(value)
+    if not value or isinstance(value[0], list):
+        return [_CAMERA_CLASSES[name](**camera) for name, camera in value]
+    return _CAMERA_CLASSES[value[0]](**value[1])
+
+
+class SQLiteCameraCache(object):
+    """Class representing a persistent cache of camera lookups stored in SQLite.
+
+    It is used like :class:`CameraCache` but survives restarts: cameras fetched by
+    ``camera_by_id``, ``camera_by_legacy_id``, ``camera_by_list_id``, ``search_camera``
+    and ``check_cam_exist`` are stored in the database file and served to later
+    lookups, including those of new processes, until they are ``max_age`` seconds old.
+
+    Attributes
+    ----------
+    path : str
+        Path of the SQLite database file.
+    max_age : float
+        Number of seconds a stored lookup is served before being fetched again.
+    hits : int
+        Number of lookups answered from the cache by this object.
+    misses : int
+        Number of lookups that had to be sent to the API.
+
+    Example
+    -------
+
+        cache = SQLiteCameraCache('/var/cache/cam2/cameras.db', max_age=3600)
+        client = Client(clientID, clientSecret, cache=cache)
+
+    """
+
+    def __init__(self, path, max_age=CACHE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS cameras (key TEXT PRIMARY KEY, kind TEXT, '
+                'cameraID TEXT, stored_at REAL, value TEXT)')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS cameras_cameraID ON cameras (cameraID)')
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM cameras').fetchone()[0]
+
+    def get(self, key):
+        """
+        Return the stored result of a lookup, or None if it is missing or too old.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT stored_at, value FROM cameras WHERE key = ?',
+                                           (json.dumps(key),)).fetchone()
+            if row is None or row[0] + self.max_age <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _load(row[1])
+
+    def set(self, key, value):
+        """
+        Store the result of a lookup.
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        """
+        Store the results of several lookups given as ``(key, value)`` pairs
+        in a single transaction.
+        """
+        now = time.time()
+        rows = [(json.dumps(key), key[0],
+                 None if isinstance(value, list) else value.get('cameraID'),
+                 now, _dump(value)) for key, value in items]
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO cameras VALUES (?, ?, ?, ?, ?)',
+                                         rows)
+
+    def invalidate_camera(self, cameraID=None):
+        """
+        Drop every lookup that may return a camera that was just added or updated.
+
+        Parameters
+        ----------
+        cameraID : str, optional
+            Id of the updated camera. Not provided when a camera was added.
+        """
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM cameras WHERE kind = ? OR cameraID = ?',
+                                     ('exist', cameraID))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM cameras')
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
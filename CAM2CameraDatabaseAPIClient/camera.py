@@ -1,6 +1,17 @@
 """
 Represents a camera.
 """
+import sys
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern  # pylint: disable=undefined-variable
 
 class Camera(dict):
 
@@ -34,18 +45,69 @@ class Camera(dict):
     """
     @staticmethod
     def process_json(**dict_entries):
-        dict_entries['camera_type'] = dict_entries['type']
-        dict_entries.pop('type', None)
-        dict_entries.update(dict_entries['retrieval'])
-        dict_entries.pop('retrieval', None)
-
-        if dict_entries['camera_type'] == 'ip':
-            return IPCamera(**dict_entries)
-        if dict_entries['camera_type'] == 'non_ip':
-            return NonIPCamera(**dict_entries)
-        if dict_entries['camera_type'] == 'stream':
-            return StreamCamera(**dict_entries)
-        return None
+        return Camera.process_json_entry(dict_entries)
+
+    @staticmethod
+    def process_json_entry(entry):
+        """
+        Build a camera from one camera of an API response, as parsed JSON.
+
+        Parameters
+        ----------
+        entry : dict
+            Camera with 'type' and 'retrieval' fields. It is not modified.
+
+        Returns
+        -------
+        :obj:`Camera`
+            Instance of the subclass matching the type, or None for an unknown type.
+        """
+        camera_class = _CAMERA_TYPES.get(entry['type'])
+        if camera_class is None:
+            return None
+        camera = camera_class(entry)
+        camera['camera_type'] = camera.pop('type')
+        retrieval = camera.pop('retrieval', None)
+        if retrieval:
+            camera.update(retrieval)
+        return camera
+
+    @staticmethod
+    def process_json_array(camera_response_array):
+        """
+        Build the cameras of an API response in one pass.
+
+        Parameters
+        ----------
+        camera_response_array : list of dict
+            Cameras with 'type' and 'retrieval' fields. They are not modified.
+
+        Returns
+        -------
+        list
+            :obj:`Camera` of each entry, in order, None for an unknown type.
+        """
+        types = _CAMERA_TYPES
+        cameras = []
+        append = cameras.append
+        for entry in camera_response_array:
+            camera_class = types.get(entry['type'])
+            if camera_class is None:
+                append(None)
+                continue
+            camera = camera_class(entry)
+            camera['camera_type'] = camera.pop('type')
+            retrieval = camera.pop('retrieval', None)
+            if retrieval:
+                camera.update(retrieval)
+            append(camera)
+        return cameras
+
+    def to_dict(self):
+        """
+        Return the fields of the camera as a plain dict.
+        """
+        return dict(self)
 
 class IPCamera(Camera):
     """Represent a single ip camera.
@@ -78,3 +140,265 @@ class StreamCamera(Camera):
     ----------
     m3u8_url : str
     """
+
+
+_RECORD_FIELDS = ('cameraID', 'legacy_cameraID', 'camera_type', 'source', 'frame_rate',
+                  'country', 'state', 'city', 'longitude', 'latitude', 'is_active_image',
+                  'is_active_video', 'resolution_width', 'resolution_height', 'utc_offset',
+                  'timezone_id', 'timezone_name', 'reference_logo', 'reference_url')
+
+_INTERNED_FIELDS = frozenset(['camera_type', 'source', 'country', 'state', 'city',
+                              'timezone_id', 'timezone_name', 'reference_logo', 'brand',
+                              'model'])
+
+
+def _record_layout(fields):
+    # Where each field of a record is read from in a camera of an API response:
+    # (field, key, whether the key is in 'retrieval', whether the value is interned).
+    return tuple((field, 'type' if field == 'camera_type' else field,
+                  field not in _RECORD_FIELDS, field in _INTERNED_FIELDS)
+                 for field in fields)
+
+
+class CameraRecord(object):
+    """Class representing a general camera in a compact form.
+
+    Unlike :class:`Camera`, a record is not a dict: its fields are stored in slots,
+    which takes a fraction of the memory when many cameras are held at once.
+    Fields are read as attributes or by indexing, and repeated strings such as
+    ``country``, ``state`` or ``timezone_name`` are shared between records.
+    Fields that are not documented for the type of camera are dropped.
+
+    Records are returned by :class:`~CAM2CameraDatabaseAPIClient.client.Client`
+    created with ``record_format='compact'``.
+
+    Attributes
+    ----------
+    Same as :class:`Camera`.
+    """
+
+    __slots__ = _RECORD_FIELDS
+
+    _interned = _INTERNED_FIELDS
+
+    _fields = __slots__
+
+    _layout = _record_layout(_fields)
+
+    def __init__(self, **fields):
+        for field in self._fields:
+            value = fields.get(field)
+            if field in self._interned and type(value) is str:
+                value = _intern(value)
+            setattr(self, field, value)
+
+    @staticmethod
+    def process_json(**dict_entries):
+        return CameraRecord.process_json_entry(dict_entries)
+
+    @staticmethod
+    def process_json_entry(entry):
+        """
+        Build a record from one camera of an API response, as parsed JSON.
+
+        See :meth:`Camera.process_json_entry`.
+        """
+        record_class = _RECORD_TYPES.get(entry.get('type'))
+        if record_class is None:
+            return None
+        return record_class._from_entry(entry)
+
+    @staticmethod
+    def process_json_array(camera_response_array):
+        """
+        Build the records of an API response in one pass.
+
+        See :meth:`Camera.process_json_array`.
+        """
+        types = _RECORD_TYPES
+        return [types[entry.get('type')]._from_entry(entry)
+                if entry.get('type') in types else None
+                for entry in camera_response_array]
+
+    @classmethod
+    def _from_entry(cls, entry):
+        record = cls.__new__(cls)
+        retrieval = entry.get('retrieval') or {}
+        for field, key, in_retrieval, interned in cls._layout:
+            value = retrieval.get(key) if in_retrieval else entry.get(key)
+            if interned and type(value) is str:
+                value = _intern(value)
+            setattr(record, field, value)
+        return record
+
+    def to_dict(self):
+        """
+        Return the fields of the camera as a plain dict.
+        """
+        return {field: getattr(self, field) for field in self._fields}
+
+    def get(self, field, default=None):
+        if field not in self._fields:
+            return default
+        return getattr(self, field, default)
+
+    def __getitem__(self, field):
+        # Only fields are items, not methods or class attributes, as in a Camera dict.
+        if field not in self._fields:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __eq__(self, other):
+        if isinstance(other, CameraRecord):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        for field, value in state.items():
+            setattr(self, field, value)
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + repr(self.to_dict()) + ')'
+
+class IPCameraRecord(CameraRecord):
+    """Represent a single ip camera in a compact form.
+    This is a subclass of CameraRecord.
+
+    Attributes
+    ----------
+    Same as :class:`IPCamera`.
+    """
+
+    __slots__ = ('ip', 'port', 'brand', 'model', 'image_path', 'video_path')
+    _fields = CameraRecord.__slots__ + __slots__
+    _layout = _record_layout(_fields)
+
+class NonIPCameraRecord(CameraRecord):
+    """Represent a single non-ip camera in a compact form.
+    This is a subclass of CameraRecord.
+
+    Attributes
+    ----------
+    Same as :class:`NonIPCamera`.
+    """
+
+    __slots__ = ('snapshot_url',)
+    _fields = CameraRecord.__slots__ + __slots__
+    _layout = _record_layout(_fields)
+
+class StreamCameraRecord(CameraRecord):
+    """Represent a single stream camera in a compact form.
+    This is a subclass of CameraRecord.
+
+    Attributes
+    ----------
+    Same as :class:`StreamCamera`.
+    """
+
+    __slots__ = ('m3u8_url',)
+    _fields = CameraRecord.__slots__ + __slots__
+    _layout = _record_layout(_fields)
+
+
+
+class LazyCameraList(Sequence):
+    """Class representing the cameras of a response, decoded only when accessed.
+
+    The response is kept as parsed JSON, and each camera is built the first time it
+    is read, then kept. Cameras that are never read are never built, so filtering a
+    large result with :meth:`filter`, which sees the parsed JSON, costs only the
+    cameras that are kept.
+
+    Returned by :meth:`~CAM2CameraDatabaseAPIClient.client.Client.search_camera`
+    with ``lazy=True``.
+
+    Parameters
+    ----------
+    camera_response_array : list of dict
+        Cameras as returned by the API, with 'type' and 'retrieval' fields.
+    record_class : type, optional
+        :obj:`Camera` or :obj:`CameraRecord`, the form of the cameras built.
+
+    Example
+    -------
+
+        cameras = client.search_camera(country='USA', lazy=True)
+        ids = [entry['cameraID'] for entry in cameras.raw()]
+        streams = cameras.filter(lambda entry: entry['type'] == 'stream')
+        first = streams[0]
+
+    """
+
+    _missing = object()
+
+    def __init__(self, camera_response_array, record_class=Camera):
+        self._entries = camera_response_array
+        self._cameras = [self._missing] * len(camera_response_array)
+        self._record_class = record_class
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sub_list = type(self)(self._entries[index], self._record_class)
+            sub_list._cameras = self._cameras[index]
+            return sub_list
+        camera = self._cameras[index]
+        if camera is self._missing:
+            camera = self._record_class.process_json_entry(self._entries[index])
+            self._cameras[index] = camera
+        return camera
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + str(len(self)) + ' cameras)'
+
+    def raw(self, index=None):
+        """
+        Return the parsed JSON of a camera, or the list of all of them if no index
+        is given. The returned entries must not be modified.
+        """
+        if index is None:
+            return self._entries
+        return self._entries[index]
+
+    def filter(self, predicate):
+        """
+        Return the list of the cameras whose parsed JSON satisfies the predicate.
+
+        Parameters
+        ----------
+        predicate : callable
+            Called with the parsed JSON of each camera, see :meth:`raw`.
+
+        Returns
+        -------
+        :obj:`LazyCameraList`
+        """
+        indexes = [index for index, entry in enumerate(self._entries) if predicate(entry)]
+        sub_list = type(self)([self._entries[index] for index in indexes],
+                              self._record_class)
+        sub_list._cameras = [self._cameras[index] for index in indexes]
+        return sub_list
+
+    def materialize(self):
+        """
+        Return all the cameras as a plain list.
+        """
+        return [self[index] for index in range(len(self))]
+
+
+_CAMERA_TYPES = {'ip': IPCamera, 'non_ip': NonIPCamera, 'stream': StreamCamera}
+
+_RECORD_TYPES = {'ip': IPCameraRecord, 'non_ip': NonIPCameraRecord, 'stream': StreamCameraRecord}
@@ -2,12 +2,24 @@
 Represents a CAM2 client application.
 """
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from .config import SECRET_LENGTH, CLIENTID_LENGTH
-from .error import AuthenticationError, InternalError, InvalidClientIdError, \
+from .config import SECRET_LENGTH, CLIENTID_LENGTH, MAX_WORKERS, SEARCH_PAGE_SIZE, \
+    STREAM_CHUNK_SIZE, TOKEN_REFRESH_MARGIN
+from .error import Error, AuthenticationError, InternalError, InvalidClientIdError, \
     InvalidClientSecretError, ResourceNotFoundError, FormatError, \
-    AuthorizationError, ResourceConflictError
-from .camera import Camera
+    AuthorizationError, ResourceConflictError, DeadlineExceededError
+from .auth import token_expiry
+from .bulk import WriteCheckpoint
+from .camera import Camera, CameraRecord, LazyCameraList
+from .coalesce import SingleFlight
+from .paging import iter_pages, fetch_all_pages, future_result, ChangeLogIterator
+from .ratelimit import TokenBucket
+from .streaming import iter_json_array
+from .table import CameraTable
+from .transport import Transport
 
 
 class Client(object):
@@ -22,9 +34,17 @@ class Client(object):
         Secret of the client application.
     token : str
         Token for the client to access the CAM2 database.
-        Each token expires in 5 minutes.
+        Each token expires in 5 minutes. The client requests a new token in the
+        background shortly before the current one expires.
 
         [User does not need to provide this attribute]
+    token_expiry : float
+        Expiration time of the token in seconds since the epoch,
+        or None if the token was not requested by this client.
+    transport : :obj:`Transport`
+        Pooled HTTP transport every request of this client goes through.
+    cache : :obj:`CameraCache` or :obj:`SQLiteCameraCache`
+        Cache of camera lookups, or None if lookups are not cached.
 
     Note
     ----
@@ -68,6 +88,19 @@ class Client(object):
          existence function.
     """
 
+    _required_retrieval_fields = {'ip': 'ip', 'non_ip': 'snapshot_url', 'stream': 'm3u8_url'}
+
+    """
+    dict: Static private variable to store the retrieval field required to add each type
+          of camera.
+    """
+
+    _record_classes = {'dict': Camera, 'compact': CameraRecord}
+
+    """
+    dict: Static private variable to store the camera class of each record format.
+    """
+
     @staticmethod
     def _check_args(kwargs, legal_args):
 
@@ -75,18 +108,97 @@ class Client(object):
         if illegal_args:
             raise FormatError('Keywords ' + str(list(illegal_args)) + ' are not defined.')
 
-    def _check_token(self, response, flag, url, data=None, params=None):
+    @staticmethod
+    def check_camera(camera):
+        """
+        Check the keyword arguments of :meth:`write_camera` for a camera without sending
+        anything, so that bad rows of an import are found before any camera is written.
+
+        Parameters
+        ----------
+        camera : dict
+            Keyword arguments of :meth:`write_camera`.
+
+        Raises
+        ------
+        FormatError
+            If there are unexpected keywords in camera.
+
+            Or camera_type is not 'ip', 'non_ip' or 'stream'.
+
+            Or camera_type is not provided when adding a camera or updating its
+            retrieval fields.
+
+            Or the retrieval field required by the camera type is not provided when
+            adding a camera: ip, snapshot_url or m3u8_url.
+        """
+        Client._check_args(kwargs=camera, legal_args=Client._camera_fields)
+        camera_type = camera.get('camera_type')
+        adding = camera.get('cameraID') is None
+        if camera_type is None:
+            if adding:
+                raise FormatError('camera_type is required to add a camera.')
+            if any(camera.get(field) is not None for field in Client._retrieval_fields):
+                raise FormatError('camera_type is required to update retrieval fields.')
+            return
+        if camera_type not in Client._required_retrieval_fields:
+            raise FormatError('camera_type should be one of ' +
+                              str(sorted(Client._required_retrieval_fields)) + '.')
+        required = Client._required_retrieval_fields[camera_type]
+        if adding and camera.get(required) is None:
+            raise FormatError(required + ' is required to add a ' + camera_type + ' camera.')
+
+    @staticmethod
+    def _camera_payload(kwargs, dumps=json.dumps):
+        """Translate write_camera keywords into the operation, url and form data to send.
+        The retrieval fields of the camera are packed into a json encoded 'retrieval' field.
+        """
+        kwargs = dict(kwargs)
+        operation = 'POST' if kwargs.get('cameraID') is None else 'PUT'
+
+        if kwargs.get('camera_type') == 'ip':
+            kwargs['retrieval'] = {
+                'ip': kwargs.pop('ip', None),
+                'port': kwargs.pop('port', None),
+                'brand': kwargs.pop('brand', None),
+                'model': kwargs.pop('model', None),
+                'image_path': kwargs.pop('image_path', None),
+                'video_path': kwargs.pop('video_path', None)
+            }
+            kwargs['retrieval'] = dumps(kwargs['retrieval'], sort_keys=True)
+
+        elif kwargs.get('camera_type') == 'non_ip':
+            kwargs['retrieval'] = {
+                'snapshot_url': kwargs.pop('snapshot_url', None)
+            }
+            kwargs['retrieval'] = dumps(kwargs['retrieval'])
+        elif kwargs.get('camera_type') == 'stream':
+            kwargs['retrieval'] = {
+                'm3u8_url': kwargs.pop('m3u8_url', None)
+            }
+            kwargs['retrieval'] = dumps(kwargs['retrieval'])
+        kwargs['type'] = kwargs.pop('camera_type', None)
+
+        if operation == 'POST':
+            url = Client.base_URL + 'cameras/create'
+        else:
+            url = Client.base_URL + 'cameras/' + kwargs.pop('cameraID')
+        return operation, url, kwargs
+
+    def _check_token(self, response, flag, url, data=None, params=None, stream=False):
         counter = 0
         while response.status_code == 401 and \
                 response.json()['message'] == 'Token expired.' and counter < 2:
-            self._request_token()
+            self._refresh_token(getattr(self._local, 'token', self.token))
             header = self.header_builder()
-            if flag == 'GET':
-                response = requests.get(url, headers=header, params=params)
+            if flag == 'GET' and stream:
+                response = self.transport.get(url, headers=header, params=params, stream=True)
+            elif flag == 'GET':
+                response = self.transport.get(url, headers=header, params=params)
             elif flag == 'POST':
-                response = requests.post(url, headers=header, data=data)
+                response = self.transport.post(url, headers=header, data=data)
             else:
-                response = requests.put(url, headers=header, data=data)
+                response = self.transport.put(url, headers=header, data=data)
             counter += 1
         return response
 
@@ -101,13 +213,33 @@ class Client(object):
             If the client secret of this client object does not match the clientID.
         InternalError
             If there is an API internal error.
+
+        Note
+        ----
+        If the client has a token store, a valid token saved there by another client
+        is reused and a newly requested token is saved to it.
         """
 
+        if self.token_store is None:
+            self._fetch_token()
+            return
+        with self.token_store.lock(self.clientID):
+            saved = self.token_store.load(self.clientID)
+            if saved is not None and saved[0] != self.token and \
+                    saved[1] - TOKEN_REFRESH_MARGIN > time.time():
+                self.token, self.token_expiry = saved
+                return
+            self._fetch_token()
+            self.token_store.save(self.clientID, self.token, self.token_expiry)
+
+    def _fetch_token(self):
         url = self.base_URL + 'auth'
         param = {'clientID': self.clientID, 'clientSecret': self.clientSecret}
-        response = requests.get(url, params=param)
+        issued_at = time.time()
+        response = self.transport.get(url, params=param)
         if response.status_code == 200:
             self.token = response.json()['token']
+            self.token_expiry = token_expiry(self.token, issued_at)
         elif response.status_code == 404:
             raise ResourceNotFoundError(response.json()['message'])
         elif response.status_code == 401:
@@ -115,11 +247,75 @@ class Client(object):
         else:
             raise InternalError()
 
+    def _refresh_token(self, stale_token):
+        # Single-flight: threads holding the same stale token wait for the first one
+        # to get a new token instead of each requesting their own.
+        with self._token_lock:
+            if self.token == stale_token:
+                self._request_token()
+
+    def _background_refresh(self, stale_token):
+        try:
+            if self.token == stale_token:
+                self._request_token()
+        except Error:
+            # The token is still valid; the next call refreshes it if it expires.
+            pass
+        finally:
+            self._token_lock.release()
+
+    def _ensure_token(self):
+        token = self.token
+        if token is None:
+            self._refresh_token(None)
+            return
+        if self.token_expiry is None:
+            return
+        remaining = self.token_expiry - time.time()
+        if remaining <= 0:
+            self._refresh_token(token)
+        elif remaining <= TOKEN_REFRESH_MARGIN and self._token_lock.acquire(False):
+            refresher = threading.Thread(target=self._background_refresh, args=(token,))
+            refresher.daemon = True
+            refresher.start()
+
+    def _coalesced(self, key, function, *args):
+        """Call function with args, sharing the call with the threads doing the same."""
+        # A thread with its own timeouts must not wait for, or fail with, a call sent
+        # under different ones.
+        if self._inflight is None or self.transport.thread_timeouts() != (None, None):
+            return function(*args)
+        return self._inflight.do(key, function, *args)
+
     def header_builder(self):
+        self._local.token = self.token
         head = {'Authorization': 'Bearer ' + str(self.token)}
         return head
 
-    def __init__(self, clientID, clientSecret):
+    def _stream_json_array(self, url, params):
+        """Send a GET request and yield the items of its JSON array response as they arrive."""
+        self._ensure_token()
+        header = self.header_builder()
+        response = self._check_token(
+            response=self.transport.get(url, headers=header, params=params, stream=True),
+            flag='GET', url=url, params=params, stream=True)
+        try:
+            if response.status_code != 200:
+                if response.status_code == 401:
+                    raise AuthenticationError(response.json()['message'])
+                elif response.status_code == 422:
+                    raise FormatError(response.json()['message'])
+                else:
+                    raise InternalError()
+            for item in iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)):
+                yield item
+        finally:
+            response.close()
+
+    def __init__(self, clientID, clientSecret, transport=None, token_store=None, cache=None,
+                 record_format='dict', json_codec=None, rate_limiter=None,
+                 retry_policy=None, timeout=None, circuit_breaker=None, coalesce=True,
+                 compress_requests=None):
 
         """Client initialization method.
 
@@ -129,6 +325,54 @@ class Client(object):
             Id of the client application.
         clientSecret : str
             Secret of the client application.
+        transport : :obj:`Transport`, optional
+            HTTP transport to send requests through. Pool size, keep-alive and
+            per-host connection limits are configured on the transport.
+            A new :obj:`Transport` with default settings is created if not provided.
+        token_store : :obj:`TokenStore`, optional
+            Store to share tokens with other clients using the same clientID,
+            for example a :obj:`FileTokenStore` shared by the worker processes of a node.
+        cache : :obj:`CameraCache` or :obj:`SQLiteCameraCache`, optional
+            Cache for the results of camera_by_id, camera_by_legacy_id and
+            check_cam_exist. Cameras returned by search_camera are stored in it by
+            cameraID. Cameras added or updated with write_camera through this
+            client are dropped from it. Lookups are not cached if not provided.
+        record_format : str, optional
+            Form of the cameras returned by this client.
+            Allowed values: 'dict' for :obj:`Camera` dict subclasses (default),
+            'compact' for slotted :obj:`CameraRecord` objects, which take much less memory
+            when many cameras are held at once.
+        json_codec : str or :obj:`JSONCodec`, optional
+            JSON backend used to decode responses and encode camera retrieval fields:
+            'auto', 'orjson', 'ujson' or 'json', see :func:`get_codec`.
+            By default the backend of the transport, which is the fastest installed one
+            unless the transport was configured otherwise.
+        rate_limiter : :obj:`RateLimiter`, optional
+            Rate limits shared by every method of this client, which also waits and
+            retries when the API answers 429 Too Many Requests.
+            By default the rate limiter of the transport, if any.
+        retry_policy : :obj:`RetryPolicy`, optional
+            Policy retrying, in every method of this client, the idempotent requests
+            that fail because of a connection error, a timeout or a server error.
+            By default the retry policy of the transport, if any.
+        timeout : float or tuple of float, optional
+            Connect and read timeouts of the requests of this client, in seconds.
+            By default the timeouts of the transport. They can be changed for some
+            calls with :meth:`timeouts`.
+        circuit_breaker : :obj:`CircuitBreaker`, optional
+            Circuit breaker making the methods of this client fail fast with
+            :obj:`CircuitOpenError` while the API keeps failing.
+            By default the circuit breaker of the transport, if any.
+        coalesce : bool, optional
+            If True (default), threads calling camera_by_id, camera_by_legacy_id,
+            search_camera or check_cam_exist with the same arguments while such a call
+            is in flight wait for its response instead of sending their own request.
+            Each thread still gets its own cameras. Threads running in :meth:`timeouts`
+            always send their own request.
+        compress_requests : bool, optional
+            If True, large request bodies, such as those of cameras with long
+            retrieval fields, are sent gzip compressed where the API accepts them.
+            By default the setting of the transport, which does not compress them.
 
         Raises
         ------
@@ -138,15 +382,120 @@ class Client(object):
         InvalidClientSecretError
             If the client secret is not in the correct format.
             Client secret should have a length of at least 71 characters.
+        FormatError
+            If record_format or json_codec is not one of the allowed values.
+
+            Or json_codec, rate_limiter, retry_policy, timeout, circuit_breaker or
+            compress_requests is given together with a transport, whose own settings
+            should be used instead.
 
         """
         if len(clientID) != CLIENTID_LENGTH:
             raise InvalidClientIdError
         if len(clientSecret) < SECRET_LENGTH:
             raise InvalidClientSecretError
+        if record_format not in self._record_classes:
+            raise FormatError('record_format should be one of ' +
+                              str(sorted(self._record_classes)) + '.')
+        self._record_class = self._record_classes[record_format]
         self.clientID = clientID
         self.clientSecret = clientSecret
         self.token = None
+        self.token_expiry = None
+        self.token_store = token_store
+        self.cache = cache
+        self._token_lock = threading.Lock()
+        self._local = threading.local()
+        self._inflight = SingleFlight() if coalesce else None
+        transport_options = {'json_codec': json_codec, 'rate_limiter': rate_limiter,
+                             'retry_policy': retry_policy, 'timeout': timeout,
+                             'circuit_breaker': circuit_breaker,
+                             'compress_requests': compress_requests}
+        transport_options = {name: value for name, value in transport_options.items()
+                             if value is not None}
+        if transport is not None and transport_options:
+            raise FormatError(str(sorted(transport_options)) +
+                              ' of a shared transport are set on the transport.')
+        self._owns_transport = transport is None
+        if transport is None:
+            transport = Transport(**transport_options)
+        self.transport = transport
+        self.json_codec = transport.json_codec
+        self.rate_limiter = transport.rate_limiter
+        self.retry_policy = transport.retry_policy
+        self.circuit_breaker = transport.circuit_breaker
+        self.transfer_stats = transport.transfer_stats
+
+    def close(self):
+        """
+        Release the connections held by this client.
+
+        A transport passed in by the caller is left open, since other clients may share it.
+
+        Example
+        -------
+
+            with Client(clientID, clientSecret) as client:
+                client.camera_by_id(cameraID)
+
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def timeouts(self, timeout=None, deadline=None):
+        """
+        Override the timeouts of the requests sent by the calling thread in a with
+        block, and give them an overall deadline.
+
+        The requests sent in worker threads by the methods called in the block, such as
+        :meth:`search_camera_all` or the iterators of :meth:`iter_search_camera`, get
+        the same timeouts and deadline.
+
+        Parameters
+        ----------
+        timeout : float or tuple of float, optional
+            Connect and read timeouts, in seconds, replacing the default ones.
+        deadline : float, optional
+            Number of seconds from now after which no request is sent.
+
+        Raises
+        ------
+        DeadlineExceededError
+            If a request is sent after the deadline.
+
+        Example
+        -------
+
+            with client.timeouts(timeout=(1, 2)):
+                camera = client.camera_by_id(cameraID)
+
+        """
+        return self.transport.timeouts(timeout, deadline)
+
+    def _limits(self, deadline=None):
+        # Timeout and deadline of the calling thread, for the worker threads of a composite
+        # operation; the deadline of the operation, a time.time() value, replaces a later one.
+        timeout, thread_deadline = self.transport.thread_timeouts()
+        if deadline is None or (thread_deadline is not None and thread_deadline < deadline):
+            deadline = thread_deadline
+        return timeout, deadline
+
+    def _until(self, limits, function, *args, **kwargs):
+        # Run a step of a composite operation in a worker thread, within the _limits
+        # of the thread which started the operation.
+        timeout, deadline = limits
+        if timeout is None and deadline is None:
+            return function(*args, **kwargs)
+        if deadline is not None:
+            deadline -= time.time()
+        with self.transport.timeouts(timeout, deadline):
+            return function(*args, **kwargs)
 
     # Functions for webUI
 
@@ -191,11 +540,10 @@ class Client(object):
 
         """
         url = Client.base_URL + 'apps/register'
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
         data = {'owner': owner, 'permissionLevel': permissionLevel}
-        response = self._check_token(response=requests.post(url, headers=header, data=data),
+        response = self._check_token(response=self.transport.post(url, headers=header, data=data),
                                      flag='POST', url=url, data=data)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -241,11 +589,10 @@ class Client(object):
 
         """
         url = Client.base_URL + 'apps/' + clientID
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
         data = {'owner': owner}
-        response = self._check_token(response=requests.put(url, headers=header, data=data),
+        response = self._check_token(response=self.transport.put(url, headers=header, data=data),
                                      flag='PUT', url=url, data=data)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -292,11 +639,10 @@ class Client(object):
 
         """
         url = Client.base_URL + 'apps/' + clientID
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
         data = {'permissionLevel': permissionLevel}
-        response = self._check_token(response=requests.put(url, headers=header, data=data),
+        response = self._check_token(response=self.transport.put(url, headers=header, data=data),
                                      flag='PUT', url=url, data=data)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -339,10 +685,9 @@ class Client(object):
                 webUI_client.reset_secret('2123'')
         """
         url = Client.base_URL + 'apps/' + clientID + '/secret'
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
-        response = self._check_token(response=requests.put(url, headers=header, data=None),
+        response = self._check_token(response=self.transport.put(url, headers=header, data=None),
                                      flag='PUT', url=url, data=None)
 
         if response.status_code != 200:
@@ -392,10 +737,9 @@ class Client(object):
         """
         url = Client.base_URL + 'apps/by-owner'
         param = {'owner': owner}
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
-        response = self._check_token(response=requests.get(url, headers=header, params=param),
+        response = self._check_token(response=self.transport.get(url, headers=header, params=param),
                                      flag='GET', url=url, params=param)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -445,10 +789,9 @@ class Client(object):
         """
         url = Client.base_URL + "apps/" + clientID + "/usage"
         param = {'owner': owner}
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
-        response = self._check_token(response=requests.get(url, headers=header, params=param),
+        response = self._check_token(response=self.transport.get(url, headers=header, params=param),
                                      flag='GET', url=url, params=param)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -672,42 +1015,15 @@ class Client(object):
 
         self._check_args(kwargs=kwargs, legal_args=self._camera_fields)
 
-        if self.token is None:
-            self._request_token()
-
-        operation = 'POST' if kwargs.get('cameraID') is None else 'PUT'
-
-        if kwargs.get('camera_type') == 'ip':
-            kwargs['retrieval'] = {
-                'ip': kwargs.pop('ip', None),
-                'port': kwargs.pop('port', None),
-                'brand': kwargs.pop('brand', None),
-                'model': kwargs.pop('model', None),
-                'image_path': kwargs.pop('image_path', None),
-                'video_path': kwargs.pop('video_path', None)
-            }
-            kwargs['retrieval'] = json.dumps(kwargs['retrieval'], sort_keys=True)
-
-        elif kwargs.get('camera_type') == 'non_ip':
-            kwargs['retrieval'] = {
-                'snapshot_url': kwargs.pop('snapshot_url', None)
-            }
-            kwargs['retrieval'] = json.dumps(kwargs['retrieval'])
-        elif kwargs.get('camera_type') == 'stream':
-            kwargs['retrieval'] = {
-                'm3u8_url': kwargs.pop('m3u8_url', None)
-            }
-            kwargs['retrieval'] = json.dumps(kwargs['retrieval'])
-        kwargs['type'] = kwargs.pop('camera_type', None)
+        self._ensure_token()
 
+        operation, url, data = self._camera_payload(kwargs, self.json_codec.dumps)
         if operation == 'POST':
-            url = Client.base_URL + 'cameras/create'
-            temp_response = requests.post(url, data=kwargs, headers=self.header_builder())
+            temp_response = self.transport.post(url, data=data, headers=self.header_builder())
         else:
-            url = Client.base_URL + 'cameras/' + kwargs.pop('cameraID')
-            temp_response = requests.put(url, data=kwargs, headers=self.header_builder())
+            temp_response = self.transport.put(url, data=data, headers=self.header_builder())
 
-        response = self._check_token(temp_response, flag=operation, url=url, data=kwargs)
+        response = self._check_token(temp_response, flag=operation, url=url, data=data)
 
         if response.status_code != 201 and response.status_code != 200:
             if response.status_code == 403:
@@ -721,8 +1037,106 @@ class Client(object):
             else:
                 raise InternalError()
 
+        if self.cache is not None:
+            self.cache.invalidate_camera(kwargs.get('cameraID'))
         return response.json()['cameraID']
 
+    def write_cameras(self, cameras, max_workers=MAX_WORKERS, max_rate=None, checkpoint=None):
+        """
+        Add or update many cameras in the database.
+
+        Every row is checked with :meth:`check_camera` before any camera is sent, then
+        the rows are written concurrently, each as a call to :meth:`write_camera`.
+
+        Warning
+        ---------
+        You can only use this function if your client has admin permission.
+
+        Parameters
+        ----------
+        cameras : iterable of dict
+            Keyword arguments of :meth:`write_camera` for each camera.
+        max_workers : int, optional
+            Maximum number of cameras written at the same time.
+        max_rate : float, optional
+            Maximum number of cameras written per second. Not limited if not provided.
+        checkpoint : str or :obj:`WriteCheckpoint`, optional
+            File recording the rows written successfully. Rows already recorded in it
+            with the same content are not written again, so a bulk write interrupted
+            midway can be resumed by running it again with the same checkpoint.
+
+        Returns
+        -------
+        list
+            The result of each row, in order: the cameraID of the camera written,
+            or the :obj:`FormatError`, :obj:`ResourceConflictError`,
+            :obj:`ResourceNotFoundError`, :obj:`requests.ConnectionError` or
+            :obj:`requests.Timeout` it failed with.
+
+        Raises
+        ------
+        AuthenticationError
+            If the client is not allowed to write cameras.
+            The cameras not written yet are not sent.
+        InternalError
+            If there is an API internal error.
+            The cameras not written yet are not sent.
+
+        Example
+        -------
+
+            results = client.write_cameras(rows, max_rate=50, checkpoint='import.checkpoint')
+            failed = [(row, result) for row, result in zip(rows, results)
+                      if isinstance(result, Error)]
+
+        """
+        rows = [dict(camera) for camera in cameras]
+        results = [None] * len(rows)
+        if checkpoint is not None and not isinstance(checkpoint, WriteCheckpoint):
+            checkpoint = WriteCheckpoint(checkpoint)
+
+        pending = []
+        for index, row in enumerate(rows):
+            try:
+                self.check_camera(row)
+            except FormatError as err:
+                results[index] = err
+                continue
+            cameraID = checkpoint.lookup(index, row) if checkpoint is not None else None
+            if cameraID is not None:
+                results[index] = cameraID
+            else:
+                pending.append(index)
+
+        if not pending:
+            return results
+        self._ensure_token()
+        bucket = TokenBucket(max_rate) if max_rate is not None else None
+
+        def write(index):
+            if bucket is not None:
+                bucket.acquire()
+            cameraID = self.write_camera(**rows[index])
+            if checkpoint is not None:
+                checkpoint.record(index, rows[index], cameraID)
+            return cameraID
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [(index, pool.submit(write, index)) for index in pending]
+            try:
+                for index, future in futures:
+                    try:
+                        results[index] = future.result()
+                    except (FormatError, ResourceConflictError, ResourceNotFoundError,
+                            requests.ConnectionError, requests.Timeout) as err:
+                        results[index] = err
+            except BaseException:
+                # Otherwise leaving the pool would still write every queued camera.
+                for _, waiting in futures:
+                    waiting.cancel()
+                raise
+        return results
+
     def camera_by_id(self, cameraID):
         """
         A method to get a camera object by using camera's ID
@@ -756,25 +1170,16 @@ class Client(object):
 
 
         """
-        if self.token is None:
-            self._request_token()
+        if self.cache is not None:
+            camera = self.cache.get(('id', cameraID))
+            if camera is not None:
+                return camera
         url = Client.base_URL + "cameras/" + cameraID
-        header = self.header_builder()
-        response = self._check_token(response=requests.get(url, headers=header),
-                                     flag='GET', url=url)
-
-        if response.status_code != 200:
-            if response.status_code == 401:
-                raise AuthenticationError(response.json()['message'])
-            elif response.status_code == 404:
-                raise ResourceNotFoundError(response.json()['message'])
-            elif response.status_code == 403:
-                raise AuthorizationError(response.json()['message'])
-            elif response.status_code == 422:
-                raise FormatError(response.json()['message'])
-            else:
-                raise InternalError()
-        return Camera.process_json(**response.json())
+        entry = self._coalesced(('id', cameraID), self._get_camera_json, url)
+        camera = self._record_class.process_json_entry(entry)
+        if self.cache is not None:
+            self.cache.set(('id', cameraID), camera)
+        return camera
 
     def camera_by_legacy_id(self, legacy_cameraID):
         """
@@ -791,11 +1196,21 @@ class Client(object):
             A camera object.
 
         """
-        if self.token is None:
-            self._request_token()
+        if self.cache is not None:
+            camera = self.cache.get(('legacy', legacy_cameraID))
+            if camera is not None:
+                return camera
         url = Client.base_URL + "cameras/legacy/" + legacy_cameraID
+        entry = self._coalesced(('legacy', legacy_cameraID), self._get_camera_json, url)
+        camera = self._record_class.process_json_entry(entry)
+        if self.cache is not None:
+            self.cache.set(('legacy', legacy_cameraID), camera)
+        return camera
+
+    def _get_camera_json(self, url):
+        self._ensure_token()
         header = self.header_builder()
-        response = self._check_token(response=requests.get(url, headers=header),
+        response = self._check_token(response=self.transport.get(url, headers=header),
                                      flag='GET', url=url)
 
         if response.status_code != 200:
@@ -809,11 +1224,13 @@ class Client(object):
                 raise FormatError(response.json()['message'])
             else:
                 raise InternalError()
-        return Camera.process_json(**response.json())
+        return response.json()
 
-    def camera_by_list_id(self, cameraID_list=None, legacy_cameraID_list=None):
+    def camera_by_list_id(self, cameraID_list=None, legacy_cameraID_list=None,
+                          max_workers=MAX_WORKERS, return_errors=False, deadline=None):
         """
         A method to get a list of camera object by using a list of camera's legacy ID or ID.
+        The cameras are fetched concurrently by a pool of worker threads.
 
         Parameters
         ----------
@@ -823,21 +1240,115 @@ class Client(object):
         cameraID_list : List
             cameraIDs of the cameras in the database.
 
+        max_workers : int, optional
+            Maximum number of cameras fetched at the same time.
+
+        return_errors : bool, optional
+            If True, cameras that cannot be fetched are left out of the result and the
+            errors, including connection errors and timeouts, are returned instead of
+            being raised.
+
+        deadline : float, optional
+            Number of seconds within which all the cameras must be fetched.
+
         Returns
         -------
         :obj:`list` of :obj:`Camera`
-            List of cameras that satisfy the search criteria.
+            List of cameras in the order of the given IDs, cameraIDs first.
+            Repeated IDs are fetched and returned only once.
+        dict
+            (Only if return_errors is True) The error raised for each ID that could not be
+            fetched, keyed by that ID.
+
+        Raises
+        ------
+        ResourceNotFoundError
+            If return_errors is False and no camera exists with one of the given IDs.
+            The cameras not fetched yet are not requested.
+        requests.RequestException
+            If return_errors is False and a request fails to be sent or answered.
+            The cameras not fetched yet are not requested.
+        DeadlineExceededError
+            If the deadline passes first. The cameras not fetched yet are not requested.
+
+        Example
+        -------
+
+            cameras, errors = client.camera_by_list_id(cameraIDs, [], return_errors=True)
 
         """
+        lookups = []
+        seen = set()
+        for ID in cameraID_list or []:
+            if ('id', ID) not in seen:
+                seen.add(('id', ID))
+                lookups.append((self.camera_by_id, ID))
+        for legacy_ID in legacy_cameraID_list or []:
+            if ('legacy', legacy_ID) not in seen:
+                seen.add(('legacy', legacy_ID))
+                lookups.append((self.camera_by_legacy_id, legacy_ID))
+
+        if lookups:
+            self._ensure_token()
+
+        if deadline is not None:
+            deadline += time.time()
+        limits = self._limits(deadline)
+        deadline = limits[1]
         camera_processed = []
-        for ID in cameraID_list:
-            camera_processed.append(self.camera_by_id(ID))
-        for legacy_ID in legacy_cameraID_list:
-            camera_processed.append(self.camera_by_legacy_id(legacy_ID))
-
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [(ID, pool.submit(self._until, limits, lookup, ID))
+                       for lookup, ID in lookups]
+            try:
+                for ID, future in futures:
+                    try:
+                        camera_processed.append(future_result(future, deadline))
+                    except (Error, requests.RequestException) as err:
+                        if not return_errors or isinstance(err, DeadlineExceededError):
+                            raise
+                        errors[ID] = err
+            except BaseException:
+                # Otherwise leaving the pool would still wait for every queued lookup.
+                for _, pending in futures:
+                    pending.cancel()
+                raise
+
+        if return_errors:
+            return camera_processed, errors
         return camera_processed
 
-    def search_camera(self, **kwargs):
+    @staticmethod
+    def _search_params(kwargs):
+        kwargs['type'] = kwargs.pop('camera_type', None)
+
+        # filter out those parameters with value None, change true/false
+        return {k: v for k, v in kwargs.items() if v is not None}
+
+    def _search_camera_json(self, kwargs):
+        """Send a search request and return the cameras of the response as parsed JSON."""
+        self._check_args(kwargs, self._search_fields)
+        self._ensure_token()
+
+        search_params = self._search_params(kwargs)
+
+        url = Client.base_URL + 'cameras/search'
+        header = self.header_builder()
+        response = self._check_token(
+            response=self.transport.get(url, headers=header, params=search_params),
+            flag='GET', url=url, params=search_params)
+
+        if response.status_code != 200:
+            if response.status_code == 401:
+                raise AuthenticationError(response.json()['message'])
+            elif response.status_code == 422:
+                raise FormatError(response.json()['message'])
+            else:
+                raise InternalError()
+
+        return response.json()
+
+    def search_camera(self, lazy=False, **kwargs):
 
         """A method to search camera by attributes and location.
         Searching by location requires user to provide coordiantes for a desired center point
@@ -901,11 +1412,15 @@ class Client(object):
         is_active_video : bool, optional
             If the camera is active and can get video.
             This field can identify true/false case-insensitively and 0/1.
+        lazy : bool, optional
+            If True, the cameras are only decoded when accessed, and they are not
+            stored in the cache. See :obj:`LazyCameraList`.
 
         Returns
         -------
         :obj:`list` of :obj:`Camera`
             List of cameras that satisfy the search criteria.
+            A :obj:`LazyCameraList` if lazy is True.
 
         Raises
         ------
@@ -930,37 +1445,220 @@ class Client(object):
             If there is an API internal error.
 
         """
-        if self.token is None:
-            self._request_token()
-
         self._check_args(kwargs, self._search_fields)
+        search_params = self._search_params(dict(kwargs))
+        key = ('search', tuple(sorted(search_params.items())))
+        camera_response_array = self._coalesced(key, self._search_camera_json, kwargs)
+        if lazy:
+            return LazyCameraList(camera_response_array, self._record_class)
+        camera_processed = self._record_class.process_json_array(camera_response_array)
+
+        if self.cache is not None:
+            self.cache.set_many((('id', camera['cameraID']), camera)
+                                for camera in camera_processed)
+        return camera_processed
 
-        kwargs['type'] = kwargs.pop('camera_type', None)
+    def search_camera_stream(self, **kwargs):
+        """A method to search cameras, yielding each camera as soon as it is received.
+        Unlike :meth:`search_camera`, the response is decoded while it is downloaded, so
+        the first camera is available before the whole page arrives and the page is
+        never held in memory at once.
 
-        # filter out those parameters with value None, change true/false
-        search_params = {k: v for k, v in kwargs.items() if v is not None}
+        Parameters
+        ----------
+        **kwargs
+            Same search parameters as :meth:`search_camera`.
+
+        Returns
+        -------
+        iterator of :obj:`Camera`
+            Cameras that satisfy the search criteria.
 
+        Raises
+        ------
+        FormatError
+            If there are unexpected keywords in kwargs, raised by this method.
+            See :meth:`search_camera` for the errors raised while iterating.
+
+        Example
+        -------
+
+            for camera in client.search_camera_stream(country='USA'):
+                print(camera['cameraID'])
+
+        """
+        self._check_args(kwargs, self._search_fields)
+        return self._search_camera_stream(self._search_params(kwargs))
+
+    def _search_camera_stream(self, search_params):
         url = Client.base_URL + 'cameras/search'
-        header = self.header_builder()
-        response = self._check_token(
-            response=requests.get(url, headers=header, params=search_params),
-            flag='GET', url=url, params=search_params)
+        for entry in self._stream_json_array(url, search_params):
+            camera = self._record_class.process_json_entry(entry)
+            if self.cache is not None:
+                self.cache.set(('id', camera['cameraID']), camera)
+            yield camera
 
-        if response.status_code != 200:
-            if response.status_code == 401:
-                raise AuthenticationError(response.json()['message'])
-            elif response.status_code == 422:
-                raise FormatError(response.json()['message'])
-            else:
-                raise InternalError()
+    def iter_search_camera(self, **kwargs):
+        """A method to iterate over all the cameras matching a search, across every page.
+        Pages are requested one after another with increasing offset; the next page is
+        fetched in the background while the cameras of the current page are consumed.
 
-        camera_response_array = response.json()
-        camera_processed = []
-        for current_object in camera_response_array:
-            camera_processed.append(Camera.process_json(**current_object))
+        Parameters
+        ----------
+        **kwargs
+            Same search parameters as :meth:`search_camera`. If ``offset`` is given,
+            the iteration starts at that offset.
+
+        Returns
+        -------
+        generator of :obj:`Camera`
+            Cameras that satisfy the search criteria.
+
+        Raises
+        ------
+        FormatError
+            If there are unexpected keywords in kwargs. Errors of the API requests are
+            raised while iterating; see :meth:`search_camera`.
+
+        Example
+        -------
+
+            for camera in client.iter_search_camera(country='USA'):
+                process(camera)
+
+        """
+        self._check_args(kwargs, self._search_fields)
+        offset = kwargs.pop('offset', None) or 0
+        return self._iter_search_camera(offset, kwargs, self._limits())
 
+    def _iter_search_camera(self, offset, kwargs, limits):
+        def fetch_page(page_offset):
+            return self._until(limits, self.search_camera, offset=page_offset, **kwargs)
+
+        for page in iter_pages(fetch_page, offset, SEARCH_PAGE_SIZE):
+            for camera in page:
+                yield camera
+
+    def search_camera_all(self, max_workers=MAX_WORKERS, deadline=None, **kwargs):
+        """A method to get every camera matching a search at once.
+        Pages of 100 cameras are requested concurrently at increasing offsets until the
+        end of the results is reached.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of pages fetched at the same time.
+        deadline : float, optional
+            Number of seconds within which every page must be fetched.
+        **kwargs
+            Same search parameters as :meth:`search_camera`. If ``offset`` is given,
+            the search starts at that offset.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`Camera`
+            All cameras that satisfy the search criteria, in offset order.
+            A camera appearing on two pages because the database changed during
+            the search is only returned once.
+
+        Raises
+        ------
+        FormatError
+            If there are unexpected keywords in kwargs.
+        DeadlineExceededError
+            If the deadline passes first. The pages not fetched yet are not requested.
+            See :meth:`search_camera` for the other errors.
+
+        Example
+        -------
+
+            cameras = client.search_camera_all(country='USA', max_workers=16)
+
+        """
+        self._check_args(kwargs, self._search_fields)
+        offset = kwargs.pop('offset', None) or 0
+        if deadline is not None:
+            deadline += time.time()
+        limits = self._limits(deadline)
+        deadline = limits[1]
+        self._ensure_token()
+
+        def fetch_page(page_offset):
+            return self._until(limits, self.search_camera, offset=page_offset, **kwargs)
+
+        camera_processed = []
+        seen = set()
+        for page in fetch_all_pages(fetch_page, offset, SEARCH_PAGE_SIZE, max_workers,
+                                    deadline):
+            for camera in page:
+                if camera['cameraID'] not in seen:
+                    seen.add(camera['cameraID'])
+                    camera_processed.append(camera)
         return camera_processed
 
+    def search_camera_table(self, all_pages=False, max_workers=MAX_WORKERS, deadline=None,
+                            **kwargs):
+        """A method to search cameras and get the result as a columnar table.
+        The table is built directly from the response, without creating a camera
+        object per row.
+
+        Parameters
+        ----------
+        all_pages : bool, optional
+            If True, every page of the result is fetched concurrently, like
+            :meth:`search_camera_all`. Otherwise a single page is returned, like
+            :meth:`search_camera`.
+        max_workers : int, optional
+            Maximum number of pages fetched at the same time when all_pages is True.
+        deadline : float, optional
+            Number of seconds within which every page must be fetched when all_pages
+            is True.
+        **kwargs
+            Same search parameters as :meth:`search_camera`.
+
+        Returns
+        -------
+        :obj:`CameraTable`
+            Cameras that satisfy the search criteria.
+
+        Raises
+        ------
+        ImportError
+            If numpy is not installed.
+            See :meth:`search_camera` for the other errors.
+
+        Example
+        -------
+
+            table = client.search_camera_table(country='USA', all_pages=True)
+            latitudes = table.columns['latitude']
+
+        """
+        if not all_pages:
+            return CameraTable.from_json(self._search_camera_json(kwargs), self._record_class)
+
+        self._check_args(kwargs, self._search_fields)
+        offset = kwargs.pop('offset', None) or 0
+        if deadline is not None:
+            deadline += time.time()
+        limits = self._limits(deadline)
+        deadline = limits[1]
+        self._ensure_token()
+
+        def fetch_page(page_offset):
+            return self._until(limits, self._search_camera_json,
+                               dict(kwargs, offset=page_offset))
+
+        rows = []
+        seen = set()
+        for page in fetch_all_pages(fetch_page, offset, SEARCH_PAGE_SIZE, max_workers,
+                                    deadline):
+            for row in page:
+                if row['cameraID'] not in seen:
+                    seen.add(row['cameraID'])
+                    rows.append(row)
+        return CameraTable.from_json(rows, self._record_class)
+
     def check_cam_exist(self, camera_type, **kwargs):
         """
         A method to get one or more camera object that has the given retrieval method
@@ -1021,11 +1719,24 @@ class Client(object):
         url = Client.base_URL + "cameras/exist"
         kwargs['type'] = camera_type
 
-        if self.token is None:
-            self._request_token()
+        cache_key = ('exist', tuple(sorted(kwargs.items())))
+        if self.cache is not None:
+            cameras = self.cache.get(cache_key)
+            if cameras is not None:
+                return cameras
+        camera_response_array = self._coalesced(cache_key, self._check_cam_exist_json, url,
+                                                kwargs)
+        camera_processed = self._record_class.process_json_array(camera_response_array)
+        if self.cache is not None:
+            self.cache.set(cache_key, camera_processed)
+        return camera_processed
+
+    def _check_cam_exist_json(self, url, kwargs):
+        self._ensure_token()
         header = self.header_builder()
-        response = self._check_token(response=requests.get(url, headers=header, params=kwargs),
-                                     flag='GET', url=url, params=kwargs)
+        response = self._check_token(
+            response=self.transport.get(url, headers=header, params=kwargs),
+            flag='GET', url=url, params=kwargs)
         if response.status_code != 200:
             if response.status_code == 401:
                 raise AuthenticationError(response.json()['message'])
@@ -1033,11 +1744,38 @@ class Client(object):
                 raise FormatError(response.json()['message'])
             else:
                 raise InternalError()
-        camera_response_array = response.json()
-        camera_processed = []
-        for current_object in camera_response_array:
-            camera_processed.append(Camera.process_json(**current_object))
-        return camera_processed
+        return response.json()
+
+    def check_cam_exist_stream(self, camera_type, **kwargs):
+        """
+        A method to get the cameras that have the given retrieval method, yielding each
+        camera as soon as it is received. The results are not cached.
+
+        Parameters
+        ----------
+        camera_type : str
+            Type of the camera. Type can only be 'ip', 'non_ip', or 'stream'.
+        **kwargs
+            Same retrieval fields as :meth:`check_cam_exist`.
+
+        Returns
+        -------
+        iterator of :obj:`Camera`
+            Cameras that have the given retrieval method.
+
+        Raises
+        ------
+        FormatError
+            If there are unexpected keywords in kwargs, raised by this method.
+            See :meth:`check_cam_exist` for the errors raised while iterating.
+        """
+        self._check_args(kwargs, self._retrieval_fields)
+        kwargs['type'] = camera_type
+        return self._check_cam_exist_stream(kwargs)
+
+    def _check_cam_exist_stream(self, params):
+        for entry in self._stream_json_array(Client.base_URL + 'cameras/exist', params):
+            yield self._record_class.process_json_entry(entry)
 
     def get_change_log(self, start=None, end=None, offset=None):
         """
@@ -1081,13 +1819,12 @@ class Client(object):
 
         """
         url = Client.base_URL + 'apps/db-change'
-        if self.token is None:
-            self._request_token()
+        self._ensure_token()
         header = self.header_builder()
         param = {'start': start,
                  'end': end,
                  'offset': offset}
-        response = self._check_token(response=requests.get(url, headers=header, params=param),
+        response = self._check_token(response=self.transport.get(url, headers=header, params=param),
                                      flag='GET', url=url, params=param)
         if response.status_code != 200:
             if response.status_code == 401:
@@ -1098,3 +1835,75 @@ class Client(object):
                 raise InternalError()
 
         return response.json()
+
+    def get_change_log_stream(self, start=None, end=None, offset=None):
+        """
+        A method to get change_log for a specific time period, yielding each entry as
+        soon as it is received.
+
+        Parameters
+        ----------
+        start : str, optional
+            Start time of the log user desires to query
+        end : str, optional
+            End time of the log user desires to query
+        offset : str, optional
+            How many logs to skip
+
+        Returns
+        -------
+        iterator of dict
+            Objects containing cameraID and creation time of the log.
+
+        Raises
+        ------
+        See :meth:`get_change_log`. They are raised while iterating.
+        """
+        param = {'start': start,
+                 'end': end,
+                 'offset': offset}
+        return self._stream_json_array(Client.base_URL + 'apps/db-change', param)
+
+    def iter_change_log(self, start=None, end=None, offset=0):
+        """
+        A method to iterate over the change_log of a time period, across every page.
+
+        Parameters
+        ----------
+        start : str, optional
+            Start time of the log user desires to query
+        end : str, optional
+            End time of the log user desires to query
+        offset : int, optional
+            How many logs to skip
+
+        Returns
+        -------
+        :obj:`ChangeLogIterator`
+            Iterator over the objects containing cameraID and creation time of the log.
+            Its ``cursor`` holds the arguments of this method that resume the iteration
+            after the last entry read.
+
+        Raises
+        ------
+        AuthenticationError, InternalError, FormatError
+            While iterating; see :meth:`get_change_log`.
+
+        Example
+        -------
+
+            changes = webUI_client.iter_change_log('2018-08-27T00:00:00', '2018-08-28T00:00:00')
+            for entry in changes:
+                process(entry)
+                save(changes.cursor)
+
+            # after a restart
+            changes = webUI_client.iter_change_log(**load())
+
+        """
+        limits = self._limits()
+
+        def fetch_page(page_offset):
+            return self._until(limits, self.get_change_log, start, end, page_offset)
+
+        return ChangeLogIterator(self, start, end, offset, fetch_page)
@@ -0,0 +1,66 @@
+"""
+Coalescing of identical requests sent at the same time by several threads.
+"""
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight(object):
+    """Class running at most one call at a time for each key.
+
+    A thread calling :meth:`do` while another call with the same key is in flight does
+    not run its function; it waits for the call in flight and gets its result, or its
+    exception. Calls starting after it has finished run again.
+
+    Attributes
+    ----------
+    shared : int
+        Number of calls answered with the result of another call.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Call function with the given arguments, unless a call with the same key is in
+        flight, and return its result.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies the calls returning the same result.
+        function : callable
+            Called with args and kwargs if no call with the same key is in flight.
+
+        Returns
+        -------
+        object
+            Result of function, the same object for every caller sharing a call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                future.set_running_or_notify_cancel()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            self._forget(key)
+            future.set_exception(error)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key):
+        # Calls starting from now send their own request instead of reading this result.
+        with self._lock:
+            del self._calls[key]
@@ -0,0 +1,116 @@
+"""
+JSON codecs used to encode and decode the payloads of the CAM2 Database API.
+"""
+import json
+from .error import FormatError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec(object):
+    """Class representing a JSON codec backed by the standard library ``json`` module.
+
+    Subclasses use faster optional backends; :func:`get_codec` picks one of them.
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend, accepted by :func:`get_codec`.
+    """
+
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Parse a JSON document given as bytes (UTF-8) or text.
+        """
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj, sort_keys=False):
+        """
+        Encode an object as JSON text.
+        """
+        return json.dumps(obj, sort_keys=sort_keys)
+
+    def __repr__(self):
+        return type(self).__name__ + '()'
+
+
+class UJSONCodec(JSONCodec):
+    """Class representing a JSON codec backed by the optional ``ujson`` package."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError('UJSONCodec requires the ujson package.')
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj, sort_keys=False):
+        return ujson.dumps(obj, sort_keys=sort_keys, escape_forward_slashes=False)
+
+
+class OrjsonCodec(JSONCodec):
+    """Class representing a JSON codec backed by the optional ``orjson`` package."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires the orjson package.')
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj, sort_keys=False):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode('utf-8')
+
+
+_CODECS = {codec.name: codec for codec in (OrjsonCodec, UJSONCodec, JSONCodec)}
+
+
+def get_codec(codec='auto'):
+    """Return a JSON codec.
+
+    Parameters
+    ----------
+    codec : str or :obj:`JSONCodec`, optional
+        'auto' for the fastest installed backend (orjson, then ujson, then the standard
+        library), or the name of a backend: 'orjson', 'ujson' or 'json'.
+        A :obj:`JSONCodec` instance is returned unchanged.
+
+    Returns
+    -------
+    :obj:`JSONCodec`
+
+    Raises
+    ------
+    FormatError
+        If codec is not one of the allowed values.
+    ImportError
+        If the package of the named backend is not installed.
+
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == 'auto':
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UJSONCodec()
+        return JSONCodec()
+    if codec not in _CODECS:
+        raise FormatError('json_codec should be one of ' + str(['auto'] + sorted(_CODECS)) + '.')
+    return _CODECS[codec]()
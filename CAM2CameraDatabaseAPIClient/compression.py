@@ -0,0 +1,91 @@
+"""
+Compression of the bodies exchanged with the CAM2 Database API, and measurement of the
+bytes it saves.
+"""
+import threading
+import zlib
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+# Segments naming a route; the other segments are ids, replaced in the route names.
+_ROUTE_SEGMENTS = frozenset(['auth', 'apps', 'register', 'by-owner', 'db-change', 'secret',
+                             'usage', 'cameras', 'create', 'legacy', 'search', 'exist'])
+
+
+def route_name(url):
+    """
+    Return the name of the route of a url, with its ids replaced by '{id}',
+    for example 'cameras/legacy/{id}'.
+    """
+    return '/'.join(segment if segment in _ROUTE_SEGMENTS else '{id}'
+                    for segment in urlparse(url).path.split('/') if segment)
+
+
+def gzip_compress(data):
+    """
+    Return data, a str or bytes, compressed in the gzip format.
+    """
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class TransferStats(object):
+    """Class representing the bytes received from each route of the API.
+
+    Wire bytes are the bytes of the response bodies as sent over the network, compressed
+    if the API compressed them; decoded bytes are the bytes of the bodies once
+    decompressed. Their ratio is the bandwidth saved by compression.
+
+    Example
+    -------
+
+        client = Client(clientID, clientSecret)
+        client.search_camera_all(country='USA')
+        print(client.transfer_stats.stats()['cameras/search'])
+
+    """
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, wire_bytes, decoded_bytes):
+        """
+        Record a response body of a route.
+        """
+        with self._lock:
+            totals = self._routes.setdefault(route, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += wire_bytes
+            totals[2] += decoded_bytes
+
+    def stats(self):
+        """
+        Return the totals of each route.
+
+        Returns
+        -------
+        dict
+            Maps each route name to a dict with the number of ``responses``, the
+            ``wire_bytes`` and ``decoded_bytes`` of their bodies, and the
+            ``compression_ratio`` of decoded to wire bytes (None before any byte).
+        """
+        with self._lock:
+            routes = {route: list(totals) for route, totals in self._routes.items()}
+        return {route: {'responses': responses, 'wire_bytes': wire_bytes,
+                        'decoded_bytes': decoded_bytes,
+                        'compression_ratio': float(decoded_bytes) / wire_bytes
+                        if wire_bytes else None}
+                for route, (responses, wire_bytes, decoded_bytes) in routes.items()}
+
+    def reset(self):
+        """
+        Forget the recorded responses.
+        """
+        with self._lock:
+            self._routes.clear()
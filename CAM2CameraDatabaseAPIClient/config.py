@@ -15,3 +15,159 @@ CLIENTID_LENGTH = 96
 """
 we generate a fixed length ID for client in the API.
 """
+
+POOL_CONNECTIONS = 10
+
+"""
+Number of per-host connection pools the transport keeps alive.
+"""
+
+POOL_MAXSIZE = 10
+
+"""
+Maximum number of kept-alive connections to a single host.
+Raise this together with the number of worker threads sharing one client.
+"""
+
+MAX_IN_FLIGHT = 100
+
+"""
+Maximum number of requests an asynchronous client keeps in flight at the same time.
+"""
+
+MAX_WORKERS = 8
+
+"""
+Default number of worker threads used by client methods that send several requests at once.
+"""
+
+SEARCH_PAGE_SIZE = 100
+
+"""
+Maximum number of cameras the API returns for one search request.
+"""
+
+TOKEN_LIFETIME = 300
+
+"""
+Lifetime in seconds of a token issued by the API, used when the token does not carry
+its own expiration time.
+"""
+
+TOKEN_REFRESH_MARGIN = 30
+
+"""
+A token is refreshed in the background once it is this many seconds away from expiring.
+"""
+
+CACHE_TTL = 300
+
+"""
+Default number of seconds a cached camera lookup stays valid.
+"""
+
+CACHE_MAXSIZE = 10000
+
+"""
+Default maximum number of lookups kept by an in-memory camera cache.
+"""
+
+CACHE_MAX_AGE = 86400
+
+"""
+Default number of seconds a camera stored in a persistent cache is served before being
+fetched again.
+"""
+
+REPLICA_SYNC_OVERLAP = 60
+
+"""
+Number of seconds each replica sync reaches back before the previous one, so that
+changes are not missed because of clock differences between the client and the API.
+"""
+
+STREAM_CHUNK_SIZE = 65536
+
+"""
+Number of bytes read from the network at a time when a response is decoded as it arrives.
+"""
+
+RATE_LIMITS = {'auth': 1, 'search': 10, 'read': 50, 'write': 10}
+
+"""
+Default number of requests per second a rate limiter allows for each route class.
+"""
+
+RATE_LIMIT_RETRIES = 3
+
+"""
+Number of times a request answered with 429 Too Many Requests is sent again by a rate
+limiter before a RateLimitError is raised.
+"""
+
+RETRY_AFTER_DEFAULT = 1
+
+"""
+Number of seconds a route class is paused after a 429 response without Retry-After header.
+"""
+
+RATE_STATS_WINDOW = 60
+
+"""
+Number of seconds of recent requests the throughput reported by a rate limiter covers.
+"""
+
+RETRY_MAX_RETRIES = 3
+
+"""
+Default number of times a retry policy sends a failed request again.
+"""
+
+RETRY_BACKOFF = 0.5
+
+"""
+Default number of seconds of the first retry delay of a retry policy, doubled after
+every attempt.
+"""
+
+RETRY_MAX_BACKOFF = 30
+
+"""
+Default maximum number of seconds between two attempts of a retry policy.
+"""
+
+RETRY_MAX_ELAPSED = 60
+
+"""
+Default maximum number of seconds a retry policy keeps retrying a request.
+"""
+
+CONNECT_TIMEOUT = 3.05
+
+"""
+Default number of seconds to wait for a connection to the API to be established.
+"""
+
+READ_TIMEOUT = 30
+
+"""
+Default number of seconds to wait for the API between two bytes of a response.
+"""
+
+BREAKER_FAILURE_THRESHOLD = 5
+
+"""
+Default number of consecutive failures of a route family that open its circuit breaker.
+"""
+
+BREAKER_RESET_TIMEOUT = 30
+
+"""
+Default number of seconds an open circuit breaker fails fast before letting a probe through.
+"""
+
+COMPRESS_MIN_SIZE = 1024
+
+"""
+Minimum size in bytes of a request body worth compressing.
+"""
@@ -136,3 +136,66 @@ class InvalidClientSecretError(Error):
 
     def __str__(self):
         return str(self.message)
+
+
+class RateLimitError(Error):
+    """
+    Corresponends to 429 Too Many Requests in API.
+    Raised once the rate limiter of the transport gave up waiting for the API
+    to accept the request.
+
+    Attributes
+    ----------
+    message : str
+        Detailed error message
+    retry_after : float
+        Number of seconds the API asked to wait before the next request.
+    """
+
+    def __init__(self, message, retry_after=None):
+        Error.__init__(self, None, None)
+        self.message = message
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return str(self.message)
+
+
+class DeadlineExceededError(Error):
+    """
+    Raised when the time budget of an operation runs out before it completes.
+    The requests of the operation that were not sent yet are cancelled.
+    """
+
+    def __init__(self, message='Deadline exceeded.'):
+        Error.__init__(self, None, None)
+        self.message = message
+
+    def __str__(self):
+        return str(self.message)
+
+
+class CircuitOpenError(Error):
+    """
+    Raised without sending the request while the circuit breaker of its route family
+    is open, because the API failed repeatedly.
+
+    Attributes
+    ----------
+    message : str
+        Detailed error message
+    family : str
+        Route family whose circuit is open.
+    retry_after : float
+        Number of seconds before a probe request is let through.
+    """
+
+    def __init__(self, family, retry_after):
+        Error.__init__(self, None, None)
+        self.family = family
+        self.retry_after = retry_after
+        self.message = 'Circuit of ' + family + ' routes is open, retry in ' + \
+            str(round(retry_after, 1)) + ' seconds.'
+
+    def __str__(self):
+        return str(self.message)
@@ -0,0 +1,166 @@
+"""
+Helpers to walk the offset-paginated routes of the CAM2 Database API.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .error import DeadlineExceededError
+
+
+def iter_pages(fetch_page, offset=0, page_size=None):
+    """Yield successive pages of a paginated route.
+
+    While the caller consumes a page, the next one is already being fetched by a
+    background thread, so at most two pages are held in memory at any time.
+
+    Parameters
+    ----------
+    fetch_page : callable
+        Called with an offset, returns the list of items starting at that offset.
+    offset : int, optional
+        Offset of the first page.
+    page_size : int, optional
+        Maximum number of items in a page. A shorter page is the last one.
+        If not provided, pages are fetched until an empty page is returned.
+
+    Yields
+    ------
+    list
+        The items of one page. Empty pages are not yielded.
+
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(fetch_page, offset)
+    try:
+        while future is not None:
+            page = future.result()
+            offset += len(page)
+            last = not page or (page_size is not None and len(page) < page_size)
+            future = None if last else pool.submit(fetch_page, offset)
+            if page:
+                yield page
+    finally:
+        if future is not None:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def fetch_all_pages(fetch_page, offset, page_size, max_workers, deadline=None):
+    """Fetch every page of a paginated route, several pages at a time.
+
+    Pages are requested in waves of ``max_workers`` consecutive offsets. The first page
+    shorter than ``page_size`` marks the end of the results; no wave is started past it.
+
+    Parameters
+    ----------
+    fetch_page : callable
+        Called with an offset, returns the list of items starting at that offset.
+    offset : int
+        Offset of the first page.
+    page_size : int
+        Maximum number of items in a page.
+    max_workers : int
+        Maximum number of pages fetched at the same time.
+    deadline : float, optional
+        Time, as returned by :func:`time.time`, by which every page must be fetched.
+
+    Returns
+    -------
+    :obj:`list` of list
+        The pages in offset order, up to and including the last one.
+
+    Raises
+    ------
+    DeadlineExceededError
+        If the deadline passes before the last page is fetched. The pages not
+        requested yet are cancelled.
+
+    """
+    pages = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            futures = [pool.submit(fetch_page, offset + i * page_size)
+                       for i in range(max_workers)]
+            try:
+                for future in futures:
+                    page = future_result(future, deadline)
+                    pages.append(page)
+                    if len(page) < page_size:
+                        return pages
+            finally:
+                for future in futures:
+                    future.cancel()
+            offset += max_workers * page_size
+
+
+def future_result(future, deadline=None):
+    """
+    Wait for the result of a future until a deadline, given as a :func:`time.time` value.
+
+    Raises
+    ------
+    DeadlineExceededError
+        If the deadline passes first.
+    """
+    if deadline is None:
+        return future.result()
+    try:
+        return future.result(timeout=max(0, deadline - time.time()))
+    except FutureTimeoutError:
+        raise DeadlineExceededError()
+
+
+class ChangeLogIterator(object):
+    """Class representing an iterator over the change log of the database.
+
+    Entries are yielded one at a time while the pages of the log are fetched with
+    :func:`iter_pages`, so the next page is read ahead in the background. A page is
+    fetched by calling ``fetch_page`` with its offset if given, else by calling
+    ``client.get_change_log``.
+
+    Attributes
+    ----------
+    start : str
+        Start time of the log being read.
+    end : str
+        End time of the log being read.
+    offset : int
+        Offset in the log of the next entry to be yielded.
+    """
+
+    def __init__(self, client, start=None, end=None, offset=0, fetch_page=None):
+        self.start = start
+        self.end = end
+        self.offset = offset
+        if fetch_page is None:
+            def fetch_page(page_offset):
+                return client.get_change_log(start, end, page_offset)
+        self._pages = iter_pages(fetch_page, offset)
+        self._page = []
+        self._index = 0
+
+    @property
+    def cursor(self):
+        """
+        dict: Keyword arguments of ``iter_change_log`` resuming after the last yielded entry.
+        """
+        return {'start': self.start, 'end': self.end, 'offset': self.offset}
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self._index >= len(self._page):
+            self._page = next(self._pages)
+            self._index = 0
+        entry = self._page[self._index]
+        self._index += 1
+        self.offset += 1
+        return entry
+
+    next = __next__
+
+    def close(self):
+        """
+        Stop reading ahead.
+        """
+        self._pages.close()
@@ -0,0 +1,256 @@
+"""
+Client side rate limiting of the requests sent to the CAM2 Database API.
+"""
+import email.utils
+import threading
+import time
+from collections import deque
+from .config import RATE_LIMITS, RATE_LIMIT_RETRIES, RETRY_AFTER_DEFAULT, RATE_STATS_WINDOW
+
+# Waits shorter than this are rounding errors of the clock arithmetic, not worth a sleep.
+_EPSILON = 1e-9
+
+
+class TokenBucket(object):
+    """Class representing a thread-safe token bucket.
+
+    Tokens are added at a constant rate up to the capacity of the bucket; each request
+    takes one, waiting for it if the bucket is empty. Bursts up to the capacity are sent
+    at once, and the average rate never exceeds ``rate``.
+
+    Attributes
+    ----------
+    rate : float
+        Number of tokens added per second.
+    capacity : float
+        Maximum number of tokens the bucket holds.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate should be positive.')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = self._clock()
+        self._resume_at = self._updated
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clock():
+        return getattr(time, 'monotonic', time.time)()
+
+    def _wait_time(self):
+        now = self._clock()
+        if self._resume_at - now > _EPSILON:
+            return self._resume_at - now
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens > 1 - _EPSILON:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds):
+        """
+        Hold every token for the given number of seconds, and empty the bucket so that
+        requests resume at the steady rate instead of in a burst.
+        """
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
+            self._tokens = 0
+            self._updated = self._resume_at
+
+    def try_acquire(self):
+        """
+        Take a token if one is available, without waiting.
+
+        Returns
+        -------
+        bool
+            True if a token was taken.
+        """
+        with self._lock:
+            return self._wait_time() == 0
+
+    def acquire(self, timeout=None):
+        """
+        Take a token, waiting until one is available.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait. Not limited if not provided.
+
+        Returns
+        -------
+        float or None
+            Number of seconds spent waiting, or None if no token is available within
+            the timeout. The bucket does not wait for a token it cannot get in time.
+        """
+        waited = 0
+        while True:
+            with self._lock:
+                delay = self._wait_time()
+            if delay == 0:
+                return waited
+            if timeout is not None and waited + delay > timeout:
+                return None
+            time.sleep(delay)
+            waited += delay
+
+
+def parse_retry_after(value, default=RETRY_AFTER_DEFAULT):
+    """
+    Return the number of seconds to wait given by a Retry-After header, which holds
+    either a number of seconds or an HTTP date.
+    """
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return default
+    return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+class RateLimiter(object):
+    """Class representing the rate limits of the requests to the CAM2 Database API.
+
+    Each class of route has its own token bucket: 'auth' for token requests,
+    'search' for searches, existence checks and the change log, 'read' for the other
+    GET routes and 'write' for POST and PUT routes. A request waits for a token of its
+    class before being sent. When the API answers 429 Too Many Requests, the route
+    class is paused for the time given by the Retry-After header and the request is
+    sent again. A request which would wait past the deadline set by
+    :meth:`Transport.timeouts` raises :obj:`DeadlineExceededError` without waiting.
+
+    A rate limiter is set on a :obj:`Transport`, and is shared by every client using
+    that transport.
+
+    Attributes
+    ----------
+    rates : dict
+        Number of requests per second allowed for each route class.
+    max_retries : int
+        Number of times a request answered with 429 is sent again before
+        :obj:`RateLimitError` is raised.
+
+    Example
+    -------
+
+        limiter = RateLimiter(rates={'search': 5, 'write': 2})
+        client = Client(clientID, clientSecret, rate_limiter=limiter)
+        ...
+        print(limiter.stats()['search']['throughput'])
+
+    """
+
+    route_classes = ('auth', 'search', 'read', 'write')
+
+    def __init__(self, rates=None, burst=None, max_retries=RATE_LIMIT_RETRIES):
+
+        """RateLimiter initialization method.
+
+        Parameters
+        ----------
+        rates : dict, optional
+            Requests per second for some route classes; the others keep their default
+            rate from :data:`config.RATE_LIMITS`.
+        burst : dict, optional
+            Number of requests of a route class that can be sent at once after an idle
+            period. Defaults to one second of requests.
+        max_retries : int, optional
+            Number of times a request answered with 429 is sent again.
+
+        """
+        self.rates = dict(RATE_LIMITS, **(rates or {}))
+        self.max_retries = max_retries
+        burst = burst or {}
+        self._buckets = {route: TokenBucket(self.rates[route], burst.get(route))
+                         for route in self.route_classes}
+        self._stats = {route: {'requests': 0, 'throttled': 0, 'wait_time': 0.0}
+                       for route in self.route_classes}
+        self._recent = {route: deque() for route in self.route_classes}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def route_class(method, url):
+        """
+        Return the route class of a request.
+        """
+        if method != 'GET':
+            return 'write'
+        path = url.split('?', 1)[0]
+        if path.endswith('/auth'):
+            return 'auth'
+        if path.endswith(('/cameras/search', '/cameras/exist', '/apps/db-change')):
+            return 'search'
+        return 'read'
+
+    def acquire(self, route, timeout=None):
+        """
+        Wait until a request of the route class can be sent.
+
+        Parameters
+        ----------
+        route : str
+            Route class of the request.
+        timeout : float, optional
+            Maximum number of seconds to wait. Not limited if not provided.
+
+        Returns
+        -------
+        float or None
+            Number of seconds spent waiting, or None if the request cannot be sent
+            within the timeout, in which case it does not wait.
+        """
+        waited = self._buckets[route].acquire(timeout)
+        if waited is None:
+            return None
+        now = TokenBucket._clock()
+        with self._lock:
+            stats = self._stats[route]
+            stats['requests'] += 1
+            stats['wait_time'] += waited
+            recent = self._recent[route]
+            recent.append(now)
+            while recent and recent[0] <= now - RATE_STATS_WINDOW:
+                recent.popleft()
+        return waited
+
+    def throttle(self, route, seconds):
+        """
+        Pause the route class after a 429 response.
+        """
+        self._buckets[route].pause(seconds)
+        with self._lock:
+            self._stats[route]['throttled'] += 1
+
+    def stats(self):
+        """
+        Return the activity of each route class.
+
+        Returns
+        -------
+        dict
+            For each route class, a dict with 'requests', the number of requests sent,
+            'throttled', the number of 429 responses, 'wait_time', the total number
+            of seconds requests waited for the limiter, 'mean_wait', the average wait
+            of a request, and 'throughput', the requests per second sent over the
+            last minute.
+        """
+        now = TokenBucket._clock()
+        result = {}
+        with self._lock:
+            for route, stats in self._stats.items():
+                recent = self._recent[route]
+                while recent and recent[0] <= now - RATE_STATS_WINDOW:
+                    recent.popleft()
+                result[route] = dict(stats,
+                                     mean_wait=stats['wait_time'] / max(1, stats['requests']),
+                                     throughput=len(recent) / float(RATE_STATS_WINDOW))
+        return result
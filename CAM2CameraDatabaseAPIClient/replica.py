@@ -0,0 +1,217 @@
+"""
+Represents a local replica of the CAM2 camera database.
+"""
+import math
+import threading
+from datetime import datetime, timedelta
+from .config import MAX_WORKERS, REPLICA_SYNC_OVERLAP
+from .error import ResourceNotFoundError
+
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def _utcnow():
+    return datetime.utcnow()
+
+
+class CameraReplica(object):
+    """Class representing a local copy of the camera database.
+
+    The replica is filled once with every camera returned by a paged search, then kept
+    up to date by :meth:`sync`, which only re-fetches the cameras listed in the change
+    log since the previous sync. Lookups and searches on the replica do not send any
+    request to the API.
+
+    Warning
+    ---------
+    Reading the change log requires webUI permission.
+
+    Attributes
+    ----------
+    client : :obj:`Client`
+        Client used to fetch cameras and the change log.
+    watermark : :obj:`datetime.datetime`
+        UTC time up to which the replica includes the changes of the database,
+        or None before the first snapshot.
+
+    Example
+    -------
+
+        replica = CameraReplica(client)
+        replica.snapshot()
+        replica.start(interval=60)
+        cameras = replica.search(country='USA', camera_type='ip')
+
+    """
+
+    def __init__(self, client, max_workers=MAX_WORKERS):
+        """Replica initialization method.
+
+        Parameters
+        ----------
+        client : :obj:`Client`
+            Client used to fetch cameras and the change log.
+        max_workers : int, optional
+            Maximum number of requests sent at the same time while syncing.
+
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.watermark = None
+        self._cameras = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._cameras)
+
+    def __contains__(self, cameraID):
+        return cameraID in self._cameras
+
+    def snapshot(self):
+        """
+        Replace the content of the replica with every camera in the database.
+        """
+        started = _utcnow()
+        cameras = self.client.search_camera_all(max_workers=self.max_workers)
+        with self._lock:
+            self._cameras = {camera['cameraID']: camera for camera in cameras}
+            self.watermark = started
+
+    def _changed_ids(self, start, end):
+        changed = []
+        seen = set()
+        for entry in self.client.iter_change_log(start=start, end=end):
+            if entry['cameraID'] not in seen:
+                seen.add(entry['cameraID'])
+                changed.append(entry['cameraID'])
+        return changed
+
+    def sync(self):
+        """
+        Apply the changes made to the database since the previous sync.
+        A snapshot is taken instead if the replica has never been filled.
+
+        Returns
+        -------
+        int
+            Number of cameras updated or removed.
+
+        Raises
+        ------
+        Error
+            If the change log or a changed camera cannot be fetched. The replica is
+            left as it was and the next sync retries the same changes.
+
+        """
+        if self.watermark is None:
+            self.snapshot()
+            return len(self._cameras)
+
+        end = _utcnow()
+        start = self.watermark - timedelta(seconds=REPLICA_SYNC_OVERLAP)
+        changed = self._changed_ids(start.strftime(_TIME_FORMAT), end.strftime(_TIME_FORMAT))
+        if self.client.cache is not None:
+            # Otherwise the client would answer with the cameras as they were before.
+            for cameraID in changed:
+                self.client.cache.invalidate_camera(cameraID)
+        cameras, errors = self.client.camera_by_list_id(changed, [],
+                                                        max_workers=self.max_workers,
+                                                        return_errors=True)
+        for error in errors.values():
+            if not isinstance(error, ResourceNotFoundError):
+                raise error
+
+        with self._lock:
+            for camera in cameras:
+                self._cameras[camera['cameraID']] = camera
+            for cameraID in errors:
+                self._cameras.pop(cameraID, None)
+            self.watermark = end
+        return len(changed)
+
+    def start(self, interval):
+        """
+        Sync the replica every ``interval`` seconds on a background thread.
+        Errors of a sync are ignored; the changes are picked up by the next one.
+        """
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sync()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+        self._thread = threading.Thread(target=run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background sync started by :meth:`start`.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def camera_by_id(self, cameraID):
+        """
+        Get a camera of the replica by its ID.
+
+        Raises
+        ------
+        ResourceNotFoundError
+            If the replica has no camera with this ID.
+        """
+        try:
+            return self._cameras[cameraID]
+        except KeyError:
+            raise ResourceNotFoundError('No camera found with cameraID ' + str(cameraID))
+
+    def search(self, latitude=None, longitude=None, radius=None, **kwargs):
+        """
+        Search the cameras of the replica.
+
+        Parameters
+        ----------
+        latitude : float, optional
+            Latitude of the center of the circle area to be searched.
+        longitude : float, optional
+            Longitude of the center of the circle area to be searched.
+        radius : float, optional
+            Radius in km of the circle area to be searched.
+        **kwargs
+            Camera fields that must be equal to the given values,
+            for example ``camera_type='ip'`` or ``country='USA'``.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`Camera`
+            All the cameras of the replica that satisfy the search criteria.
+
+        """
+        cameras = list(self._cameras.values())
+        result = []
+        for camera in cameras:
+            if any(camera.get(field) != value for field, value in kwargs.items()):
+                continue
+            if radius is not None and \
+                    not _within(camera, latitude, longitude, radius):
+                continue
+            result.append(camera)
+        return result
+
+
+def _within(camera, latitude, longitude, radius):
+    if camera.get('latitude') is None or camera.get('longitude') is None:
+        return False
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2 = math.radians(float(camera['latitude']))
+    lon2 = math.radians(float(camera['longitude']))
+    hav = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(hav)) <= radius
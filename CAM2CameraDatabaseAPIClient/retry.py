@@ -0,0 +1,129 @@
+"""
+Retrying the requests that fail because of transient errors.
+"""
+import random
+import time
+import requests
+from .config import RETRY_MAX_RETRIES, RETRY_BACKOFF, RETRY_MAX_BACKOFF, RETRY_MAX_ELAPSED
+
+
+class RetryPolicy(object):
+    """Class representing when and how a failed request is sent again.
+
+    A request is retried when the connection fails, times out, or the API answers
+    with a transient server error, waiting between attempts for an exponentially
+    growing delay with full jitter, so that many clients failing at the same time
+    do not retry in lockstep.
+
+    Only idempotent requests are retried: GET and PUT requests, which have the same
+    effect when sent twice. POST requests, such as ``cameras/create`` or
+    ``apps/register``, would create a second resource if the first attempt reached
+    the API, so they are not retried unless ``retry_post`` is set.
+
+    A retry policy is set on a :obj:`Transport`, or through the ``retry_policy``
+    argument of :obj:`Client`.
+
+    Attributes
+    ----------
+    max_retries : int
+        Maximum number of times a request is sent again.
+    backoff : float
+        Upper bound in seconds of the first delay, doubled after every attempt.
+    max_backoff : float
+        Maximum upper bound in seconds of a delay.
+    max_elapsed : float
+        Number of seconds after the first attempt beyond which no retry is started.
+    statuses : frozenset of int
+        Status codes that are retried.
+    retry_post : bool
+        If True, POST requests are retried too.
+
+    Example
+    -------
+
+        client = Client(clientID, clientSecret, retry_policy=RetryPolicy(max_retries=5))
+
+    """
+
+    exceptions = (requests.ConnectionError, requests.Timeout)
+
+    """
+    tuple: Exceptions of the transport that are retried.
+    """
+
+    def __init__(self, max_retries=RETRY_MAX_RETRIES, backoff=RETRY_BACKOFF,
+                 max_backoff=RETRY_MAX_BACKOFF, max_elapsed=RETRY_MAX_ELAPSED,
+                 statuses=(500, 502, 503, 504), retry_post=False):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.statuses = frozenset(statuses)
+        self.retry_post = retry_post
+
+    def is_idempotent(self, method):
+        """
+        Return whether requests of the given method may be retried.
+        """
+        return method != 'POST' or self.retry_post
+
+    def delay(self, attempt):
+        """
+        Return the number of seconds to wait before the retry following the given
+        attempt, counted from 0.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def call(self, method, send, deadline=None):
+        """
+        Send a request, retrying it according to this policy.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        send : callable
+            Sends the request and returns the response.
+        deadline : float, optional
+            Time, as returned by :func:`time.time`, after which no retry is started.
+            A retry whose delay would end past it is given up at once.
+
+        Returns
+        -------
+        :obj:`requests.Response`
+            The first response that is not retried, or the last one.
+
+        Raises
+        ------
+        requests.ConnectionError, requests.Timeout
+            If the last attempt failed with one of them.
+        """
+        if not self.is_idempotent(method):
+            return send()
+        start = time.time()
+        attempt = 0
+        while True:
+            try:
+                response = send()
+            except self.exceptions:
+                if not self._wait(attempt, start, deadline):
+                    raise
+            else:
+                if response.status_code not in self.statuses or \
+                        not self._wait(attempt, start, deadline, response):
+                    return response
+            attempt += 1
+
+    def _wait(self, attempt, start, deadline, response=None):
+        # Sleep before the next attempt, or return False if there is none.
+        if attempt >= self.max_retries:
+            return False
+        delay = self.delay(attempt)
+        now = time.time()
+        if now + delay - start > self.max_elapsed or \
+                (deadline is not None and now + delay >= deadline):
+            return False
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+        return True
@@ -0,0 +1,90 @@
+"""
+Incremental decoding of the JSON array responses of the CAM2 Database API.
+"""
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_array(chunks, decoder=None):
+    """Yield the items of a JSON array as its text arrives.
+
+    Only the items not yet yielded and the current chunk are held in memory, so
+    the first item is available as soon as its bytes are received and the whole
+    array is never built.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes or str
+        Successive pieces of the JSON text, such as
+        :meth:`requests.Response.iter_content`. Bytes are decoded as UTF-8.
+    decoder : :obj:`json.JSONDecoder`, optional
+        Decoder of the items.
+
+    Yields
+    ------
+    object
+        Each item of the array, parsed.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a JSON array.
+
+    """
+    decoder = decoder or json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf = ''
+    pos = 0
+    done = False
+
+    def more(buf, pos):
+        # Append the next chunk, dropping what was already parsed.
+        for chunk in chunks:
+            if isinstance(chunk, bytes):
+                chunk = text.decode(chunk)
+            if chunk:
+                return buf[pos:] + chunk, 0, False
+        return buf[pos:] + text.decode(b'', True), 0, True
+
+    expected = '['
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if done:
+                raise ValueError('Incomplete JSON array.')
+            buf, pos, done = more(buf, pos)
+            continue
+        if expected is not None:
+            char = buf[pos]
+            if char == ']' and expected != '[':
+                return
+            if char == ',' and expected == ',':
+                pos += 1
+                expected = None
+                continue
+            if expected == '[':
+                if char != '[':
+                    raise ValueError('Expected a JSON array.')
+                pos += 1
+                expected = ']'
+                continue
+            if expected == ',':
+                raise ValueError('Expected , or ] at position ' + str(pos) + '.')
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            if done:
+                raise
+            buf, pos, done = more(buf, pos)
+            continue
+        if end == len(buf) and not done:
+            # A number at the end of the buffer may continue in the next chunk.
+            buf, pos, done = more(buf, pos)
+            continue
+        pos = end
+        expected = ','
+        yield item
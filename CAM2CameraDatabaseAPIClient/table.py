@@ -0,0 +1,210 @@
+"""
+Represents search results in a columnar form.
+"""
+from .camera import Camera
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CameraTable(object):
+    """Class representing a set of cameras stored column by column in NumPy arrays.
+
+    Numeric fields are float arrays with NaN for missing values, flags are boolean
+    arrays, ``camera_type``, ``country`` and ``state`` are integer codes into a list of
+    categories (-1 for missing values) and the other fields, such as urls, are object
+    arrays. Indexing with an integer materializes that row as a camera; indexing with a
+    boolean mask, an index array or a slice returns a smaller table.
+
+    Attributes
+    ----------
+    columns : dict of :obj:`numpy.ndarray`
+        Array of each field, all of the same length.
+    categories : dict of list
+        Values the codes of each categorical field refer to.
+
+    Note
+    ----
+
+        This class requires the optional ``numpy`` package.
+
+    Example
+    -------
+
+        table = client.search_camera_table(country='USA', all_pages=True)
+        active = table[table.mask(camera_type='ip') & table.columns['is_active_video']]
+        north = active[active.columns['latitude'] > 45]
+        first = north[0]
+
+    """
+
+    _numeric_fields = ('latitude', 'longitude', 'resolution_width', 'resolution_height',
+                       'frame_rate', 'utc_offset', 'legacy_cameraID')
+
+    _integer_fields = frozenset(['resolution_width', 'resolution_height', 'frame_rate',
+                                 'utc_offset', 'legacy_cameraID'])
+
+    _flag_fields = ('is_active_image', 'is_active_video')
+
+    _categorical_fields = ('camera_type', 'country', 'state')
+
+    _object_fields = ('cameraID', 'source', 'city', 'timezone_id', 'timezone_name',
+                      'reference_logo', 'reference_url', 'ip', 'port', 'brand', 'model',
+                      'image_path', 'video_path', 'snapshot_url', 'm3u8_url')
+
+    _retrieval_fields = {'ip': ('ip', 'port', 'brand', 'model', 'image_path', 'video_path'),
+                         'non_ip': ('snapshot_url',),
+                         'stream': ('m3u8_url',)}
+
+    _all_retrieval_fields = frozenset(field for fields in _retrieval_fields.values()
+                                      for field in fields)
+
+    def __init__(self, columns, categories, record_class=Camera):
+        if np is None:
+            raise ImportError('CameraTable requires the numpy package.')
+        self.columns = columns
+        self.categories = categories
+        self._record_class = record_class
+
+    @classmethod
+    def from_json(cls, camera_response_array, record_class=Camera):
+        """
+        Build a table from the cameras of a search response, as parsed JSON.
+
+        Parameters
+        ----------
+        camera_response_array : list of dict
+            Cameras as returned by the API, with 'type' and 'retrieval' fields.
+        record_class : type, optional
+            :obj:`Camera` or :obj:`CameraRecord`, the form of the rows materialized
+            by indexing.
+
+        Returns
+        -------
+        :obj:`CameraTable`
+        """
+        if np is None:
+            raise ImportError('CameraTable requires the numpy package.')
+        values = {field: [] for field in cls._numeric_fields + cls._flag_fields +
+                  cls._object_fields}
+        codes = {field: [] for field in cls._categorical_fields}
+        lookup = {field: {} for field in cls._categorical_fields}
+        for row in camera_response_array:
+            retrieval = row.get('retrieval') or {}
+            for field, column in values.items():
+                column.append(row[field] if field in row else retrieval.get(field))
+            for field, column in codes.items():
+                value = row.get('type' if field == 'camera_type' else field)
+                if value is None:
+                    column.append(-1)
+                else:
+                    column.append(lookup[field].setdefault(value, len(lookup[field])))
+
+        columns = {}
+        for field in cls._numeric_fields:
+            columns[field] = np.array([np.nan if value is None else value
+                                       for value in values[field]], dtype=float)
+        for field in cls._flag_fields:
+            columns[field] = np.array([bool(value) for value in values[field]], dtype=bool)
+        for field in cls._object_fields:
+            column = np.empty(len(values[field]), dtype=object)
+            column[:] = values[field]
+            columns[field] = column
+        for field in cls._categorical_fields:
+            columns[field] = np.array(codes[field], dtype=np.int32)
+        categories = {field: sorted(lookup[field], key=lookup[field].get)
+                      for field in cls._categorical_fields}
+        return cls(columns, categories, record_class)
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Join several tables into one, in the given order.
+        """
+        tables = list(tables)
+        if not tables:
+            return cls.from_json([])
+        categories = {}
+        columns = {}
+        for field in cls._categorical_fields:
+            index = {}
+            remapped = []
+            for table in tables:
+                mapping = np.array([index.setdefault(value, len(index))
+                                    for value in table.categories[field]] + [-1],
+                                   dtype=np.int32)
+                remapped.append(mapping[table.columns[field]])
+            categories[field] = sorted(index, key=index.get)
+            columns[field] = np.concatenate(remapped)
+        for field in tables[0].columns:
+            if field not in columns:
+                columns[field] = np.concatenate([table.columns[field] for table in tables])
+        return cls(columns, categories, tables[0]._record_class)
+
+    def __len__(self):
+        return len(self.columns['cameraID'])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._row(key)
+        return type(self)({field: column[key] for field, column in self.columns.items()},
+                          self.categories, self._record_class)
+
+    def _row(self, index):
+        row = {}
+        for field in self._numeric_fields:
+            value = self.columns[field][index]
+            if np.isnan(value):
+                row[field] = None
+            else:
+                row[field] = int(value) if field in self._integer_fields else float(value)
+        for field in self._flag_fields:
+            row[field] = bool(self.columns[field][index])
+        for field in self._categorical_fields:
+            code = self.columns[field][index]
+            row[field] = self.categories[field][code] if code >= 0 else None
+        retrieval_fields = self._retrieval_fields.get(row['camera_type'], ())
+        retrieval = {}
+        for field in self._object_fields:
+            if field in retrieval_fields:
+                retrieval[field] = self.columns[field][index]
+            elif field not in self._all_retrieval_fields:
+                row[field] = self.columns[field][index]
+        row['type'] = row.pop('camera_type')
+        row['retrieval'] = retrieval
+        return self._record_class.process_json_entry(row)
+
+    def column(self, field):
+        """
+        Return the values of a field; categorical fields are decoded to their values.
+        """
+        if field in self._categorical_fields:
+            decoded = np.array(self.categories[field] + [None], dtype=object)
+            return decoded[self.columns[field]]
+        return self.columns[field]
+
+    def mask(self, **conditions):
+        """
+        Return the boolean array of the rows whose fields equal all the given values.
+        """
+        result = np.ones(len(self), dtype=bool)
+        for field, value in conditions.items():
+            if field in self._categorical_fields:
+                categories = self.categories[field]
+                code = categories.index(value) if value in categories else -2
+                result &= self.columns[field] == code
+            else:
+                result &= self.columns[field] == value
+        return result
+
+    def where(self, **conditions):
+        """
+        Return the table of the rows whose fields equal all the given values.
+        """
+        return self[self.mask(**conditions)]
@@ -0,0 +1,138 @@
+"""
+This module contains test cases for the asyncio client.
+"""
+import asyncio
+import json
+import unittest
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.async_client import AsyncResponse
+from CAM2CameraDatabaseAPIClient.camera import IPCamera
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.error import ResourceNotFoundError, FormatError
+
+
+def run_in_new_loop(coroutine):
+    """
+    Run a coroutine in a new event loop; asyncio.run requires Python 3.7.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class FakeTransport(object):
+    """
+    Answers every request from a route table and records the calls it received.
+    """
+
+    def __init__(self, routes, delay=0):
+        self.routes = routes
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, url, headers=None, params=None, data=None):
+        self.calls.append((method, url, headers, params, data))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        status, body = self.routes[url](headers) if callable(self.routes[url]) \
+            else self.routes[url]
+        return AsyncResponse(status, {}, json.dumps(body).encode('utf-8'))
+
+    async def close(self):
+        pass
+
+
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base_URL = 'https://cam2-api.herokuapp.com/'
+        self.camera = {'cameraID': '1', 'type': 'ip', 'latitude': 1.0,
+                       'retrieval': {'ip': '210.1.1.2', 'port': '80'}}
+
+    def make_client(self, routes, **kwargs):
+        transport = FakeTransport(routes, **kwargs)
+        client = cam2.AsyncClient('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                  transport=transport, max_in_flight=4)
+        return client, transport
+
+    def test_single_token_request(self):
+        client, transport = self.make_client({
+            self.base_URL + 'auth': (200, {'token': 'correctToken'}),
+            self.base_URL + 'cameras/1': (200, self.camera)}, delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*[client.camera_by_id('1') for _ in range(20)])
+
+        cameras = run_in_new_loop(run())
+        self.assertEqual(20, len(cameras))
+        self.assertTrue(isinstance(cameras[0], IPCamera))
+        self.assertEqual(cameras[0]['ip'], '210.1.1.2')
+        auth_calls = [c for c in transport.calls if c[1].endswith('auth')]
+        self.assertEqual(1, len(auth_calls))
+        self.assertLessEqual(transport.max_in_flight, 4)
+
+    def test_expired_token_single_refresh(self):
+        def camera_route(headers):
+            if headers['Authorization'] == 'Bearer ExpiredToken':
+                return 401, {'message': 'Token expired.'}
+            return 200, self.camera
+
+        client, transport = self.make_client({
+            self.base_URL + 'auth': (200, {'token': 'correctToken'}),
+            self.base_URL + 'cameras/1': camera_route}, delay=0.01)
+        client.token = 'ExpiredToken'
+
+        async def run():
+            return await asyncio.gather(*[client.camera_by_id('1') for _ in range(10)])
+
+        self.assertEqual(10, len(run_in_new_loop(run())))
+        auth_calls = [c for c in transport.calls if c[1].endswith('auth')]
+        self.assertEqual(1, len(auth_calls))
+        self.assertEqual(client.token, 'correctToken')
+
+    def test_successive_loops(self):
+        client, transport = self.make_client({
+            self.base_URL + 'auth': (200, {'token': 'correctToken'}),
+            self.base_URL + 'cameras/1': (200, self.camera)})
+        for _ in range(2):
+            self.assertEqual(run_in_new_loop(client.camera_by_id('1'))['ip'], '210.1.1.2')
+            client.token = None
+        auth_calls = [c for c in transport.calls if c[1].endswith('auth')]
+        self.assertEqual(2, len(auth_calls))
+
+    def test_search_camera(self):
+        client, transport = self.make_client({
+            self.base_URL + 'cameras/search': (200, [self.camera] * 3)})
+        client.token = 'correctToken'
+        cameras = run_in_new_loop(client.search_camera(camera_type='ip', city=None))
+        self.assertEqual(3, len(cameras))
+        self.assertEqual(transport.calls[0][3], {'type': 'ip'})
+        with self.assertRaises(FormatError):
+            run_in_new_loop(client.search_camera(dummy=1))
+
+    def test_camera_by_id_not_found(self):
+        client, _ = self.make_client({
+            self.base_URL + 'cameras/2': (404, {'message': 'No camera found'})})
+        client.token = 'correctToken'
+        with self.assertRaises(ResourceNotFoundError):
+            run_in_new_loop(client.camera_by_id('2'))
+
+    def test_write_camera(self):
+        client, transport = self.make_client({
+            self.base_URL + 'cameras/create': (201, {'cameraID': 'new'})})
+        client.token = 'correctToken'
+        cameraID = run_in_new_loop(client.write_camera(camera_type='non_ip', snapshot_url='url'))
+        self.assertEqual(cameraID, 'new')
+        method, _, _, _, data = transport.calls[0]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(data, {'type': 'non_ip', 'retrieval': '{"snapshot_url": "url"}'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+This module contains test cases for sharing tokens between clients.
+"""
+import shutil
+import tempfile
+import time
+import unittest
+import mock
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+
+
+class FileTokenStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.store = cam2.FileTokenStore(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_load_missing(self):
+        self.assertIs(self.store.load('client'), None)
+
+    def test_save_load(self):
+        with self.store.lock('client'):
+            self.store.save('client', 'correctToken', 1000.0)
+        self.assertEqual(self.store.load('client'), ('correctToken', 1000.0))
+        self.assertEqual(cam2.FileTokenStore(self.cache_dir).load('client'),
+                         ('correctToken', 1000.0))
+        self.assertIs(self.store.load('other'), None)
+
+
+class SharedTokenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.token_url = 'https://cam2-api.herokuapp.com/auth'
+        self.token_response = mock.Mock()
+        self.token_response.status_code = 200
+        self.token_response.json.return_value = {'token': 'correctToken'}
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def make_client(self):
+        return cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                           token_store=cam2.FileTokenStore(self.cache_dir))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_token_reused(self, mock_get):
+        mock_get.return_value = self.token_response
+        first = self.make_client()
+        second = self.make_client()
+        first._request_token()
+        second._request_token()
+        self.assertEqual(second.token, 'correctToken')
+        self.assertEqual(second.token_expiry, first.token_expiry)
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_stale_token_not_reused(self, mock_get):
+        mock_get.return_value = self.token_response
+        client = self.make_client()
+        client.token_store.save(client.clientID, 'ExpiredToken', time.time() + 1)
+        client._request_token()
+        self.assertEqual(client.token, 'correctToken')
+        self.assertEqual(client.token_store.load(client.clientID)[0], 'correctToken')
+
+        # a token rejected by the API is not taken back from the store
+        client.token_store.save(client.clientID, 'RejectedToken', time.time() + 300)
+        client.token = 'RejectedToken'
+        client._request_token()
+        self.assertEqual(client.token, 'correctToken')
+        self.assertEqual(2, mock_get.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+This module contains test cases for the circuit breaker.
+"""
+import unittest
+import mock
+import requests
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.breaker import CircuitBreaker
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.error import CircuitOpenError, InternalError, \
+    DeadlineExceededError
+from CAM2CameraDatabaseAPIClient.retry import RetryPolicy
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [100.0]
+        patcher = mock.patch.object(CircuitBreaker, '_clock', side_effect=lambda: self.now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                  circuit_breaker=self.breaker)
+        self.client.token = 'correctToken'
+
+    @staticmethod
+    def response(status_code, body=None):
+        response = mock.Mock()
+        response.status_code = status_code
+        response.json.return_value = body
+        return response
+
+    def test_route_family(self):
+        base_URL = cam2.Client.base_URL
+        self.assertEqual(CircuitBreaker.route_family(base_URL + 'auth'), 'auth')
+        self.assertEqual(CircuitBreaker.route_family(base_URL + 'cameras/search'), 'cameras')
+        self.assertEqual(CircuitBreaker.route_family(base_URL + 'apps/db-change'), 'apps')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_trip_and_recover(self, mock_get):
+        mock_get.side_effect = [self.response(500), requests.ConnectionError()]
+        with self.assertRaises(InternalError):
+            self.client.camera_by_id('ID')
+        self.assertEqual(self.breaker.states()['cameras']['state'], 'closed')
+        with self.assertRaises(requests.ConnectionError):
+            self.client.camera_by_id('ID')
+        self.assertEqual(self.breaker.states()['cameras'],
+                         {'state': 'open', 'failures': 2, 'trips': 1})
+
+        with self.assertRaises(CircuitOpenError) as context:
+            self.client.search_camera()
+        self.assertEqual(context.exception.family, 'cameras')
+        self.assertEqual(context.exception.retry_after, 10)
+        self.assertEqual(2, mock_get.call_count)
+
+        self.now[0] += 10
+        self.assertEqual(self.breaker.states()['cameras']['state'], 'half_open')
+        mock_get.side_effect = [self.response(200, [])]
+        self.assertEqual(self.client.search_camera(), [])
+        self.assertEqual(self.breaker.states()['cameras'],
+                         {'state': 'closed', 'failures': 0, 'trips': 1})
+
+    def test_half_open_single_probe(self):
+        for _ in range(2):
+            self.breaker.record('apps', False)
+        self.now[0] += 10
+        probe = self.breaker.before_request('apps')
+        self.assertIsNotNone(probe)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('apps')
+        self.breaker.record('apps', False, probe)
+        self.assertEqual(self.breaker.states()['apps']['trips'], 2)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('apps')
+        self.assertIsNone(self.breaker.before_request('cameras'))
+
+    def test_only_probe_changes_half_open_circuit(self):
+        # A request sent while the circuit was closed finishes after it opened.
+        self.assertIsNone(self.breaker.before_request('cameras'))
+        for _ in range(2):
+            self.breaker.record('cameras', False)
+        self.now[0] += 10
+        probe = self.breaker.before_request('cameras')
+        self.breaker.record('cameras', True)
+        self.assertEqual(self.breaker.states()['cameras']['state'], 'half_open')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request('cameras')
+        self.breaker.record('cameras', True, probe)
+        self.assertEqual(self.breaker.states()['cameras'],
+                         {'state': 'closed', 'failures': 0, 'trips': 1})
+
+    def test_probe_released_without_outcome(self):
+        for _ in range(2):
+            self.breaker.record('cameras', False)
+        self.now[0] += 10
+        with self.client.timeouts(deadline=0):
+            with self.assertRaises(DeadlineExceededError):
+                self.client.camera_by_id('ID')
+        self.breaker.before_request('cameras')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.retry.time.sleep')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_open_circuit_is_not_retried(self, mock_get, mock_sleep):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                             circuit_breaker=self.breaker,
+                             retry_policy=RetryPolicy(max_retries=5))
+        client.token = 'correctToken'
+        mock_get.return_value = self.response(503)
+        with self.assertRaises(CircuitOpenError):
+            client.camera_by_id('ID')
+        self.assertEqual(2, mock_get.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+This module contains test cases for caching camera lookups.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.camera import IPCamera, NonIPCamera, StreamCameraRecord
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+
+
+class CameraCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = cam2.CameraCache(ttl=10, maxsize=2)
+
+    def test_hit_miss(self):
+        self.assertIs(self.cache.get(('id', '1')), None)
+        self.cache.set(('id', '1'), {'cameraID': '1'})
+        self.assertEqual(self.cache.get(('id', '1')), {'cameraID': '1'})
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.cache._clock')
+    def test_ttl(self, mock_clock):
+        mock_clock.return_value = 100
+        self.cache.set(('id', '1'), {'cameraID': '1'})
+        mock_clock.return_value = 109
+        self.assertIsNot(self.cache.get(('id', '1')), None)
+        mock_clock.return_value = 110
+        self.assertIs(self.cache.get(('id', '1')), None)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.set(('id', '1'), {'cameraID': '1'})
+        self.cache.set(('id', '2'), {'cameraID': '2'})
+        self.cache.get(('id', '1'))
+        self.cache.set(('id', '3'), {'cameraID': '3'})
+        self.assertIsNot(self.cache.get(('id', '1')), None)
+        self.assertIs(self.cache.get(('id', '2')), None)
+        self.assertIsNot(self.cache.get(('id', '3')), None)
+
+    def test_invalidate_camera(self):
+        cache = cam2.CameraCache()
+        cache.set(('id', '1'), {'cameraID': '1'})
+        cache.set(('legacy', '10'), {'cameraID': '1'})
+        cache.set(('id', '2'), {'cameraID': '2'})
+        cache.set(('exist', (('type', 'ip'),)), [])
+        cache.invalidate_camera('1')
+        self.assertEqual(len(cache), 1)
+        self.assertIsNot(cache.get(('id', '2')), None)
+
+
+class ClientCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                  cache=cam2.CameraCache())
+        self.client.token = 'correctToken'
+        self.camera_response = mock.Mock()
+        self.camera_response.status_code = 200
+        self.camera_response.json.return_value = {'cameraID': '12345', 'type': 'non_ip',
+                                                  'retrieval': {'snapshot_url': 'url'}}
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_id_cached(self, mock_get):
+        mock_get.return_value = self.camera_response
+        first = self.client.camera_by_id('12345')
+        second = self.client.camera_by_id('12345')
+        self.assertIs(first, second)
+        self.assertEqual(1, mock_get.call_count)
+        self.client.camera_by_legacy_id('1')
+        self.client.camera_by_legacy_id('1')
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(self.client.cache.hits, 2)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_check_cam_exist_cached(self, mock_get):
+        exist_response = mock.Mock()
+        exist_response.status_code = 200
+        exist_response.json.return_value = []
+        mock_get.return_value = exist_response
+        self.assertEqual(self.client.check_cam_exist('ip', ip='127.0.0.1', port=80), [])
+        self.assertEqual(self.client.check_cam_exist('ip', port=80, ip='127.0.0.1'), [])
+        self.assertEqual(self.client.check_cam_exist('ip', ip='127.0.0.2'), [])
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_write_camera_invalidates(self, mock_get, mock_put):
+        mock_get.return_value = self.camera_response
+        write_response = mock.Mock()
+        write_response.status_code = 200
+        write_response.json.return_value = {'cameraID': '12345'}
+        mock_put.return_value = write_response
+        self.client.camera_by_id('12345')
+        self.client.write_camera(cameraID='12345', camera_type='non_ip', snapshot_url='url2')
+        self.client.camera_by_id('12345')
+        self.assertEqual(2, mock_get.call_count)
+
+
+class SQLiteCameraCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.cache_dir, 'cameras.db')
+        self.cache = cam2.SQLiteCameraCache(self.path)
+        self.camera = IPCamera(cameraID='1', camera_type='ip', ip='127.0.0.1', port='80',
+                               latitude=40.4, is_active_image=True)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_persistent(self):
+        self.cache.set(('id', '1'), self.camera)
+        self.cache.set(('exist', (('ip', '127.0.0.1'), ('type', 'ip'))), [self.camera])
+        restarted = cam2.SQLiteCameraCache(self.path)
+        camera = restarted.get(('id', '1'))
+        self.assertTrue(isinstance(camera, IPCamera))
+        self.assertEqual(camera, self.camera)
+        self.assertEqual(restarted.get(('exist', (('ip', '127.0.0.1'), ('type', 'ip')))),
+                         [self.camera])
+        self.assertIs(restarted.get(('id', '2')), None)
+        self.assertEqual((restarted.hits, restarted.misses), (2, 1))
+        restarted.close()
+
+    def test_compact_records(self):
+        record = StreamCameraRecord(cameraID='5', camera_type='stream', m3u8_url='url')
+        self.cache.set(('id', '5'), record)
+        self.cache.set(('exist', (('type', 'stream'),)), [])
+        restored = self.cache.get(('id', '5'))
+        self.assertTrue(isinstance(restored, StreamCameraRecord))
+        self.assertEqual(restored, record)
+        self.assertEqual(self.cache.get(('exist', (('type', 'stream'),))), [])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.cache.time.time')
+    def test_max_age(self, mock_time):
+        self.cache.max_age = 60
+        mock_time.return_value = 1000
+        self.cache.set(('id', '1'), self.camera)
+        mock_time.return_value = 1059
+        self.assertIsNot(self.cache.get(('id', '1')), None)
+        mock_time.return_value = 1060
+        self.assertIs(self.cache.get(('id', '1')), None)
+
+    def test_invalidate_camera(self):
+        self.cache.set_many([(('id', '1'), self.camera), (('legacy', 5), self.camera),
+                             (('id', '2'), NonIPCamera(cameraID='2', camera_type='non_ip')),
+                             (('exist', (('type', 'ip'),)), [])])
+        self.assertEqual(len(self.cache), 4)
+        self.cache.invalidate_camera('1')
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_results_stored(self, mock_get):
+        search_response = mock.Mock()
+        search_response.status_code = 200
+        search_response.json.return_value = [
+            {'cameraID': '7', 'type': 'non_ip', 'retrieval': {'snapshot_url': 'url'}}]
+        mock_get.return_value = search_response
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, cache=self.cache)
+        client.token = 'correctToken'
+        client.search_camera(country='USA')
+        camera = client.camera_by_id('7')
+        self.assertEqual(camera['snapshot_url'], 'url')
+        self.assertEqual(1, mock_get.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
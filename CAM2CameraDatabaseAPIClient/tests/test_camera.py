@@ -5,35 +5,39 @@ import unittest
 import sys
 import random
 from os import path
-from CAM2CameraDatabaseAPIClient.camera import Camera, IPCamera, NonIPCamera, StreamCamera
+from CAM2CameraDatabaseAPIClient.camera import Camera, IPCamera, NonIPCamera, StreamCamera, \
+    CameraRecord, IPCameraRecord, NonIPCameraRecord, LazyCameraList
 
 sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
 
 
+CAM_ATTR = {
+    'cameraID': 'test',
+    'legacy_cameraID': 1,
+    'camera_type': 'ip',
+    'frame_rate': 10,
+    'source': None,
+    'country': 'USA',
+    'state': 'IN',
+    'city': None,
+    'longitude': 50,
+    'latitude': 50.0,
+    'is_active_image': True,
+    'is_active_video': False,
+    'resolution_width': 1900,
+    'resolution_height': 1000,
+    'utc_offset': 8,
+    'timezone_id': 0,
+    'timezone_name': 'UTC',
+    'reference_logo': None,
+    'reference_url': None
+}
+
+
 class TestCamera(unittest.TestCase):
 
     def setUp(self):
-        self.cam_attr = {
-            'cameraID': 'test',
-            'legacy_cameraID': 1,
-            'camera_type': 'ip',
-            'frame_rate': 10,
-            'source': None,
-            'country': 'USA',
-            'state': 'IN',
-            'city': None,
-            'longitude': 50,
-            'latitude': 50.0,
-            'is_active_image': True,
-            'is_active_video': False,
-            'resolution_width': 1900,
-            'resolution_height': 1000,
-            'utc_offset': 8,
-            'timezone_id': 0,
-            'timezone_name': 'UTC',
-            'reference_logo': None,
-            'reference_url': None
-        }
+        self.cam_attr = dict(CAM_ATTR)
 
     def test_cam_init(self):
         cam = Camera(**self.cam_attr)
@@ -125,5 +129,125 @@ class TestCamera(unittest.TestCase):
 
 
 
+class TestCameraRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.cam_attr = dict(CAM_ATTR)
+
+    def test_cam_init(self):
+        cam = CameraRecord(**self.cam_attr)
+        self.assertFalse(isinstance(cam, dict))
+        self.assertFalse(hasattr(cam, '__dict__'))
+        self.assertEqual(cam.to_dict(), self.cam_attr)
+        for k, v in self.cam_attr.items():
+            self.assertEqual(v, getattr(cam, k))
+            self.assertEqual(v, cam[k])
+            self.assertEqual(v, cam.get(k))
+        with self.assertRaises(KeyError):
+            return cam['snapshot_url']
+
+    def test_internals_not_items(self):
+        cam = CameraRecord(**self.cam_attr)
+        for name in ('to_dict', '_fields', '_layout', '__slots__'):
+            self.assertRaises(KeyError, cam.__getitem__, name)
+            self.assertIsNone(cam.get(name))
+        self.assertEqual(cam.get('snapshot_url', 'default'), 'default')
+
+    def test_ip_cam_init(self):
+        ip_attr = dict(self.cam_attr, ip='127.0.0.1', port=80, brand='test_brand',
+                       model=None, image_path='test_image', video_path=None)
+        ip_cam_test = IPCameraRecord(**ip_attr)
+        self.assertTrue(isinstance(ip_cam_test, CameraRecord))
+        self.assertEqual(ip_cam_test.to_dict(), ip_attr)
+        self.assertEqual(ip_cam_test, ip_attr)
+        self.assertEqual(ip_cam_test, IPCameraRecord(**ip_attr))
+
+    def test_interned(self):
+        first = CameraRecord(country=''.join(['U', 'S', 'A']))
+        second = CameraRecord(country=''.join(['U', 'S', 'A']))
+        self.assertIs(first['country'], second['country'])
+
+    def test_process_json(self):
+        cam = CameraRecord.process_json(cameraID='test', type='non_ip', country='USA',
+                                        retrieval={'snapshot_url': 'test_url'})
+        self.assertTrue(isinstance(cam, NonIPCameraRecord))
+        self.assertEqual(cam.camera_type, 'non_ip')
+        self.assertEqual(cam.snapshot_url, 'test_url')
+        self.assertEqual(Camera.process_json(cameraID='test', type='non_ip', country='USA',
+                                             retrieval={'snapshot_url': 'test_url'}).to_dict(),
+                         {'cameraID': 'test', 'camera_type': 'non_ip', 'country': 'USA',
+                          'snapshot_url': 'test_url'})
+
+
+class TestProcessJsonArray(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = [
+            {'cameraID': 'ip', 'type': 'ip', 'country': 'USA',
+             'retrieval': {'ip': '127.0.0.1', 'port': '80', 'brand': None}},
+            {'cameraID': 'non_ip', 'type': 'non_ip', 'country': 'USA',
+             'retrieval': {'snapshot_url': 'test_url'}},
+            {'cameraID': 'stream', 'type': 'stream', 'retrieval': {'m3u8_url': 'test_url'}},
+            {'cameraID': 'unknown', 'type': 'unknown', 'retrieval': {}},
+        ]
+
+    def test_camera(self):
+        cams = Camera.process_json_array(self.entries)
+        self.assertEqual(cams, [Camera.process_json(**dict(entry)) for entry in self.entries])
+        self.assertEqual([type(cam) for cam in cams],
+                         [IPCamera, NonIPCamera, StreamCamera, type(None)])
+        self.assertEqual(cams[0], {'cameraID': 'ip', 'camera_type': 'ip', 'country': 'USA',
+                                   'ip': '127.0.0.1', 'port': '80', 'brand': None})
+        self.assertEqual(self.entries[0]['retrieval'],
+                         {'ip': '127.0.0.1', 'port': '80', 'brand': None})
+        self.assertEqual(self.entries[0]['type'], 'ip')
+
+    def test_record(self):
+        cams = CameraRecord.process_json_array(self.entries)
+        self.assertEqual(cams, [CameraRecord.process_json(**dict(entry))
+                                for entry in self.entries])
+        self.assertTrue(isinstance(cams[0], IPCameraRecord))
+        self.assertEqual(cams[0].ip, '127.0.0.1')
+        self.assertEqual(cams[1].snapshot_url, 'test_url')
+        self.assertIsNone(cams[2].country)
+        self.assertIsNone(cams[3])
+        self.assertIs(cams[0].country, cams[1].country)
+
+
+class TestLazyCameraList(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = [{'cameraID': str(i), 'type': 'ip' if i % 2 else 'stream',
+                         'retrieval': {'ip': '127.0.0.1'} if i % 2 else {'m3u8_url': 'url'}}
+                        for i in range(10)]
+        self.cams = LazyCameraList(self.entries)
+
+    def test_getitem(self):
+        self.assertEqual(len(self.cams), 10)
+        self.assertTrue(all(cam is LazyCameraList._missing for cam in self.cams._cameras))
+        self.assertTrue(isinstance(self.cams[1], IPCamera))
+        self.assertIs(self.cams[1], self.cams[1])
+        self.assertIs(self.cams[-1], self.cams[9])
+        self.assertEqual(sum(cam is not LazyCameraList._missing for cam in self.cams._cameras),
+                         2)
+        self.assertEqual(self.cams.materialize(), Camera.process_json_array(self.entries))
+        self.assertEqual(list(self.cams), self.cams.materialize())
+        self.assertEqual(self.entries[1]['type'], 'ip')
+
+    def test_slice_filter(self):
+        first = self.cams[1]
+        self.assertIs(self.cams[1:3][0], first)
+        streams = self.cams.filter(lambda entry: entry['type'] == 'stream')
+        self.assertEqual([cam['cameraID'] for cam in streams], ['0', '2', '4', '6', '8'])
+        self.assertTrue(all(isinstance(cam, StreamCamera) for cam in streams))
+        self.assertIs(self.cams.raw(2), self.entries[2])
+        self.assertEqual(self.cams[1:2].raw(), [self.entries[1]])
+
+    def test_record_class(self):
+        cams = LazyCameraList(self.entries, CameraRecord)
+        self.assertTrue(isinstance(cams[1], IPCameraRecord))
+        self.assertEqual(cams[1].ip, '127.0.0.1')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,16 +1,25 @@
 """
 This module contains test cases for client class methods
 """
+import json
+import os
+import shutil
+import tempfile
 import unittest
 import sys
+import threading
+import time
 from os import path
 import mock
+import requests
 import CAM2CameraDatabaseAPIClient as cam2
-from CAM2CameraDatabaseAPIClient.camera import NonIPCamera
-from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.camera import NonIPCamera, CameraRecord, NonIPCameraRecord, \
+    LazyCameraList
+from CAM2CameraDatabaseAPIClient.auth import token_expiry
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH, TOKEN_LIFETIME
 from CAM2CameraDatabaseAPIClient.error import AuthenticationError, InternalError,\
      InvalidClientIdError, InvalidClientSecretError, ResourceNotFoundError,\
-     FormatError, AuthorizationError
+     FormatError, AuthorizationError, ResourceConflictError, DeadlineExceededError
 sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
 
 
@@ -26,6 +35,13 @@ class BaseClientTest(unittest.TestCase):
         self.token_params = {'clientID': '0' * CLIENTID_LENGTH,
                              'clientSecret': '0' * SECRET_LENGTH}
 
+    def assert_worker_limits(self, limits, count, deadline):
+        # The deadline is passed on to worker threads as a number of seconds from now.
+        self.assertEqual(len(limits), count)
+        for timeout, worker_deadline in limits:
+            self.assertEqual(timeout, (1, 5))
+            self.assertAlmostEqual(worker_deadline, deadline, places=2)
+
 class InitClientTest(BaseClientTest):
 
     def test_client_init_wrong_CLIENTID_LENGTH(self):
@@ -58,6 +74,14 @@ class InitClientTest(BaseClientTest):
                          'Secret not stored in the client object.')
         self.assertIs(client2.token, None, 'Token not set to default')
 
+    def test_client_init_record_format(self):
+        clientID = '0' * CLIENTID_LENGTH
+        clientSecret = '0' * SECRET_LENGTH
+        client = cam2.Client(clientID, clientSecret, record_format='compact')
+        self.assertIs(client._record_class, CameraRecord)
+        with self.assertRaises(FormatError):
+            cam2.Client(clientID, clientSecret, record_format='dataframe')
+
     def test_build_header(self):
         clientID = '0' * CLIENTID_LENGTH
         clientSecret = '0' * SECRET_LENGTH
@@ -74,7 +98,7 @@ class RequestTokenTest(BaseClientTest):
         self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
 
     @mock.patch('CAM2CameraDatabaseAPIClient.error.AuthenticationError')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_token_incorrect_ID_Secret(self, mock_get, mock_http_error_handler):
         mock_response = mock.Mock()
         expected_dict = {
@@ -91,7 +115,7 @@ class RequestTokenTest(BaseClientTest):
         return mock_http_error_handler
 
     @mock.patch('CAM2CameraDatabaseAPIClient.error.AuthenticationError')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_token_incorrect_Secret(self, mock_get, mock_http_error_handler):
         mock_response = mock.Mock()
         expected_dict = {
@@ -107,7 +131,7 @@ class RequestTokenTest(BaseClientTest):
         self.assertEqual(1, mock_response.json.call_count)
         return mock_http_error_handler
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_token_all_correct(self, mock_get):
         mock_response = mock.Mock()
         expected_dict = {
@@ -124,7 +148,7 @@ class RequestTokenTest(BaseClientTest):
                          'token not stored in the client object.')
         return response_dict
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_token_all_correct_Internal_error(self, mock_get):
         mock_response = mock.Mock()
         mock_response.status_code = 500
@@ -135,6 +159,76 @@ class RequestTokenTest(BaseClientTest):
         mock_get.assert_called_once_with(self.token_url, params=self.params)
         self.assertEqual(0, mock_response.json.call_count)
 
+class TokenLifetimeTest(BaseClientTest):
+
+    def setUp(self):
+        super(TokenLifetimeTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.url = self.base_URL + 'cameras/12345'
+        self.token_response = mock.Mock()
+        self.token_response.status_code = 200
+        self.token_response.json.return_value = {'token': 'correctToken'}
+        self.camera_response = mock.Mock()
+        self.camera_response.status_code = 200
+        self.camera_response.json.return_value = {'cameraID': '12345', 'type': 'non_ip',
+                                                  'retrieval': {'snapshot_url': 'url'}}
+
+    def route(self, url, headers=None, params=None):
+        return self.token_response if url == self.token_url else self.camera_response
+
+    def test_token_expiry(self):
+        # header {"alg": "HS256"}, payload {"exp": 1600000000}
+        jwt = 'eyJhbGciOiJIUzI1NiJ9.eyJleHAiOjE2MDAwMDAwMDB9.signature'
+        self.assertEqual(token_expiry(jwt, 0), 1600000000)
+        self.assertEqual(token_expiry('correctToken', 1000), 1000 + TOKEN_LIFETIME)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_request_token_sets_expiry(self, mock_get):
+        mock_get.side_effect = self.route
+        before = time.time()
+        self.client._request_token()
+        self.assertGreaterEqual(self.client.token_expiry, before + TOKEN_LIFETIME)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_expired_token_refreshed_before_request(self, mock_get):
+        mock_get.side_effect = self.route
+        self.client.token = 'ExpiredToken'
+        self.client.token_expiry = time.time() - 1
+        self.client.camera_by_id('12345')
+        call_list = [mock.call(self.token_url, params=self.token_params),
+                     mock.call(self.url, headers={'Authorization': 'Bearer correctToken'})]
+        self.assertEqual(mock_get.call_args_list, call_list)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_expiring_token_refreshed_in_background(self, mock_get):
+        mock_get.side_effect = self.route
+        self.client.token = 'OldToken'
+        self.client.token_expiry = time.time() + 5
+        self.client.camera_by_id('12345')
+        with self.client._token_lock:
+            self.assertEqual(self.client.token, 'correctToken')
+        self.assertIn(mock.call(self.token_url, params=self.token_params),
+                      mock_get.call_args_list)
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_single_flight_refresh(self, mock_get):
+        def slow_route(url, headers=None, params=None):
+            time.sleep(0.01)
+            return self.route(url, headers, params)
+
+        mock_get.side_effect = slow_route
+        # Different cameras, so that the camera requests are not coalesced.
+        threads = [threading.Thread(target=self.client.camera_by_id, args=(str(index),))
+                   for index in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        token_calls = [call for call in mock_get.call_args_list if call[0][0] == self.token_url]
+        self.assertEqual(1, len(token_calls))
+        self.assertEqual(17, mock_get.call_count)
+
 class RegisterTest(BaseClientTest):
 
     def setUp(self):
@@ -144,7 +238,7 @@ class RegisterTest(BaseClientTest):
         self.data = {'owner': 'testowner', 'permissionLevel': 'user'}
         self.url = self.base_URL + 'apps/register'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_register(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -166,8 +260,8 @@ class RegisterTest(BaseClientTest):
         self.assertEqual(resultSecret, expected_clientSecret)
         self.assertEqual(2, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_register_expired_token_success(self, mock_get, mock_post):
         self.client.token = 'ExpiredToken'
         # set first request.post's result
@@ -202,8 +296,8 @@ class RegisterTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=self.data)]
         self.assertEqual(mock_post.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_register_expired_token_failure(self, mock_get, mock_post):
         self.client.token = 'ExpiredToken'
         # set first request.post's result
@@ -234,7 +328,7 @@ class RegisterTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=self.data)]
         self.assertEqual(mock_post.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_register_no_owner(self, mock_post):
         self.client.token = "correctToken"
         # set request.post's result
@@ -251,7 +345,7 @@ class RegisterTest(BaseClientTest):
         mock_post.assert_called_once_with(self.url, headers=self.header, data=self.data)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_register_incorrect_clientID(self, mock_get):
 
         # incorrect clientID in this case can only cause 404 error
@@ -276,7 +370,7 @@ class RegisterTest(BaseClientTest):
         mock_get.assert_called_once_with(self.token_url, params=self.token_params)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_register_internal_error(self, mock_post):
 
         # provide token for building header
@@ -301,7 +395,7 @@ class GetClientIDTest(BaseClientTest):
         self.param = {'owner': 'testowner'}
         self.url = self.base_URL + 'apps/by-owner'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_clientID_by_owner_all_correct(self, mock_get):
 
         self.client.token = "correctToken"
@@ -317,7 +411,7 @@ class GetClientIDTest(BaseClientTest):
         self.assertEqual(self.client.client_ids_by_owner("testowner"), expected_clientID_array)
         mock_get.assert_called_once_with(self.url, headers=self.header, params=self.param)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_clientID_by_owner_expired_token_success(self, mock_get):
         self.client.token = "ExpiredToken"
         # set first requests.get's result
@@ -351,7 +445,7 @@ class GetClientIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=self.param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_clientID_by_owner_expired_token_failure(self, mock_get):
         self.client.token = "ExpiredToken"
         # set first requests.get's result
@@ -381,7 +475,7 @@ class GetClientIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=self.param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_clientID_by_owner_incorrect_clientID(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -396,7 +490,7 @@ class GetClientIDTest(BaseClientTest):
         mock_get.assert_called_once_with(self.token_url, params=self.token_params)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_clientID_by_owner_internal_error(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -417,7 +511,7 @@ class GetUsageTest(BaseClientTest):
         self.param = {'owner': 'testowner'}
         self.url = self.base_URL + 'apps/1/usage'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_clientID_all_correct(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -430,7 +524,7 @@ class GetUsageTest(BaseClientTest):
         self.assertEqual(self.client.usage_by_client('1', 'testowner'), 7)
         mock_get.assert_called_once_with(self.url, headers=self.header, params=self.param)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_client_expired_token_success(self, mock_get):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -458,7 +552,7 @@ class GetUsageTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=self.param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_client_expired_token_failure(self, mock_get):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -485,7 +579,7 @@ class GetUsageTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=self.param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_client_authorization_error(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -499,7 +593,7 @@ class GetUsageTest(BaseClientTest):
         mock_get.assert_called_once_with(self.url, headers=self.header, params=self.param)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_client_id_not_found(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -513,7 +607,7 @@ class GetUsageTest(BaseClientTest):
         mock_get.assert_called_once_with(self.url, headers=self.header, params=self.param)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_usage_by_client_internal_error(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -534,7 +628,7 @@ class UpdateOwnerTest(BaseClientTest):
         self.data = {'owner': 'testowner'}
         self.url = self.base_URL + 'apps/1'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_owner(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -546,8 +640,8 @@ class UpdateOwnerTest(BaseClientTest):
         self.assertEqual(self.client.update_owner('1', 'testowner'), 'OK')
         mock_put.assert_called_once_with(self.url, headers=self.header, data=self.data)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_update_owner_expired_token_success(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -575,8 +669,8 @@ class UpdateOwnerTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=self.data)]
         self.assertEqual(mock_put.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_update_owner_expired_token_failure(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -603,7 +697,7 @@ class UpdateOwnerTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=self.data)]
         self.assertEqual(mock_put.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_owner_invalid_clientid(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -626,7 +720,7 @@ class UpdatePermissionTest(BaseClientTest):
         self.data = {'permissionLevel': 'user'}
         self.url = self.base_URL + 'apps/1'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_permissionLevel(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -638,8 +732,8 @@ class UpdatePermissionTest(BaseClientTest):
         self.assertEqual(self.client.update_permission('1', 'user'), 'OK')
         mock_put.assert_called_once_with(self.url, headers=self.header, data=self.data)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_update_permissionLevel_expired_token_success(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -666,8 +760,8 @@ class UpdatePermissionTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=self.data)]
         self.assertEqual(mock_put.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_update_permissionLevel_expired_token_failure(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -702,7 +796,7 @@ class ResetSecretTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'apps/1/secret'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_reset_secret(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -714,7 +808,7 @@ class ResetSecretTest(BaseClientTest):
         self.assertEqual(self.client.reset_secret('1'), 'test_clientSecret')
         mock_put.assert_called_once_with(self.url, headers=self.header, data=None)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_reset_secret_invalid_clientid(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -728,8 +822,8 @@ class ResetSecretTest(BaseClientTest):
         mock_put.assert_called_once_with(self.url, headers=self.header, data=None)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_reset_secret_expired_token_success(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -756,8 +850,8 @@ class ResetSecretTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, data=None)]
         self.assertEqual(mock_put.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_reset_secret_expired_token_failure(self, mock_get, mock_put):
         self.client.token = "ExpiredToken"
         mock_response = mock.Mock()
@@ -791,7 +885,7 @@ class GetCamIDTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'cameras/12345'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_id_all_correct(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -817,7 +911,7 @@ class GetCamIDTest(BaseClientTest):
         self.assertEqual(self.client.camera_by_id('12345'), expected_dict)
         mock_get.assert_called_once_with(self.url, headers=self.header)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_id_expired_token_success(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -858,7 +952,7 @@ class GetCamIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=None)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_id_expired_token_failure(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -883,7 +977,7 @@ class GetCamIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=None)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_id_format_error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -896,7 +990,7 @@ class GetCamIDTest(BaseClientTest):
             self.client.camera_by_id('12345')
         mock_get.assert_called_once_with(self.url, headers=self.header)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_id_internal_error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -914,7 +1008,7 @@ class GetLegacyCamIDTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'cameras/legacy/12345'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_legacy_id_all_correct(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -940,7 +1034,7 @@ class GetLegacyCamIDTest(BaseClientTest):
         self.assertEqual(self.client.camera_by_legacy_id('12345'), expected_dict)
         mock_get.assert_called_once_with(self.url, headers=self.header)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_legacy_id_expired_token_success(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -981,7 +1075,7 @@ class GetLegacyCamIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=None)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_legacy_id_expired_token_failure(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -1006,7 +1100,7 @@ class GetLegacyCamIDTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=None)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_legacy_id_format_error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1019,7 +1113,7 @@ class GetLegacyCamIDTest(BaseClientTest):
             self.client.camera_by_legacy_id('12345')
         mock_get.assert_called_once_with(self.url, headers=self.header)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_legacy_id_internal_error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1038,7 +1132,7 @@ class GetCameraByListIDTest(BaseClientTest):
         self.legacy_url = self.base_URL + 'cameras/legacy/12345'
         self.url = self.base_URL + 'cameras/12345'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_by_list_id_all_correct(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1076,12 +1170,101 @@ class GetCameraByListIDTest(BaseClientTest):
         }
         mock_response1.json.return_value = mock_dict1
         mock_response1.status_code = 200
-        mock_get.side_effect = [mock_response, mock_response1]
+        responses = {self.url: mock_response, self.legacy_url: mock_response1}
+        mock_get.side_effect = lambda url, headers: responses[url]
         self.assertEqual(self.client.camera_by_list_id(["12345"], ["12345"]), expected_dict)
         self.assertEqual(2, mock_get.call_count)
         call_list = [mock.call(self.url, headers=self.header),
                      mock.call(self.legacy_url, headers=self.header)]
-        self.assertEqual(mock_get.call_args_list, call_list)
+        self.assertCountEqual(mock_get.call_args_list, call_list)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_list_id_order_and_duplicates(self, mock_get):
+        self.client.token = 'correctToken'
+
+        def camera_response(url, headers):
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = {'cameraID': url.rsplit('/', 1)[-1], 'type': 'non_ip',
+                                          'retrieval': {'snapshot_url': url}}
+            return response
+
+        mock_get.side_effect = camera_response
+        IDs = [str(i) for i in range(20)] + ['3', '7']
+        cameras = self.client.camera_by_list_id(IDs, max_workers=4)
+        self.assertEqual([camera['cameraID'] for camera in cameras],
+                         [str(i) for i in range(20)])
+        self.assertEqual(20, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_list_id_errors(self, mock_get):
+        self.client.token = 'correctToken'
+
+        def camera_response(url, headers):
+            response = mock.Mock()
+            if url.endswith('missing'):
+                response.status_code = 404
+                response.json.return_value = {'message': 'No camera found'}
+            else:
+                response.status_code = 200
+                response.json.return_value = {'cameraID': '12345', 'type': 'non_ip',
+                                              'retrieval': {'snapshot_url': url}}
+            return response
+
+        mock_get.side_effect = camera_response
+        with self.assertRaises(ResourceNotFoundError):
+            self.client.camera_by_list_id(['12345', 'missing'])
+
+        cameras, errors = self.client.camera_by_list_id(['12345', 'missing'], ['missing'],
+                                                        return_errors=True)
+        self.assertEqual([camera['cameraID'] for camera in cameras], ['12345'])
+        self.assertEqual(list(errors.keys()), ['missing'])
+        self.assertTrue(isinstance(errors['missing'], ResourceNotFoundError))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_list_id_connection_error(self, mock_get):
+        self.client.token = 'correctToken'
+
+        def camera_response(url, headers):
+            if url.endswith('/0'):
+                raise requests.ConnectionError()
+            time.sleep(0.01)
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = {'cameraID': url.rsplit('/', 1)[-1], 'type': 'non_ip',
+                                          'retrieval': {'snapshot_url': url}}
+            return response
+
+        mock_get.side_effect = camera_response
+        IDs = [str(i) for i in range(50)]
+        with self.assertRaises(requests.ConnectionError):
+            self.client.camera_by_list_id(IDs, max_workers=2)
+        self.assertLess(mock_get.call_count, 10)
+
+        mock_get.reset_mock()
+        cameras, errors = self.client.camera_by_list_id(IDs[:5], return_errors=True)
+        self.assertEqual([camera['cameraID'] for camera in cameras], IDs[1:5])
+        self.assertEqual(list(errors.keys()), ['0'])
+        self.assertTrue(isinstance(errors['0'], requests.ConnectionError))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_list_id_timeouts(self, mock_get):
+        self.client.token = 'correctToken'
+        limits = []
+
+        def camera_response(url, headers):
+            limits.append(self.client.transport.thread_timeouts())
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = {'cameraID': url.rsplit('/', 1)[-1], 'type': 'non_ip',
+                                          'retrieval': {'snapshot_url': url}}
+            return response
+
+        mock_get.side_effect = camera_response
+        with self.client.timeouts(timeout=(1, 5), deadline=30):
+            deadline = self.client.transport.thread_timeouts()[1]
+            self.client.camera_by_list_id(['1', '2', '3'], max_workers=2)
+        self.assert_worker_limits(limits, 3, deadline)
 
 class SearchCamTest(BaseClientTest):
 
@@ -1091,7 +1274,7 @@ class SearchCamTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'cameras/search'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_empty(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1107,7 +1290,7 @@ class SearchCamTest(BaseClientTest):
                          'Returned json is not tranlated correctly')
         return response_list
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_no_param(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1143,7 +1326,7 @@ class SearchCamTest(BaseClientTest):
             self.assertEqual(response_list[i], actual_list[i])
         return response_list
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_no_token(self, mock_get):
         mock_response = mock.Mock()
         expected_dict = {
@@ -1157,7 +1340,7 @@ class SearchCamTest(BaseClientTest):
         mock_get.assert_called_with(self.url, headers=self.header, params={'country': 'USA'})
         self.assertEqual(2, mock_get.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_Expired_Token_failure(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1186,7 +1369,7 @@ class SearchCamTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=search_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_Expired_Token_success(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1219,7 +1402,7 @@ class SearchCamTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=search_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_Expired_Token_format_error(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1254,7 +1437,7 @@ class SearchCamTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=search_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_Expired_Token_internal_error(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1289,7 +1472,7 @@ class SearchCamTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=search_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_all_correct_Internal_Error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1300,7 +1483,7 @@ class SearchCamTest(BaseClientTest):
         mock_get.assert_called_once_with(self.url, headers=self.header, params={'country': 'USA'})
         self.assertEqual(0, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_Format_Error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1317,7 +1500,7 @@ class SearchCamTest(BaseClientTest):
                                          params={'resolution_width': 'USA'})
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_search_camera_all_correct(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1364,6 +1547,441 @@ class SearchCamTest(BaseClientTest):
         with self.assertRaises(FormatError):
             self.client.write_camera(**kwargs)
 
+class PagedSearchTest(BaseClientTest):
+
+    def setUp(self):
+        super(PagedSearchTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+        self.header = {'Authorization': 'Bearer correctToken'}
+        self.url = self.base_URL + 'cameras/search'
+
+    @staticmethod
+    def page_response(total):
+        def search_response(url, headers, params):
+            response = mock.Mock()
+            response.status_code = 200
+            offset = params.get('offset', 0)
+            response.json.return_value = [
+                {'cameraID': str(i), 'type': 'non_ip', 'retrieval': {'snapshot_url': 'url'}}
+                for i in range(offset, min(offset + 100, total))]
+            return response
+        return search_response
+
+class IterSearchCamTest(PagedSearchTest):
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_search_camera_all_pages(self, mock_get):
+        mock_get.side_effect = self.page_response(237)
+        cameras = list(self.client.iter_search_camera(country='USA', camera_type='non_ip'))
+        self.assertEqual([camera['cameraID'] for camera in cameras],
+                         [str(i) for i in range(237)])
+        call_list = [mock.call(self.url, headers=self.header,
+                               params={'country': 'USA', 'type': 'non_ip', 'offset': offset})
+                     for offset in (0, 100, 200)]
+        self.assertEqual(mock_get.call_args_list, call_list)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_search_camera_exact_pages(self, mock_get):
+        mock_get.side_effect = self.page_response(200)
+        cameras = list(self.client.iter_search_camera(offset=100))
+        self.assertEqual(100, len(cameras))
+        self.assertEqual(cameras[0]['cameraID'], '100')
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_search_camera_lazy(self, mock_get):
+        mock_get.side_effect = self.page_response(1000)
+        iterator = self.client.iter_search_camera()
+        self.assertEqual(0, mock_get.call_count)
+        self.assertEqual(next(iterator)['cameraID'], '0')
+        iterator.close()
+        self.assertLessEqual(mock_get.call_count, 2)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_search_camera_timeouts(self, mock_get):
+        search_response = self.page_response(150)
+        limits = []
+
+        def timed_response(url, headers, params):
+            limits.append(self.client.transport.thread_timeouts())
+            return search_response(url, headers, params)
+
+        mock_get.side_effect = timed_response
+        with self.client.timeouts(timeout=(1, 5), deadline=30):
+            deadline = self.client.transport.thread_timeouts()[1]
+            self.assertEqual(150, len(list(self.client.iter_search_camera())))
+        self.assert_worker_limits(limits, 2, deadline)
+
+    def test_iter_search_camera_incorrect_field(self):
+        with self.assertRaises(FormatError):
+            self.client.iter_search_camera(dummy=1)
+
+class SearchCamAllTest(PagedSearchTest):
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_all(self, mock_get):
+        mock_get.side_effect = self.page_response(537)
+        cameras = self.client.search_camera_all(max_workers=4, state='IN')
+        self.assertEqual([camera['cameraID'] for camera in cameras],
+                         [str(i) for i in range(537)])
+        offsets = sorted(call[1]['params']['offset'] for call in mock_get.call_args_list)
+        self.assertEqual(offsets[:6], [0, 100, 200, 300, 400, 500])
+        for call in mock_get.call_args_list:
+            self.assertEqual(call[1]['params']['state'], 'IN')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_all_duplicates(self, mock_get):
+        search_response = self.page_response(250)
+
+        def shifted_response(url, headers, params):
+            # a camera inserted before offset 100 pushes camera 99 onto the second page
+            shift = 1 if params['offset'] > 0 else 0
+            return search_response(url, headers, dict(params, offset=params['offset'] - shift))
+
+        mock_get.side_effect = shifted_response
+        cameras = self.client.search_camera_all(max_workers=2)
+        self.assertEqual([camera['cameraID'] for camera in cameras],
+                         [str(i) for i in range(250)])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_all_timeouts(self, mock_get):
+        search_response = self.page_response(150)
+        limits = []
+
+        def timed_response(url, headers, params):
+            limits.append(self.client.transport.thread_timeouts())
+            return search_response(url, headers, params)
+
+        mock_get.side_effect = timed_response
+        with self.client.timeouts(timeout=(1, 5), deadline=30):
+            deadline = self.client.transport.thread_timeouts()[1]
+            self.client.search_camera_all(max_workers=2, deadline=60)
+        self.assert_worker_limits(limits, 2, deadline)
+
+        mock_get.reset_mock()
+        with self.client.timeouts(deadline=0):
+            with self.assertRaises(DeadlineExceededError):
+                self.client.search_camera_all(max_workers=2)
+        self.assertEqual(0, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_all_error(self, mock_get):
+        mock_response = mock.Mock()
+        mock_response.status_code = 422
+        mock_response.json.return_value = {'message': 'Format Error Messages'}
+        mock_get.return_value = mock_response
+        with self.assertRaises(FormatError):
+            self.client.search_camera_all(radius=-1)
+
+class CompactSearchCamTest(PagedSearchTest):
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_compact(self, mock_get):
+        mock_get.side_effect = self.page_response(150)
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                             record_format='compact')
+        client.token = 'correctToken'
+        cameras = client.search_camera_all()
+        self.assertEqual(150, len(cameras))
+        self.assertTrue(isinstance(cameras[0], NonIPCameraRecord))
+        self.assertEqual(cameras[1].cameraID, '1')
+        self.assertEqual(cameras[1].to_dict()['snapshot_url'], 'url')
+
+class LazySearchCamTest(PagedSearchTest):
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_lazy(self, mock_get):
+        mock_get.side_effect = self.page_response(50)
+        self.client.cache = cam2.CameraCache()
+        with mock.patch.object(cam2.client.Camera, 'process_json_entry',
+                               wraps=cam2.client.Camera.process_json_entry) as process:
+            cameras = self.client.search_camera(country='USA', lazy=True)
+            self.assertTrue(isinstance(cameras, LazyCameraList))
+            self.assertEqual(50, len(cameras))
+            process.assert_not_called()
+            self.assertEqual(cameras[3], NonIPCamera(cameraID='3', camera_type='non_ip',
+                                                     snapshot_url='url'))
+            self.assertIs(cameras[3], cameras[3])
+            self.assertEqual(1, process.call_count)
+        mock_get.assert_called_once_with(self.url, headers=self.header,
+                                         params={'country': 'USA'})
+        self.assertIsNone(self.client.cache.get(('id', '3')))
+
+class CoalesceTest(BaseClientTest):
+
+    def setUp(self):
+        super(CoalesceTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+        self.release = threading.Event()
+
+    def slow_get(self, body):
+        def get(url, headers=None, params=None):
+            self.release.wait(5)
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = body
+            return response
+        return get
+
+    def call_concurrently(self, method, *args_list, **kwargs):
+        results = {}
+
+        def call(index):
+            results[index] = method(*args_list[index], **kwargs)
+
+        threads = [threading.Thread(target=call, args=(index,))
+                   for index in range(len(args_list))]
+        for thread in threads:
+            thread.start()
+        while self.client._inflight.shared < len(args_list) - 1:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return [results[index] for index in range(len(args_list))]
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_id_coalesced(self, mock_get):
+        mock_get.side_effect = self.slow_get({'cameraID': '12345', 'type': 'non_ip',
+                                              'retrieval': {'snapshot_url': 'url'}})
+        results = self.call_concurrently(self.client.camera_by_id, *[('12345',)] * 8)
+        self.assertEqual(1, mock_get.call_count)
+        results[0]['city'] = 'Tokyo'
+        for camera in results[1:]:
+            self.assertIsNot(camera, results[0])
+            self.assertEqual(camera['snapshot_url'], 'url')
+            self.assertIsNone(camera.get('city'))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_not_coalesced_with_timeouts(self, mock_get):
+        self.release.set()
+        mock_get.side_effect = self.slow_get([])
+        with mock.patch.object(self.client._inflight, 'do') as mock_do:
+            with self.client.timeouts(deadline=10):
+                self.assertEqual(self.client.search_camera(city='Tokyo'), [])
+            with self.client.timeouts(timeout=(1, 5)):
+                self.client.check_cam_exist('non_ip', snapshot_url='url')
+            mock_do.assert_not_called()
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_normalized_params(self, mock_get):
+        mock_get.side_effect = self.slow_get([])
+        results = self.call_concurrently(
+            self.client.search_camera, (), (), (), camera_type='ip', city='Tokyo', state=None)
+        self.assertEqual(results, [[], [], []])
+        mock_get.assert_called_once_with(self.base_URL + 'cameras/search',
+                                         headers={'Authorization': 'Bearer correctToken'},
+                                         params={'type': 'ip', 'city': 'Tokyo'})
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_errors_shared(self, mock_get):
+        def get(url, headers=None, params=None):
+            self.release.wait(5)
+            response = mock.Mock()
+            response.status_code = 500
+            return response
+
+        mock_get.side_effect = get
+        errors = []
+
+        def call():
+            try:
+                self.client.check_cam_exist('non_ip', snapshot_url='url')
+            except InternalError as error:
+                errors.append(error)
+
+        self.call_concurrently(call, *[()] * 4)
+        self.assertEqual(4, len(errors))
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_coalesce_disabled(self, mock_get):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, coalesce=False)
+        client.token = 'correctToken'
+        self.release.set()
+        mock_get.side_effect = self.slow_get({'cameraID': '12345', 'type': 'non_ip',
+                                              'retrieval': {'snapshot_url': 'url'}})
+        threads = [threading.Thread(target=client.camera_by_legacy_id, args=('1',))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, mock_get.call_count)
+
+
+class StreamTest(BaseClientTest):
+
+    def setUp(self):
+        super(StreamTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+        self.header = {'Authorization': 'Bearer correctToken'}
+
+    @staticmethod
+    def stream_response(body, status_code=200):
+        response = mock.Mock()
+        response.status_code = status_code
+        response.iter_content.side_effect = lambda chunk_size: iter(
+            [body[i:i + 7] for i in range(0, len(body), 7)])
+        response.json.side_effect = lambda: json.loads(body.decode('utf-8'))
+        return response
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_stream(self, mock_get):
+        body = json.dumps([{'cameraID': str(i), 'type': 'non_ip',
+                            'retrieval': {'snapshot_url': 'url'}} for i in range(3)])
+        response = self.stream_response(body.encode('utf-8'))
+        mock_get.return_value = response
+        cameras = self.client.search_camera_stream(camera_type='non_ip', city=None)
+        mock_get.assert_not_called()
+        self.assertEqual([camera['cameraID'] for camera in cameras], ['0', '1', '2'])
+        mock_get.assert_called_once_with(self.base_URL + 'cameras/search', headers=self.header,
+                                         params={'type': 'non_ip'}, stream=True)
+        response.close.assert_called_once_with()
+        with self.assertRaises(FormatError):
+            self.client.search_camera_stream(unknown='value')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_check_cam_exist_stream(self, mock_get):
+        body = json.dumps([{'cameraID': '1', 'type': 'stream', 'retrieval': {'m3u8_url': 'url'}}])
+        mock_get.return_value = self.stream_response(body.encode('utf-8'))
+        cameras = list(self.client.check_cam_exist_stream('stream', m3u8_url='url'))
+        self.assertEqual(cameras[0]['m3u8_url'], 'url')
+        mock_get.assert_called_once_with(self.base_URL + 'cameras/exist', headers=self.header,
+                                         params={'type': 'stream', 'm3u8_url': 'url'},
+                                         stream=True)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_get_change_log_stream_expired_token(self, mock_get):
+        expired = self.stream_response(b'{"message": "Token expired."}', 401)
+        auth = mock.Mock()
+        auth.status_code = 200
+        auth.json.return_value = {'token': 'newToken'}
+        body = b'[{"cameraID": "1", "timestamp": "2018-08-27T15:53:00"}]'
+        mock_get.side_effect = [expired, auth, self.stream_response(body)]
+        entries = list(self.client.get_change_log_stream(start='2018-08-27T15:00:00'))
+        self.assertEqual(entries, [{'cameraID': '1', 'timestamp': '2018-08-27T15:53:00'}])
+        mock_get.assert_called_with(self.base_URL + 'apps/db-change',
+                                    headers={'Authorization': 'Bearer newToken'},
+                                    params={'start': '2018-08-27T15:00:00', 'end': None,
+                                            'offset': None},
+                                    stream=True)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_stream_error(self, mock_get):
+        response = self.stream_response(b'{"message": "Format Error Messages"}', 422)
+        mock_get.return_value = response
+        with self.assertRaises(FormatError):
+            list(self.client.get_change_log_stream())
+        response.close.assert_called_once_with()
+
+class WriteCamerasTest(BaseClientTest):
+
+    def setUp(self):
+        super(WriteCamerasTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+        self.rows = [{'camera_type': 'non_ip', 'snapshot_url': 'url' + str(i)} for i in range(6)]
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, 'write.checkpoint')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def post_response(url, headers, data):
+        response = mock.Mock()
+        snapshot_url = json.loads(data['retrieval'])['snapshot_url']
+        if snapshot_url == 'url3':
+            response.status_code = 409
+            response.json.return_value = {'message': 'Camera already exists.'}
+        else:
+            response.status_code = 201
+            response.json.return_value = {'cameraID': 'ID' + snapshot_url[3:]}
+        return response
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras(self, mock_post):
+        mock_post.side_effect = self.post_response
+        rows = self.rows + [{'camera_type': 'non_ip', 'unknown': 'field'}]
+        results = self.client.write_cameras(iter(rows), max_workers=3)
+        self.assertEqual(results[:3] + results[4:6], ['ID0', 'ID1', 'ID2', 'ID4', 'ID5'])
+        self.assertTrue(isinstance(results[3], ResourceConflictError))
+        self.assertTrue(isinstance(results[6], FormatError))
+        self.assertEqual(6, mock_post.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_bad_rows_not_sent(self, mock_post, mock_put):
+        mock_post.side_effect = self.post_response
+        mock_put.return_value.status_code = 200
+        mock_put.return_value.json.return_value = {'cameraID': 'ID9'}
+        bad_rows = [{'snapshot_url': 'url6'},
+                    {'camera_type': 'ptz', 'snapshot_url': 'url7'},
+                    {'camera_type': 'non_ip', 'city': 'Tokyo'},
+                    {'camera_type': 'ip', 'port': 8080},
+                    {'cameraID': 'ID8', 'snapshot_url': 'url8'}]
+        rows = self.rows[:3] + bad_rows + [{'cameraID': 'ID9', 'city': 'Tokyo'}]
+        results = self.client.write_cameras(rows, max_workers=1)
+        self.assertEqual(results[:3], ['ID0', 'ID1', 'ID2'])
+        for result in results[3:8]:
+            self.assertTrue(isinstance(result, FormatError))
+        self.assertEqual(results[8], 'ID9')
+        self.assertEqual(3, mock_post.call_count)
+        self.assertEqual(1, mock_put.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_checkpoint(self, mock_post):
+        mock_post.side_effect = self.post_response
+        self.client.write_cameras(self.rows[:4], checkpoint=self.checkpoint)
+        self.assertEqual(4, mock_post.call_count)
+
+        mock_post.reset_mock()
+        self.rows[1]['snapshot_url'] = 'changed1'
+        results = self.client.write_cameras(self.rows, checkpoint=self.checkpoint)
+        self.assertEqual(results[0], 'ID0')
+        self.assertEqual(results[4:], ['ID4', 'ID5'])
+        sent = sorted(json.loads(call[1]['data']['retrieval'])['snapshot_url']
+                      for call in mock_post.call_args_list)
+        self.assertEqual(sent, ['changed1', 'url3', 'url4', 'url5'])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_internal_error(self, mock_post):
+        mock_post.return_value.status_code = 500
+        with self.assertRaises(InternalError):
+            self.client.write_cameras(self.rows, max_workers=1)
+        self.assertLess(mock_post.call_count, len(self.rows))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_connection_error(self, mock_post):
+        def post(url, headers, data):
+            if json.loads(data['retrieval'])['snapshot_url'] == 'url2':
+                raise requests.ConnectionError('Connection refused.')
+            return self.post_response(url, headers, data)
+        mock_post.side_effect = post
+        results = self.client.write_cameras(self.rows, max_workers=2)
+        self.assertTrue(isinstance(results[2], requests.ConnectionError))
+        self.assertEqual(results[4:], ['ID4', 'ID5'])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_interrupted(self, mock_post):
+        mock_post.side_effect = KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            self.client.write_cameras(self.rows * 10, max_workers=1)
+        self.assertLess(mock_post.call_count, 10)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.client.TokenBucket')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_cameras_max_rate(self, mock_post, mock_bucket):
+        mock_post.side_effect = self.post_response
+        self.client.write_cameras(self.rows, max_rate=20)
+        mock_bucket.assert_called_once_with(20)
+        self.assertEqual(6, mock_bucket.return_value.acquire.call_count)
+
 class CamExistTest(BaseClientTest):
 
     def setUp(self):
@@ -1372,7 +1990,7 @@ class CamExistTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'cameras/exist'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_cam_exist_all_correct_cam_list(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1411,7 +2029,7 @@ class CamExistTest(BaseClientTest):
         for i in range(2):
             self.assertEqual(response_list[i], actual_list[i])
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_all_correct_empty(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1425,7 +2043,7 @@ class CamExistTest(BaseClientTest):
         actual_dict = []
         self.assertEqual(response_list, actual_dict, 'Returned json is not tranlated correctly')
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_eixst_expired_token_success(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -1456,7 +2074,7 @@ class CamExistTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=match_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_Expired_Token_failure(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1485,7 +2103,7 @@ class CamExistTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=match_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_Expired_Token_format_error(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1520,7 +2138,7 @@ class CamExistTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=match_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_Expired_Token_internal_error(self, mock_get):
         self.client.token = 'ExpiredToken'
         # set result for first search camera
@@ -1555,7 +2173,7 @@ class CamExistTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=match_params)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_all_correct_Internal_Error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1572,7 +2190,7 @@ class CamExistTest(BaseClientTest):
                                              })
         self.assertEqual(0, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_camera_exist_Format_Error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1609,7 +2227,7 @@ class ChangeLogTest(BaseClientTest):
         self.header = {'Authorization': 'Bearer correctToken'}
         self.url = self.base_URL + 'apps/db-change'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_all_correct(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -1636,7 +2254,7 @@ class ChangeLogTest(BaseClientTest):
         self.assertEqual(self.client.get_change_log(), clientObject)
         mock_get.assert_called_once_with(self.url, headers=self.header, params=param)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_expired_token_success(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -1681,7 +2299,7 @@ class ChangeLogTest(BaseClientTest):
                      mock.call(self.url, headers=self.header, params=param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_expired_token_failure(self, mock_get):
         self.client.token = 'ExpiredToken'
         mock_response = mock.Mock()
@@ -1710,7 +2328,7 @@ class ChangeLogTest(BaseClientTest):
             mock.call(self.url, headers=self.header, params=param)]
         self.assertEqual(mock_get.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_format_error(self, mock_get):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1726,7 +2344,7 @@ class ChangeLogTest(BaseClientTest):
                  'offset': None}
         mock_get.assert_called_once_with(self.url, headers=self.header, params=param)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_resource_not_found_error(self, mock_get):
         mock_response = mock.Mock()
         mock_response.status_code = 404
@@ -1738,7 +2356,7 @@ class ChangeLogTest(BaseClientTest):
             self.client.get_change_log()
         mock_get.assert_called_once_with(self.token_url, params=self.token_params)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_get_change_log_with_internal_error(self, mock_get):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -1752,17 +2370,81 @@ class ChangeLogTest(BaseClientTest):
                  'offset': None}
         mock_get.assert_called_once_with(self.url, headers=self.header, params=param)
 
+class IterChangeLogTest(BaseClientTest):
+
+    def setUp(self):
+        super(IterChangeLogTest, self).setUp()
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+        self.header = {'Authorization': 'Bearer correctToken'}
+        self.url = self.base_URL + 'apps/db-change'
+
+    @staticmethod
+    def log_response(url, headers, params):
+        response = mock.Mock()
+        response.status_code = 200
+        offset = params['offset']
+        response.json.return_value = [{'cameraID': str(i), 'timestamp': '2018-07-04'}
+                                      for i in range(offset, min(offset + 3, 7))]
+        return response
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_change_log(self, mock_get):
+        mock_get.side_effect = self.log_response
+        entries = list(self.client.iter_change_log('2018-07-04', '2018-07-05'))
+        self.assertEqual([entry['cameraID'] for entry in entries], [str(i) for i in range(7)])
+        call_list = [mock.call(self.url, headers=self.header,
+                               params={'start': '2018-07-04', 'end': '2018-07-05',
+                                       'offset': offset})
+                     for offset in (0, 3, 6, 7)]
+        self.assertEqual(mock_get.call_args_list, call_list)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_change_log_resume(self, mock_get):
+        mock_get.side_effect = self.log_response
+        changes = self.client.iter_change_log(start='2018-07-04')
+        self.assertEqual(next(changes)['cameraID'], '0')
+        self.assertEqual(next(changes)['cameraID'], '1')
+        cursor = changes.cursor
+        changes.close()
+        self.assertEqual(cursor, {'start': '2018-07-04', 'end': None, 'offset': 2})
+        resumed = self.client.iter_change_log(**cursor)
+        self.assertEqual([entry['cameraID'] for entry in resumed], ['2', '3', '4', '5', '6'])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_change_log_timeouts(self, mock_get):
+        limits = []
+
+        def timed_response(url, headers, params):
+            limits.append(self.client.transport.thread_timeouts())
+            return self.log_response(url, headers, params)
+
+        mock_get.side_effect = timed_response
+        with self.client.timeouts(timeout=(1, 5)):
+            self.assertEqual(7, len(list(self.client.iter_change_log())))
+        self.assertEqual(limits, [((1, 5), None)] * 4)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_iter_change_log_error(self, mock_get):
+        mock_response = mock.Mock()
+        mock_response.status_code = 422
+        mock_response.json.return_value = {'message': 'Format Error Messages'}
+        mock_get.return_value = mock_response
+        with self.assertRaises(FormatError):
+            list(self.client.iter_change_log(start='yesterday'))
+
 class WriteCamTest(BaseClientTest):
 
     def setUp(self):
         super(WriteCamTest, self).setUp()
-        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        # The expected form data is the exact output of the standard library encoder.
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, json_codec='json')
         self.header = {'Authorization': 'Bearer correctToken'}
         self.expected_cameraID = '5ae0ecbd336359291be74c12'
         self.update_url = self.base_URL + 'cameras/' + self.expected_cameraID
         self.create_url = self.base_URL + 'cameras/create'
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_ip(self, mock_put):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1787,7 +2469,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_non_ip(self, mock_put):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1808,7 +2490,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_stream_no_type(self, mock_put):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1828,8 +2510,8 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_update_camera_expired_token_success(self, mock_get, mock_put):
         self.client.token = 'ExpiredToken'
         # set first request.post's result
@@ -1868,7 +2550,7 @@ class WriteCamTest(BaseClientTest):
                      mock.call(self.update_url, headers=self.header, data=data)]
         self.assertEqual(mock_put.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_internal_error(self, mock_put):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1890,7 +2572,7 @@ class WriteCamTest(BaseClientTest):
         mock_put.assert_called_once_with(self.update_url, headers=self.header, data=data)
         self.assertEqual(0, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_all_correct_Format_Error(self, mock_put):
         self.client.token = 'correctToken'
         mock_response = mock.Mock()
@@ -1909,7 +2591,7 @@ class WriteCamTest(BaseClientTest):
         mock_put.assert_called_once_with(self.update_url, headers=self.header, data=data)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
     def test_update_camera_invalid_clientID(self, mock_put):
         self.client.token = "correctToken"
         mock_response = mock.Mock()
@@ -1925,7 +2607,7 @@ class WriteCamTest(BaseClientTest):
         mock_put.assert_called_once_with(self.update_url, headers=self.header, data=data)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_ip(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1956,7 +2638,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_only_ip(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -1980,7 +2662,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_non_ip(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -2008,7 +2690,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_no_snapshot_url(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -2030,7 +2712,7 @@ class WriteCamTest(BaseClientTest):
         mock_post.assert_called_once_with(self.create_url, headers=self.header, data=data)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_stream(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -2064,7 +2746,7 @@ class WriteCamTest(BaseClientTest):
         self.assertEqual(resultID, self.expected_cameraID)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_kwrgs_missing_required(self, mock_post):
 
         # provide token for building header
@@ -2086,8 +2768,8 @@ class WriteCamTest(BaseClientTest):
         mock_post.assert_called_once_with(self.create_url, headers=self.header, data=data)
         self.assertEqual(1, mock_response.json.call_count)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.get')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
     def test_add_camera_expired_token_success(self, mock_get, mock_post):
         self.client.token = 'ExpiredToken'
         # set first request.post's result
@@ -2130,7 +2812,7 @@ class WriteCamTest(BaseClientTest):
                      mock.call(self.create_url, headers=self.header, data=data)]
         self.assertEqual(mock_post.call_args_list, call_list)
 
-    @mock.patch('CAM2CameraDatabaseAPIClient.client.requests.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
     def test_add_camera_internal_error(self, mock_post):
         # provide token for building header
         self.client.token = "correctToken"
@@ -0,0 +1,78 @@
+"""
+This module contains test cases for request coalescing.
+"""
+import threading
+import unittest
+from CAM2CameraDatabaseAPIClient.coalesce import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.group = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def slow(self, value):
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return [value]
+
+    def run_concurrently(self, key, value, count=8):
+        results = [None] * count
+
+        def call(index):
+            try:
+                results[index] = self.group.do(key, self.slow, value)
+            except Exception as error:
+                results[index] = error
+
+        leader = threading.Thread(target=call, args=(0,))
+        leader.start()
+        self.started.wait(5)
+        followers = [threading.Thread(target=call, args=(index,))
+                     for index in range(1, count)]
+        for thread in followers:
+            thread.start()
+        while self.group.shared < count - 1:
+            threading.Event().wait(0.001)
+        self.release.set()
+        for thread in [leader] + followers:
+            thread.join()
+        return results
+
+    def test_shared_result(self):
+        results = self.run_concurrently('key', 'camera')
+        self.assertEqual(self.calls, ['camera'])
+        self.assertEqual(results[0], ['camera'])
+        for result in results:
+            self.assertIs(result, results[0])
+        self.assertEqual(self.group.shared, 7)
+
+    def test_shared_exception(self):
+        error = ValueError('failed')
+        results = self.run_concurrently('key', error)
+        self.assertEqual(len(self.calls), 1)
+        for result in results:
+            self.assertIs(result, error)
+
+    def test_calls_after_completion_run_again(self):
+        self.release.set()
+        self.assertEqual(self.group.do('key', self.slow, 1), [1])
+        self.assertEqual(self.group.do('key', self.slow, 2), [2])
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual(self.group.shared, 0)
+
+    def test_different_keys_not_shared(self):
+        self.release.set()
+        self.group.do('a', self.slow, 1)
+        self.group.do('b', self.slow, 2)
+        self.assertEqual(self.calls, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+This module contains test cases for the JSON codecs.
+"""
+import json
+import unittest
+import mock
+import requests
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient import codec
+from CAM2CameraDatabaseAPIClient.codec import JSONCodec, OrjsonCodec, UJSONCodec, get_codec
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.error import FormatError
+
+
+def available_codecs():
+    codecs = [JSONCodec()]
+    if codec.orjson is not None:
+        codecs.append(OrjsonCodec())
+    if codec.ujson is not None:
+        codecs.append(UJSONCodec())
+    return codecs
+
+
+class CodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.document = [{'cameraID': '1', 'city': u'Zürich', 'latitude': 47.37,
+                          'is_active_image': True, 'state': None,
+                          'retrieval': {'snapshot_url': 'http://example.com/a.jpg'}}]
+
+    def test_round_trip(self):
+        raw = json.dumps(self.document).encode('utf-8')
+        for json_codec in available_codecs():
+            self.assertEqual(json_codec.loads(raw), self.document)
+            self.assertEqual(json_codec.loads(raw.decode('utf-8')), self.document)
+            self.assertEqual(json.loads(json_codec.dumps(self.document)), self.document)
+            self.assertEqual(list(json.loads(json_codec.dumps({'b': 1, 'a': 2},
+                                                              sort_keys=True))), ['a', 'b'])
+
+    def test_get_codec(self):
+        self.assertEqual(type(get_codec('json')), JSONCodec)
+        json_codec = JSONCodec()
+        self.assertIs(get_codec(json_codec), json_codec)
+        with self.assertRaises(FormatError):
+            get_codec('simplejson')
+        with mock.patch.object(codec, 'orjson', None), mock.patch.object(codec, 'ujson', None):
+            self.assertEqual(type(get_codec()), JSONCodec)
+            with self.assertRaises(ImportError):
+                get_codec('orjson')
+
+    @unittest.skipIf(codec.orjson is None, 'orjson is not installed')
+    def test_auto(self):
+        self.assertEqual(type(get_codec('auto')), OrjsonCodec)
+
+    def test_transport_decodes_with_codec(self):
+        for json_codec in available_codecs():
+            transport = cam2.Transport(json_codec=json_codec)
+            self.assertIs(transport.json_codec, json_codec)
+            response = requests.Response()
+            response._content = json.dumps(self.document).encode('utf-8')
+            with mock.patch.object(json_codec, 'loads', wraps=json_codec.loads) as loads:
+                response = requests.hooks.dispatch_hook('response', transport.session.hooks,
+                                                        response)
+                self.assertEqual(response.json(), self.document)
+            if type(json_codec) is not JSONCodec:
+                loads.assert_called_once_with(response.content)
+            transport.close()
+
+
+class ClientCodecTest(unittest.TestCase):
+
+    def test_client_json_codec(self):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, json_codec='json')
+        self.assertEqual(type(client.json_codec), JSONCodec)
+        self.assertIs(client.transport.json_codec, client.json_codec)
+        transport = cam2.Transport(json_codec='json')
+        self.assertIs(cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                  transport=transport).json_codec, transport.json_codec)
+        with self.assertRaises(FormatError):
+            cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, transport=transport,
+                        json_codec='json')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_write_camera_encodes_with_codec(self, mock_post):
+        for json_codec in available_codecs():
+            mock_post.reset_mock()
+            mock_post.return_value.status_code = 201
+            mock_post.return_value.json.return_value = {'cameraID': '1'}
+            client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                 json_codec=json_codec)
+            client.token = 'correctToken'
+            with mock.patch.object(json_codec, 'dumps', wraps=json_codec.dumps) as dumps:
+                client.write_camera(camera_type='non_ip', snapshot_url='http://example.com')
+            dumps.assert_called_once_with({'snapshot_url': 'http://example.com'})
+            retrieval = mock_post.call_args[1]['data']['retrieval']
+            self.assertEqual(json.loads(retrieval), {'snapshot_url': 'http://example.com'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+This module contains test cases for compression and transfer measurement.
+"""
+import gzip
+import io
+import unittest
+from CAM2CameraDatabaseAPIClient.compression import TransferStats, gzip_compress, route_name
+
+
+class CompressionTest(unittest.TestCase):
+
+    def test_route_name(self):
+        base_URL = 'https://cam2-api.herokuapp.com/'
+        self.assertEqual(route_name(base_URL + 'cameras/search?country=USA'), 'cameras/search')
+        self.assertEqual(route_name(base_URL + 'cameras/5ae0ecbc'), 'cameras/{id}')
+        self.assertEqual(route_name(base_URL + 'cameras/legacy/12'), 'cameras/legacy/{id}')
+        self.assertEqual(route_name(base_URL + 'apps/' + '0' * 96 + '/usage'),
+                         'apps/{id}/usage')
+        self.assertEqual(route_name(base_URL + 'apps/db-change'), 'apps/db-change')
+
+    def test_gzip_compress(self):
+        data = '{"cameraID": "1"}' * 100
+        compressed = gzip_compress(data)
+        self.assertLess(len(compressed), len(data))
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(compressed)).read(),
+                         data.encode('utf-8'))
+
+    def test_transfer_stats(self):
+        stats = TransferStats()
+        self.assertEqual(stats.stats(), {})
+        stats.record('cameras/search', 100, 1000)
+        stats.record('cameras/search', 300, 1000)
+        stats.record('auth', 0, 0)
+        self.assertEqual(stats.stats(), {
+            'cameras/search': {'responses': 2, 'wire_bytes': 400, 'decoded_bytes': 2000,
+                               'compression_ratio': 5.0},
+            'auth': {'responses': 1, 'wire_bytes': 0, 'decoded_bytes': 0,
+                     'compression_ratio': None}})
+        stats.reset()
+        self.assertEqual(stats.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
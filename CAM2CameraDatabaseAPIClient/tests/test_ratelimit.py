@@ -0,0 +1,149 @@
+"""
+This module contains test cases for client side rate limiting.
+"""
+import unittest
+import mock
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.error import FormatError, RateLimitError, \
+    DeadlineExceededError
+from CAM2CameraDatabaseAPIClient.ratelimit import TokenBucket, RateLimiter, parse_retry_after
+
+
+class ClockTest(unittest.TestCase):
+    """
+    Runs the rate limiting code on a fake clock advanced by time.sleep.
+    """
+
+    def setUp(self):
+        self.now = [100.0]
+        patcher = mock.patch.object(TokenBucket, '_clock', side_effect=lambda: self.now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sleep = mock.patch('CAM2CameraDatabaseAPIClient.ratelimit.time.sleep',
+                                side_effect=self.advance).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def advance(self, seconds):
+        self.now[0] += seconds
+
+
+class TokenBucketTest(ClockTest):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, capacity=3)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0, 0, 0])
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.advance(10)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.pause(5)
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.acquire(), 5.1)
+
+    def test_timeout(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        self.assertEqual(bucket.acquire(timeout=0), 0)
+        self.assertIsNone(bucket.acquire(timeout=0.5))
+        self.assertFalse(self.sleep.called)
+        self.assertAlmostEqual(bucket.acquire(timeout=1), 1)
+
+
+class RateLimiterTest(ClockTest):
+
+    def setUp(self):
+        super(RateLimiterTest, self).setUp()
+        self.base_URL = cam2.Client.base_URL
+
+    def response(self, status_code, retry_after=None):
+        response = mock.Mock()
+        response.status_code = status_code
+        response.headers = {} if retry_after is None else {'Retry-After': retry_after}
+        return response
+
+    def test_route_class(self):
+        self.assertEqual(RateLimiter.route_class('GET', self.base_URL + 'auth'), 'auth')
+        self.assertEqual(RateLimiter.route_class('GET', self.base_URL + 'cameras/search'),
+                         'search')
+        self.assertEqual(RateLimiter.route_class('GET', self.base_URL + 'apps/db-change'),
+                         'search')
+        self.assertEqual(RateLimiter.route_class('GET', self.base_URL + 'cameras/ID'), 'read')
+        self.assertEqual(RateLimiter.route_class('PUT', self.base_URL + 'cameras/ID'), 'write')
+        self.assertEqual(RateLimiter.route_class('POST', self.base_URL + 'cameras/create'),
+                         'write')
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3)
+        self.assertEqual(parse_retry_after(None), 1)
+        self.assertEqual(parse_retry_after('soon'), 1)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+    def test_rates_and_stats(self):
+        limiter = RateLimiter(rates={'read': 2}, burst={'read': 1})
+        self.assertEqual(limiter.rates['search'], 10)
+        for _ in range(5):
+            limiter.acquire('read')
+        stats = limiter.stats()
+        self.assertEqual(stats['read']['requests'], 5)
+        self.assertAlmostEqual(stats['read']['wait_time'], 2.0)
+        self.assertAlmostEqual(stats['read']['mean_wait'], 0.4)
+        self.assertAlmostEqual(stats['read']['throughput'], 5 / 60.0)
+        self.assertEqual(stats['write']['requests'], 0)
+        self.advance(61)
+        self.assertEqual(limiter.stats()['read']['throughput'], 0)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_transport_honors_retry_after(self, mock_get):
+        mock_get.side_effect = [self.response(429, '30'), self.response(200)]
+        limiter = RateLimiter()
+        transport = cam2.Transport(rate_limiter=limiter)
+        start = self.now[0]
+        response = transport.get(self.base_URL + 'cameras/search', params={'city': 'A'})
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(self.now[0] - start, 30)
+        self.assertEqual(2, mock_get.call_count)
+        mock_get.assert_called_with(self.base_URL + 'cameras/search', params={'city': 'A'})
+        stats = limiter.stats()['search']
+        self.assertEqual((stats['requests'], stats['throttled']), (2, 1))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_transport_gives_up(self, mock_get):
+        mock_get.return_value = self.response(429, '2')
+        transport = cam2.Transport(rate_limiter=RateLimiter(max_retries=2))
+        with self.assertRaises(RateLimitError) as context:
+            transport.get(self.base_URL + 'cameras/ID')
+        self.assertEqual(context.exception.retry_after, 2)
+        self.assertEqual(3, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_transport_deadline_before_retry_after(self, mock_get):
+        mock_get.return_value = self.response(429, '3')
+        limiter = RateLimiter()
+        transport = cam2.Transport(rate_limiter=limiter)
+        with transport.timeouts(deadline=0.5):
+            with self.assertRaises(DeadlineExceededError):
+                transport.get(self.base_URL + 'cameras/ID')
+        self.assertEqual(1, mock_get.call_count)
+        self.assertFalse(self.sleep.called)
+        self.assertEqual(limiter.stats()['read']['requests'], 1)
+
+    def test_client_rate_limiter(self):
+        limiter = RateLimiter()
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, rate_limiter=limiter)
+        self.assertIs(client.transport.rate_limiter, limiter)
+        self.assertIs(client.rate_limiter, limiter)
+        with self.assertRaises(FormatError):
+            cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, transport=cam2.Transport(),
+                        rate_limiter=limiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
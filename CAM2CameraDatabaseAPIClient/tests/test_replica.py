@@ -0,0 +1,125 @@
+"""
+This module contains test cases for the local camera database replica.
+"""
+import unittest
+from datetime import datetime
+import mock
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.camera import NonIPCamera
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.paging import ChangeLogIterator
+from CAM2CameraDatabaseAPIClient.error import ResourceNotFoundError, InternalError
+
+
+def make_camera(cameraID, **fields):
+    camera = NonIPCamera(cameraID=cameraID, camera_type='non_ip', snapshot_url='url',
+                         country='USA', latitude=40.42, longitude=-86.91)
+    camera.update(fields)
+    return camera
+
+
+class CameraReplicaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.client.iter_change_log.side_effect = \
+            lambda **kwargs: ChangeLogIterator(self.client, **kwargs)
+        self.client.search_camera_all.return_value = [
+            make_camera('1'), make_camera('2', country='JP', latitude=35.0, longitude=136.0),
+            make_camera('3')]
+        self.replica = cam2.CameraReplica(self.client, max_workers=4)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.replica._utcnow')
+    def test_snapshot(self, mock_now):
+        mock_now.return_value = datetime(2018, 7, 4, 19, 0, 0)
+        self.replica.snapshot()
+        self.client.search_camera_all.assert_called_once_with(max_workers=4)
+        self.assertEqual(len(self.replica), 3)
+        self.assertEqual(self.replica.watermark, datetime(2018, 7, 4, 19, 0, 0))
+        self.assertEqual(self.replica.camera_by_id('2')['country'], 'JP')
+        with self.assertRaises(ResourceNotFoundError):
+            self.replica.camera_by_id('4')
+
+    def test_search(self):
+        self.replica.snapshot()
+        self.assertEqual([c['cameraID'] for c in self.replica.search(country='USA')],
+                         ['1', '3'])
+        nearby = self.replica.search(latitude=40.0, longitude=-87.0, radius=100)
+        self.assertEqual(sorted(c['cameraID'] for c in nearby), ['1', '3'])
+        self.assertEqual(self.replica.search(camera_type='ip'), [])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.replica._utcnow')
+    def test_sync(self, mock_now):
+        mock_now.return_value = datetime(2018, 7, 4, 19, 0, 0)
+        self.replica.snapshot()
+        mock_now.return_value = datetime(2018, 7, 4, 20, 0, 0)
+        self.client.get_change_log.side_effect = [
+            [{'cameraID': '1', 'timestamp': '2018-07-04T19:52:52.337Z'},
+             {'cameraID': '3', 'timestamp': '2018-07-04T19:53:52.337Z'}],
+            [{'cameraID': '1', 'timestamp': '2018-07-04T19:54:52.337Z'},
+             {'cameraID': '4', 'timestamp': '2018-07-04T19:55:52.337Z'}],
+            []]
+        self.client.camera_by_list_id.return_value = (
+            [make_camera('1', country='CA'), make_camera('4')],
+            {'3': ResourceNotFoundError('No camera found')})
+
+        self.assertEqual(self.replica.sync(), 3)
+        self.assertEqual(self.client.get_change_log.call_args_list, [
+            mock.call('2018-07-04T18:59:00', '2018-07-04T20:00:00', 0),
+            mock.call('2018-07-04T18:59:00', '2018-07-04T20:00:00', 2),
+            mock.call('2018-07-04T18:59:00', '2018-07-04T20:00:00', 4)])
+        self.client.camera_by_list_id.assert_called_once_with(['1', '3', '4'], [],
+                                                              max_workers=4,
+                                                              return_errors=True)
+        self.assertEqual(sorted(c['cameraID'] for c in self.replica.search()), ['1', '2', '4'])
+        self.assertEqual(self.replica.camera_by_id('1')['country'], 'CA')
+        self.assertEqual(self.replica.watermark, datetime(2018, 7, 4, 20, 0, 0))
+
+    def test_sync_error_keeps_watermark(self):
+        self.replica.snapshot()
+        watermark = self.replica.watermark
+        self.client.get_change_log.side_effect = [[{'cameraID': '1'}], []]
+        self.client.camera_by_list_id.return_value = ([], {'1': InternalError()})
+        with self.assertRaises(InternalError):
+            self.replica.sync()
+        self.assertEqual(self.replica.watermark, watermark)
+        self.assertEqual(len(self.replica), 3)
+
+    def test_first_sync_takes_snapshot(self):
+        self.assertEqual(self.replica.sync(), 3)
+        self.assertEqual(0, self.client.get_change_log.call_count)
+
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_sync_with_client_cache(self, mock_get):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                             cache=cam2.CameraCache())
+        client.token = 'correctToken'
+        cities = {'1': 'West Lafayette'}
+
+        def route(url, headers=None, params=None):
+            response = mock.Mock()
+            response.status_code = 200
+            camera = {'cameraID': '1', 'type': 'non_ip', 'city': cities['1'],
+                      'retrieval': {'snapshot_url': 'url'}}
+            if url.endswith('cameras/search'):
+                response.json.return_value = [camera] if params.get('offset', 0) == 0 else []
+            elif url.endswith('apps/db-change'):
+                response.json.return_value = [{'cameraID': '1'}] \
+                    if params.get('offset') == 0 else []
+            else:
+                response.json.return_value = camera
+            return response
+
+        mock_get.side_effect = route
+        replica = cam2.CameraReplica(client)
+        replica.snapshot()
+        self.assertEqual(client.camera_by_id('1')['city'], 'West Lafayette')
+        cities['1'] = 'Indianapolis'
+        self.assertEqual(replica.sync(), 1)
+        self.assertEqual(replica.camera_by_id('1')['city'], 'Indianapolis')
+        self.assertEqual(client.camera_by_id('1')['city'], 'Indianapolis')
+
+
+if __name__ == '__main__':
+    unittest.main()
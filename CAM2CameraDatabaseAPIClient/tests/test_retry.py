@@ -0,0 +1,105 @@
+"""
+This module contains test cases for retrying failed requests.
+"""
+import unittest
+import mock
+import requests
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.error import InternalError
+from CAM2CameraDatabaseAPIClient.retry import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [100.0]
+        mock.patch('CAM2CameraDatabaseAPIClient.retry.time.time',
+                   side_effect=lambda: self.now[0]).start()
+        self.sleep = mock.patch('CAM2CameraDatabaseAPIClient.retry.time.sleep',
+                                side_effect=self.advance).start()
+        self.addCleanup(mock.patch.stopall)
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH,
+                                  retry_policy=RetryPolicy(max_retries=3, backoff=1))
+        self.client.token = 'correctToken'
+        self.url = cam2.Client.base_URL + 'cameras/'
+
+    def advance(self, seconds):
+        self.now[0] += seconds
+
+    @staticmethod
+    def response(status_code, body=None):
+        response = mock.Mock()
+        response.status_code = status_code
+        response.json.return_value = body
+        return response
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=3)
+        for attempt, bound in ((0, 0.5), (1, 1), (2, 2), (3, 3), (10, 3)):
+            delays = [policy.delay(attempt) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= bound for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_get_retried(self, mock_get):
+        mock_get.side_effect = [requests.ConnectionError(), self.response(503),
+                                self.response(200, {'cameraID': 'ID', 'type': 'stream',
+                                                    'retrieval': {'m3u8_url': 'url'}})]
+        camera = self.client.camera_by_id('ID')
+        self.assertEqual(camera['m3u8_url'], 'url')
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual(2, self.sleep.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_retries_exhausted(self, mock_get):
+        mock_get.return_value = self.response(500)
+        with self.assertRaises(InternalError):
+            self.client.camera_by_id('ID')
+        self.assertEqual(4, mock_get.call_count)
+        mock_get.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            self.client.camera_by_id('ID')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_max_elapsed(self, mock_get):
+        self.client.retry_policy.max_elapsed = 0
+        mock_get.return_value = self.response(502)
+        with self.assertRaises(InternalError):
+            self.client.camera_by_id('ID')
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_deadline_limits_backoff(self, mock_get):
+        mock_get.return_value = self.response(503)
+        with mock.patch.object(self.client.retry_policy, 'delay', side_effect=[2, 4]):
+            with self.client.timeouts(deadline=5):
+                with self.assertRaises(InternalError):
+                    self.client.camera_by_id('ID')
+        self.assertEqual(2, mock_get.call_count)
+        self.sleep.assert_called_once_with(2)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_client_error_not_retried(self, mock_get):
+        mock_get.return_value = self.response(404, {'message': 'Not found.'})
+        with self.assertRaises(cam2.client.ResourceNotFoundError):
+            self.client.camera_by_id('ID')
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    def test_create_not_retried(self, mock_post, mock_put):
+        mock_post.return_value = self.response(503)
+        with self.assertRaises(InternalError):
+            self.client.write_camera(camera_type='stream', m3u8_url='url')
+        self.assertEqual(1, mock_post.call_count)
+        mock_put.side_effect = [self.response(503), self.response(200, {'cameraID': 'ID'})]
+        self.assertEqual('ID', self.client.write_camera(cameraID='ID', city='A'))
+        self.assertEqual(2, mock_put.call_count)
+        self.client.retry_policy.retry_post = True
+        mock_post.side_effect = [self.response(503), self.response(201, {'cameraID': 'ID'})]
+        self.assertEqual('ID', self.client.write_camera(camera_type='stream', m3u8_url='url'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+This module contains test cases for incremental JSON decoding.
+"""
+import json
+import unittest
+from CAM2CameraDatabaseAPIClient.streaming import iter_json_array
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [{'cameraID': str(i), 'city': u'Zürich', 'latitude': 47.3 + i,
+                       'retrieval': {'snapshot_url': 'url'}} for i in range(20)]
+        self.items += [12345, 'text', [], None, True]
+        self.raw = json.dumps(self.items, ensure_ascii=False).encode('utf-8')
+
+    def test_chunk_sizes(self):
+        for size in (1, 2, 5, 64, len(self.raw)):
+            chunks = [self.raw[i:i + size] for i in range(0, len(self.raw), size)]
+            self.assertEqual(list(iter_json_array(chunks)), self.items)
+
+    def test_text_chunks(self):
+        self.assertEqual(list(iter_json_array(['[1', '23, {"a"', ': 1}', ']'])),
+                         [123, {'a': 1}])
+        self.assertEqual(list(iter_json_array([' [ \n', ' ] '])), [])
+
+    def test_incremental(self):
+        def chunks():
+            yield b'[{"cameraID": "1"}, '
+            raise AssertionError('read past the first item')
+        self.assertEqual(next(iter_json_array(chunks())), {'cameraID': '1'})
+
+    def test_invalid(self):
+        for raw in (b'{"a": 1}', b'', b'[1, 2', b'[1 2]', b'[1, 2,]'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array([raw]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+This module contains test cases for columnar search results.
+"""
+import unittest
+import mock
+try:
+    import numpy as np
+except ImportError:
+    np = None
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.camera import Camera, IPCamera, NonIPCamera, \
+    StreamCameraRecord
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH
+from CAM2CameraDatabaseAPIClient.table import CameraTable
+
+
+ROWS = [
+    {'cameraID': '1', 'type': 'ip', 'country': 'USA', 'state': 'IN', 'latitude': 40.4,
+     'longitude': -86.9, 'legacy_cameraID': 12, 'is_active_image': True,
+     'is_active_video': False, 'retrieval': {'ip': '127.0.0.1', 'port': '80'}},
+    {'cameraID': '2', 'type': 'non_ip', 'country': 'JP', 'state': None, 'latitude': 35.0,
+     'longitude': 136.0, 'is_active_image': True, 'is_active_video': True,
+     'retrieval': {'snapshot_url': 'http://snapshot'}},
+    {'cameraID': '3', 'type': 'stream', 'country': 'USA', 'state': 'CA', 'latitude': None,
+     'longitude': None, 'is_active_image': False, 'is_active_video': True,
+     'retrieval': {'m3u8_url': 'http://stream'}},
+]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class CameraTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = CameraTable.from_json(ROWS)
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.columns['latitude'].dtype, np.float64)
+        self.assertTrue(np.isnan(self.table.columns['latitude'][2]))
+        self.assertEqual(self.table.columns['is_active_video'].tolist(), [False, True, True])
+        self.assertEqual(self.table.categories['country'], ['USA', 'JP'])
+        self.assertEqual(self.table.columns['country'].tolist(), [0, 1, 0])
+        self.assertEqual(self.table.columns['state'].tolist(), [0, -1, 1])
+        self.assertEqual(self.table.column('state').tolist(), ['IN', None, 'CA'])
+        self.assertEqual(self.table.columns['snapshot_url'].tolist(),
+                         [None, 'http://snapshot', None])
+
+    def test_filter(self):
+        usa = self.table.where(country='USA')
+        self.assertEqual(usa.columns['cameraID'].tolist(), ['1', '3'])
+        self.assertEqual(len(self.table.where(country='FR')), 0)
+        video = self.table[self.table.columns['is_active_video'] &
+                           (self.table.mask(camera_type='stream'))]
+        self.assertEqual(video.columns['cameraID'].tolist(), ['3'])
+        self.assertEqual(self.table[1:].columns['cameraID'].tolist(), ['2', '3'])
+
+    def test_row(self):
+        camera = self.table[0]
+        self.assertTrue(isinstance(camera, IPCamera))
+        expected = dict(ROWS[0], city=None, source=None, timezone_id=None,
+                        timezone_name=None, reference_logo=None, reference_url=None,
+                        resolution_width=None, resolution_height=None, frame_rate=None,
+                        utc_offset=None)
+        expected['retrieval'] = dict(ROWS[0]['retrieval'], brand=None, model=None,
+                                     image_path=None, video_path=None)
+        self.assertEqual(camera, Camera.process_json_entry(expected))
+        self.assertEqual(camera.get('legacy_cameraID'), 12)
+        self.assertTrue(isinstance(self.table[1], NonIPCamera))
+        self.assertNotIn('ip', self.table[1])
+        self.assertEqual([camera['cameraID'] for camera in self.table], ['1', '2', '3'])
+
+    def test_record_class(self):
+        table = CameraTable.from_json(ROWS, record_class=cam2.client.CameraRecord)
+        self.assertTrue(isinstance(table[2], StreamCameraRecord))
+        self.assertEqual(table[2].m3u8_url, 'http://stream')
+
+    def test_concat(self):
+        table = CameraTable.concat([CameraTable.from_json(ROWS[2:]),
+                                    CameraTable.from_json(ROWS[:2])])
+        self.assertEqual(table.columns['cameraID'].tolist(), ['3', '1', '2'])
+        self.assertEqual(table.column('country').tolist(), ['USA', 'USA', 'JP'])
+        self.assertEqual(table.column('state').tolist(), ['CA', 'IN', None])
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class SearchCamTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        self.client.token = 'correctToken'
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_table(self, mock_get):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = ROWS
+        mock_get.return_value = mock_response
+        table = self.client.search_camera_table(country='USA')
+        self.assertEqual(len(table), 3)
+        mock_get.assert_called_once_with('https://cam2-api.herokuapp.com/cameras/search',
+                                         headers={'Authorization': 'Bearer correctToken'},
+                                         params={'country': 'USA'})
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_table_all_pages(self, mock_get):
+        def search_response(url, headers, params):
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = [dict(ROWS[1], cameraID=str(i)) for i in
+                                          range(params['offset'], min(params['offset'] + 100,
+                                                                      250))]
+            return response
+
+        mock_get.side_effect = search_response
+        table = self.client.search_camera_table(all_pages=True, max_workers=2)
+        self.assertEqual(table.columns['cameraID'].tolist(), [str(i) for i in range(250)])
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_table_timeouts(self, mock_get):
+        limits = []
+
+        def search_response(url, headers, params):
+            limits.append(self.client.transport.thread_timeouts())
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = [dict(ROWS[1], cameraID=str(i)) for i in
+                                          range(params['offset'], min(params['offset'] + 100,
+                                                                      150))]
+            return response
+
+        mock_get.side_effect = search_response
+        with self.client.timeouts(timeout=(1, 5), deadline=30):
+            deadline = self.client.transport.thread_timeouts()[1]
+            self.client.search_camera_table(all_pages=True, max_workers=2)
+        self.assertEqual([timeout for timeout, _ in limits], [(1, 5)] * 2)
+        for _, worker_deadline in limits:
+            self.assertAlmostEqual(worker_deadline, deadline, places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,248 @@
+"""
+This module contains test cases for the pooled HTTP transport.
+"""
+import gzip
+import io
+import time
+import unittest
+import mock
+import requests
+from urllib3 import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+try:
+    import brotli
+except ImportError:
+    brotli = None
+import CAM2CameraDatabaseAPIClient as cam2
+from CAM2CameraDatabaseAPIClient.config import SECRET_LENGTH, CLIENTID_LENGTH, \
+    CONNECT_TIMEOUT, READ_TIMEOUT, COMPRESS_MIN_SIZE
+from CAM2CameraDatabaseAPIClient.error import DeadlineExceededError
+
+
+class TransportTest(unittest.TestCase):
+
+    def test_pool_config(self):
+        transport = cam2.Transport(pool_connections=2, pool_maxsize=32, pool_block=True)
+        adapter = transport.session.get_adapter('https://cam2-api.herokuapp.com/')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(transport.session.headers['Connection'], 'keep-alive')
+
+    def test_no_keep_alive(self):
+        transport = cam2.Transport(keep_alive=False)
+        self.assertEqual(transport.session.headers['Connection'], 'close')
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.put')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.post')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_request_dispatch(self, mock_get, mock_post, mock_put):
+        transport = cam2.Transport()
+        transport.get('url', params={'a': 1})
+        transport.post('url', data={'b': 2})
+        transport.put('url', data=None)
+        mock_get.assert_called_once_with('url', params={'a': 1})
+        mock_post.assert_called_once_with('url', data={'b': 2})
+        mock_put.assert_called_once_with('url', data=None)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.close')
+    def test_context_manager(self, mock_close):
+        with cam2.Transport():
+            pass
+        self.assertEqual(1, mock_close.call_count)
+
+
+class TimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clientID = '0' * CLIENTID_LENGTH
+        self.clientSecret = '0' * SECRET_LENGTH
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.request')
+    def test_default_timeout(self, mock_request):
+        transport = cam2.Transport()
+        transport.get('http://url', params={'a': 1})
+        mock_request.assert_called_once_with('GET', 'http://url', params={'a': 1},
+                                             allow_redirects=True,
+                                             timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        transport.post('http://url', data=None, timeout=1)
+        self.assertEqual(mock_request.call_args[1]['timeout'], 1)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.request')
+    def test_timeouts_override(self, mock_request):
+        client = cam2.Client(self.clientID, self.clientSecret, timeout=(2, 10))
+        transport = client.transport
+        self.assertEqual(transport.current_timeout(), (2, 10))
+        with client.timeouts(timeout=(1, 5)):
+            transport.get('http://url')
+            self.assertEqual(mock_request.call_args[1]['timeout'], (1, 5))
+            with client.timeouts(deadline=3):
+                connect, read = transport.current_timeout()
+                self.assertEqual(connect, 1)
+                self.assertTrue(2.5 < read <= 3)
+        self.assertEqual(transport.current_timeout(), (2, 10))
+        with client.timeouts(deadline=0):
+            with self.assertRaises(DeadlineExceededError):
+                transport.get('http://url')
+        self.assertEqual(1, mock_request.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_camera_by_list_id_deadline(self, mock_get):
+        def slow_response(url, headers):
+            time.sleep(0.2)
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = {'cameraID': url[-1], 'type': 'stream',
+                                          'retrieval': {'m3u8_url': 'url'}}
+            return response
+        mock_get.side_effect = slow_response
+        client = cam2.Client(self.clientID, self.clientSecret)
+        client.token = 'correctToken'
+        start = time.time()
+        with self.assertRaises(DeadlineExceededError):
+            client.camera_by_list_id([str(i) for i in range(10)], max_workers=2,
+                                     deadline=0.3)
+        self.assertLess(time.time() - start, 1)
+        self.assertLess(mock_get.call_count, 10)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_search_camera_all_deadline(self, mock_get):
+        def page(url, headers, params):
+            time.sleep(0.1)
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = [{'cameraID': str(params['offset'] + i),
+                                           'type': 'stream', 'retrieval': {'m3u8_url': 'url'}}
+                                          for i in range(100)]
+            return response
+        mock_get.side_effect = page
+        client = cam2.Client(self.clientID, self.clientSecret)
+        client.token = 'correctToken'
+        with self.assertRaises(DeadlineExceededError):
+            client.search_camera_all(max_workers=2, deadline=0.35)
+
+
+class ClientTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clientID = '0' * CLIENTID_LENGTH
+        self.clientSecret = '0' * SECRET_LENGTH
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.get')
+    def test_routes_share_transport(self, mock_get):
+        client = cam2.Client(self.clientID, self.clientSecret)
+        session = client.transport.session
+        token_response = mock.Mock()
+        token_response.status_code = 200
+        token_response.json.return_value = {'token': 'correctToken'}
+        mock_get.return_value = token_response
+        client._request_token()
+        self.assertIs(client.transport.session, session)
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.close')
+    def test_client_closes_own_transport(self, mock_close):
+        with cam2.Client(self.clientID, self.clientSecret) as client:
+            self.assertTrue(isinstance(client.transport, cam2.Transport))
+        self.assertEqual(1, mock_close.call_count)
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.Session.close')
+    def test_client_keeps_shared_transport(self, mock_close):
+        transport = cam2.Transport()
+        client = cam2.Client(self.clientID, self.clientSecret, transport=transport)
+        client.close()
+        self.assertIs(client.transport, transport)
+        self.assertEqual(0, mock_close.call_count)
+
+
+
+class CompressionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.url = 'https://cam2-api.herokuapp.com/cameras/search'
+        self.body = b'[' + b', '.join([b'{"cameraID": "1", "type": "non_ip"}'] * 200) + b']'
+
+    def response(self, status_code=200, compressed=True, url=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url or self.url
+        data = gzip.compress(self.body) if compressed else self.body
+        headers = {'Content-Encoding': 'gzip'} if compressed else {}
+        response.raw = HTTPResponse(body=io.BytesIO(data), headers=headers, status=status_code,
+                                    preload_content=False)
+        return response
+
+    def test_accept_encoding(self):
+        transport = cam2.Transport()
+        self.assertEqual(transport.session.headers['Accept-Encoding'], ACCEPT_ENCODING)
+        self.assertTrue(ACCEPT_ENCODING.startswith('gzip'))
+
+    @unittest.skipUnless(brotli is not None and 'br' in ACCEPT_ENCODING,
+                         'urllib3 cannot decode brotli here')
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.adapters.HTTPAdapter.send')
+    def test_brotli_negotiated(self, mock_send):
+        def send(request, **kwargs):
+            self.assertIn('br', request.headers['Accept-Encoding'])
+            response = requests.Response()
+            response.status_code = 200
+            response.url = request.url
+            response.raw = HTTPResponse(body=io.BytesIO(brotli.compress(self.body)),
+                                        headers={'Content-Encoding': 'br'},
+                                        preload_content=False)
+            return response
+
+        mock_send.side_effect = send
+        transport = cam2.Transport()
+        self.assertEqual(len(transport.get(self.url).json()), 200)
+        stats = transport.transfer_stats.stats()['cameras/search']
+        self.assertEqual(stats['decoded_bytes'], len(self.body))
+        self.assertEqual(stats['wire_bytes'], len(brotli.compress(self.body)))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.adapters.HTTPAdapter.send')
+    def test_transfer_measured(self, mock_send):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH)
+        transport = client.transport
+        mock_send.return_value = self.response()
+        self.assertEqual(len(transport.get(self.url).json()), 200)
+        mock_send.return_value = self.response(compressed=False,
+                                               url=self.url.replace('search', '123'))
+        response = transport.get(self.url, stream=True)
+        self.assertEqual(b''.join(response.iter_content(100)), self.body)
+        stats = client.transfer_stats.stats()
+        self.assertEqual(stats['cameras/search']['decoded_bytes'], len(self.body))
+        self.assertEqual(stats['cameras/search']['wire_bytes'], len(gzip.compress(self.body)))
+        self.assertGreater(stats['cameras/search']['compression_ratio'], 10)
+        self.assertEqual(stats['cameras/{id}'], {'responses': 1, 'wire_bytes': len(self.body),
+                                                 'decoded_bytes': len(self.body),
+                                                 'compression_ratio': 1.0})
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.adapters.HTTPAdapter.send')
+    def test_request_compression(self, mock_send):
+        transport = cam2.Transport(compress_requests=True)
+        mock_send.side_effect = lambda request, **kwargs: self.response(201, False)
+        transport.post(self.url, data={'a': 'b'})
+        self.assertNotIn('Content-Encoding', mock_send.call_args[0][0].headers)
+        transport.post(self.url, data={'a': 'b' * COMPRESS_MIN_SIZE})
+        request = mock_send.call_args[0][0]
+        self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(request.body), b'a=' + b'b' * COMPRESS_MIN_SIZE)
+        self.assertEqual(request.headers['Content-Length'], str(len(request.body)))
+
+    @mock.patch('CAM2CameraDatabaseAPIClient.transport.requests.adapters.HTTPAdapter.send')
+    def test_unsupported_compression_falls_back(self, mock_send):
+        transport = cam2.Transport(compress_requests=True)
+        mock_send.side_effect = [self.response(415, False), self.response(201, False)]
+        response = transport.put(self.url, data={'a': 'b' * COMPRESS_MIN_SIZE})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mock_send.call_args_list[1][0][0].body, 'a=' + 'b' * COMPRESS_MIN_SIZE)
+        self.assertFalse(transport.compress_requests)
+
+    def test_client_options(self):
+        client = cam2.Client('0' * CLIENTID_LENGTH, '0' * SECRET_LENGTH, compress_requests=True)
+        self.assertTrue(client.transport.compress_requests)
+        self.assertFalse(cam2.Client('0' * CLIENTID_LENGTH,
+                                     '0' * SECRET_LENGTH).transport.compress_requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+This module contains test cases for the upsert pipeline.
+"""
+import threading
+import unittest
+import mock
+from CAM2CameraDatabaseAPIClient.client import Client
+from CAM2CameraDatabaseAPIClient.upsert import UpsertPipeline, UpsertResult
+from CAM2CameraDatabaseAPIClient.error import FormatError, InternalError, \
+    ResourceConflictError
+
+
+class UpsertPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.existing = {('non_ip', 'old'): 'ID_old', ('ip', '127.0.0.1', '80'): 'ID_ip'}
+        self.lock = threading.Lock()
+        self.created = 0
+        self.client = mock.Mock()
+        self.client.check_camera.side_effect = Client.check_camera
+        self.client.check_cam_exist.side_effect = self.check_cam_exist
+        self.client.write_camera.side_effect = self.write_camera
+        self.pipeline = UpsertPipeline(self.client, max_workers=4)
+
+    def check_cam_exist(self, camera_type, **kwargs):
+        key = (camera_type,) + tuple(kwargs[field] for field in
+                                     ('ip', 'port') if field in kwargs) + \
+            tuple(value for field, value in kwargs.items() if field not in ('ip', 'port'))
+        if key in self.existing:
+            return [{'cameraID': self.existing[key]}]
+        return []
+
+    def write_camera(self, **kwargs):
+        if kwargs.get('snapshot_url') == 'conflict':
+            raise ResourceConflictError('Camera already exists.')
+        if kwargs['cameraID'] is not None:
+            return kwargs['cameraID']
+        with self.lock:
+            self.created += 1
+            return 'ID_new' + str(self.created)
+
+    def test_upsert(self):
+        cameras = [{'camera_type': 'non_ip', 'snapshot_url': 'old', 'city': 'A'},
+                   {'camera_type': 'non_ip', 'snapshot_url': 'new'},
+                   {'camera_type': 'ip', 'ip': '127.0.0.1'},
+                   {'camera_type': 'non_ip', 'snapshot_url': 'new', 'city': 'B'},
+                   {'camera_type': 'stream'},
+                   {'camera_type': 'non_ip', 'snapshot_url': 'conflict'}]
+        results = self.pipeline.upsert(cameras)
+        self.assertEqual(results[0], UpsertResult('ID_old', False, None))
+        self.assertEqual(results[1], UpsertResult('ID_new1', True, None))
+        self.assertEqual(results[2], UpsertResult('ID_ip', False, None))
+        self.assertEqual(results[3], results[1])
+        self.assertTrue(isinstance(results[4].error, FormatError))
+        self.assertTrue(isinstance(results[5].error, ResourceConflictError))
+        self.client.write_camera.assert_any_call(camera_type='non_ip', snapshot_url='old',
+                                                 city='A', cameraID='ID_old')
+        self.assertEqual(4, self.client.check_cam_exist.call_count)
+        self.assertEqual(4, self.client.write_camera.call_count)
+
+    def test_known_keys_are_not_checked_again(self):
+        self.pipeline.upsert([{'camera_type': 'non_ip', 'snapshot_url': 'new'}])
+        results = self.pipeline.upsert([{'camera_type': 'non_ip', 'snapshot_url': 'new',
+                                         'city': 'C'}])
+        self.assertEqual(results, [UpsertResult('ID_new1', False, None)])
+        self.assertEqual(1, self.client.check_cam_exist.call_count)
+
+    def test_retrieval_key(self):
+        self.assertEqual(UpsertPipeline.retrieval_key({'camera_type': 'ip', 'ip': '1.2.3.4',
+                                                       'port': 8080, 'image_path': '/a'}),
+                         ('ip', '1.2.3.4', '8080', '/a', None))
+        with self.assertRaises(FormatError):
+            UpsertPipeline.retrieval_key({'camera_type': 'unknown'})
+
+    def test_internal_error(self):
+        self.client.write_camera.side_effect = InternalError()
+        with self.assertRaises(InternalError):
+            self.pipeline.upsert([{'camera_type': 'non_ip', 'snapshot_url': 'new'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
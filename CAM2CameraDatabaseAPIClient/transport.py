@@ -0,0 +1,351 @@
+"""
+Represents the HTTP transport used by a CAM2 client application.
+"""
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+# Encodings the installed urllib3 decodes: gzip and deflate, and br only if it supports
+# brotli and a brotli package is installed.
+from urllib3.util.request import ACCEPT_ENCODING
+from .codec import JSONCodec, get_codec
+from .compression import TransferStats, gzip_compress, route_name
+from .config import POOL_CONNECTIONS, POOL_MAXSIZE, CONNECT_TIMEOUT, READ_TIMEOUT, \
+    COMPRESS_MIN_SIZE
+from .error import RateLimitError, DeadlineExceededError
+from .ratelimit import parse_retry_after
+
+
+class _Session(requests.Session):
+    """
+    Session applying the timeout of its transport to requests sent without one, and
+    compressing request bodies if the transport does.
+    """
+
+    def __init__(self, transport):
+        super(_Session, self).__init__()
+        self.transport = transport
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.transport.current_timeout()
+        return super(_Session, self).request(method, url, **kwargs)
+
+    def send(self, request, **kwargs):
+        body = request.body
+        if not self.transport.compress_requests or request.method not in ('POST', 'PUT') \
+                or not isinstance(body, (bytes, type(u''))) or len(body) < COMPRESS_MIN_SIZE \
+                or 'Content-Encoding' in request.headers:
+            return super(_Session, self).send(request, **kwargs)
+        compressed = request.copy()
+        compressed.body = gzip_compress(body)
+        compressed.headers['Content-Encoding'] = 'gzip'
+        compressed.headers['Content-Length'] = str(len(compressed.body))
+        response = super(_Session, self).send(compressed, **kwargs)
+        if response.status_code != 415:
+            return response
+        # The API does not accept compressed bodies: send them as they are from now on.
+        self.transport.compress_requests = False
+        response.close()
+        return super(_Session, self).send(request, **kwargs)
+
+
+class Transport(object):
+    """Class representing a pooled, keep-alive HTTP transport.
+
+    Every route of :class:`~CAM2CameraDatabaseAPIClient.client.Client`, including token
+    requests and token retries, goes through a transport so that TCP and TLS connections
+    to the CAM2 Database API are reused instead of being opened for every call.
+
+    Attributes
+    ----------
+    session : :obj:`requests.Session`
+        Underlying session holding the connection pools.
+    json_codec : :obj:`JSONCodec`
+        Codec the ``json()`` method of the responses decodes with.
+    rate_limiter : :obj:`RateLimiter`
+        Rate limiter every request waits for, or None.
+    retry_policy : :obj:`RetryPolicy`
+        Policy retrying the requests that fail because of transient errors, or None.
+    timeout : tuple of float
+        Default connect and read timeouts of the requests, in seconds.
+    circuit_breaker : :obj:`CircuitBreaker`
+        Circuit breaker failing requests fast while the API is unavailable, or None.
+    compress_requests : bool
+        Whether large POST and PUT bodies are sent gzip compressed.
+    transfer_stats : :obj:`TransferStats`
+        Wire and decoded bytes of the responses received from each route.
+
+    Note
+    ----
+
+        A transport can be shared by several clients, for example to cap the total number
+        of connections a worker process opens to the API.
+
+    """
+
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, json_codec='auto', rate_limiter=None,
+                 retry_policy=None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 circuit_breaker=None, compress_requests=False):
+
+        """Transport initialization method.
+
+        Parameters
+        ----------
+        pool_connections : int, optional
+            Number of per-host connection pools to keep.
+        pool_maxsize : int, optional
+            Maximum number of connections kept alive to a single host.
+        pool_block : bool, optional
+            If True, a thread waits for a free connection once ``pool_maxsize``
+            connections to a host are in use instead of opening an extra one.
+            This turns ``pool_maxsize`` into a hard per-host connection limit.
+        keep_alive : bool, optional
+            If False, every connection is closed after its response is read.
+        json_codec : str or :obj:`JSONCodec`, optional
+            JSON backend of the responses, see :func:`get_codec`. By default the
+            fastest installed one among orjson, ujson and the standard library.
+        rate_limiter : :obj:`RateLimiter`, optional
+            Rate limits of the requests sent through this transport, which also
+            handles 429 responses. Requests are not limited if not provided.
+        retry_policy : :obj:`RetryPolicy`, optional
+            Policy retrying the requests that fail because of a connection error, a
+            timeout or a server error. Requests are sent once if not provided.
+        timeout : float or tuple of float, optional
+            Number of seconds to wait for a connection to be established and for
+            the API between two bytes of a response, given as a (connect, read) pair
+            or as a single value for both. None waits forever.
+        circuit_breaker : :obj:`CircuitBreaker`, optional
+            Circuit breaker of the requests sent through this transport.
+            Requests are always sent if not provided.
+        compress_requests : bool, optional
+            If True, POST and PUT bodies of at least ``COMPRESS_MIN_SIZE`` bytes are
+            sent gzip compressed. If the API answers 415 Unsupported Media Type, the
+            body is sent again uncompressed and compression is turned off.
+
+        Responses are always requested gzip compressed, or brotli compressed when the
+        installed urllib3 can decode brotli, which takes urllib3 1.25 or later and a
+        brotli package.
+
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.compress_requests = compress_requests
+        self.transfer_stats = TransferStats()
+        self._local = threading.local()
+        self.session = _Session(self)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.session.hooks['response'].append(self._measure_transfer)
+        self.json_codec = get_codec(json_codec)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        if type(self.json_codec) is not JSONCodec:
+            self.session.hooks['response'].append(self._decode_with_codec)
+
+    def current_timeout(self):
+        """
+        Return the (connect, read) timeout of a request sent now by the calling thread,
+        taking into account the :meth:`timeouts` it runs in.
+
+        Raises
+        ------
+        DeadlineExceededError
+            If the deadline of the calling thread has passed.
+        """
+        timeout = getattr(self._local, 'timeout', None) or self.timeout
+        deadline = getattr(self._local, 'deadline', None)
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise DeadlineExceededError()
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return tuple(remaining if value is None else min(value, remaining)
+                     for value in timeout)
+
+    def thread_timeouts(self):
+        """
+        Return the timeout and deadline set by :meth:`timeouts` for the calling thread,
+        each None if not set. The deadline is a :func:`time.time` value.
+        """
+        return getattr(self._local, 'timeout', None), getattr(self._local, 'deadline', None)
+
+    @contextmanager
+    def timeouts(self, timeout=None, deadline=None):
+        """
+        Override the timeout of the requests sent by the calling thread, and give them
+        an overall deadline.
+
+        Parameters
+        ----------
+        timeout : float or tuple of float, optional
+            Connect and read timeouts replacing the default ones of the transport.
+        deadline : float, optional
+            Number of seconds from now after which no request is sent; the timeouts
+            of the requests are shortened so that none of them waits past it.
+            Nested deadlines keep the earliest one.
+
+        Raises
+        ------
+        DeadlineExceededError
+            If a request is sent after the deadline.
+
+        Example
+        -------
+
+            with transport.timeouts(timeout=(1, 5), deadline=20):
+                client.camera_by_id(cameraID)
+
+        """
+        previous = (getattr(self._local, 'timeout', None),
+                    getattr(self._local, 'deadline', None))
+        if timeout is not None:
+            self._local.timeout = timeout
+        if deadline is not None:
+            deadline = time.time() + deadline
+            self._local.deadline = deadline if previous[1] is None else min(deadline,
+                                                                             previous[1])
+        try:
+            yield
+        finally:
+            self._local.timeout, self._local.deadline = previous
+
+    def _measure_transfer(self, response, *args, **kwargs):
+        # The body, streamed or not, is read through iter_content; count it there.
+        iter_content = response.iter_content
+        measured = []
+
+        def counted(*args, **kwargs):
+            decoded_bytes = 0
+            try:
+                for chunk in iter_content(*args, **kwargs):
+                    decoded_bytes += len(chunk)
+                    yield chunk
+            finally:
+                if not measured:
+                    measured.append(True)
+                    wire_bytes = getattr(response.raw, 'tell', lambda: decoded_bytes)()
+                    self.transfer_stats.record(route_name(response.url), wire_bytes,
+                                               decoded_bytes)
+
+        response.iter_content = counted
+        return response
+
+    def _decode_with_codec(self, response, *args, **kwargs):
+        # Make response.json() parse the raw body with the faster backend.
+        loads = self.json_codec.loads
+        response.json = lambda **kwargs: loads(response.content)
+        return response
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the pooled session.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method, one of 'GET', 'POST' or 'PUT'.
+        url : str
+            Absolute url of the route.
+        **kwargs
+            Passed unchanged to the matching :obj:`requests.Session` method.
+
+        Returns
+        -------
+        :obj:`requests.Response`
+            Response of the API.
+
+        Raises
+        ------
+        RateLimitError
+            If the transport has a rate limiter and the API still answers 429 after
+            the request was sent again the allowed number of times.
+        requests.RequestException
+            If the request could not be sent, after the retries of the retry policy.
+        DeadlineExceededError
+            If the deadline set by :meth:`timeouts` has passed.
+        CircuitOpenError
+            If the transport has a circuit breaker and the circuit of the route
+            family is open.
+
+        """
+        if self.retry_policy is None:
+            return self._guarded(method, url, **kwargs)
+        return self.retry_policy.call(method, lambda: self._guarded(method, url, **kwargs),
+                                      self.thread_timeouts()[1])
+
+    def _guarded(self, method, url, **kwargs):
+        if self.circuit_breaker is None:
+            return self._limited(method, url, **kwargs)
+        family = self.circuit_breaker.route_family(url)
+        probe = self.circuit_breaker.before_request(family)
+        success = None
+        try:
+            response = self._limited(method, url, **kwargs)
+            success = response.status_code < 500
+            return response
+        except requests.RequestException:
+            success = False
+            raise
+        finally:
+            self.circuit_breaker.record(family, success, probe)
+
+    def _limited(self, method, url, **kwargs):
+        # Fail fast, before waiting for the rate limiter, once the deadline has passed.
+        self.current_timeout()
+        if self.rate_limiter is None:
+            return self._send(method, url, **kwargs)
+        route = self.rate_limiter.route_class(method, url)
+        deadline = self.thread_timeouts()[1]
+        for _ in range(self.rate_limiter.max_retries + 1):
+            remaining = None if deadline is None else deadline - time.time()
+            if self.rate_limiter.acquire(route, remaining) is None:
+                # Waiting for the limiter, e.g. after a long Retry-After, would pass it.
+                raise DeadlineExceededError()
+            response = self._send(method, url, **kwargs)
+            if response.status_code != 429:
+                return response
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.rate_limiter.throttle(route, retry_after)
+        raise RateLimitError('Too many requests to ' + url + '.', retry_after)
+
+    def _send(self, method, url, **kwargs):
+        if method == 'GET':
+            return self.session.get(url, **kwargs)
+        if method == 'POST':
+            return self.session.post(url, **kwargs)
+        return self.session.put(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def close(self):
+        """
+        Close every pooled connection of this transport.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,193 @@
+"""
+Represents a pipeline creating or updating cameras without duplicating them.
+"""
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .config import MAX_WORKERS
+from .error import Error, FormatError, ResourceConflictError, ResourceNotFoundError
+from .ratelimit import TokenBucket
+
+UpsertResult = namedtuple('UpsertResult', ['cameraID', 'created', 'error'])
+UpsertResult.__doc__ = """Result of the upsert of one camera.
+
+Attributes
+----------
+cameraID : str
+    Id of the camera created or updated, None if the upsert failed.
+created : bool
+    True if the camera was created, False if an existing camera was updated.
+error : :obj:`Error`
+    Error the upsert failed with, None if it succeeded.
+"""
+
+_RETRIEVAL_KEY_FIELDS = {'ip': ('ip', 'port', 'image_path', 'video_path'),
+                         'non_ip': ('snapshot_url',),
+                         'stream': ('m3u8_url',)}
+
+
+class UpsertPipeline(object):
+    """Class representing a pipeline adding cameras that do not exist yet and updating
+    those that do.
+
+    A camera is identified by its retrieval method: ip, port and paths for an ip
+    camera, snapshot_url for a non-ip camera and m3u8_url for a stream camera.
+    For every candidate, the pipeline looks the camera up with
+    :meth:`~CAM2CameraDatabaseAPIClient.client.Client.check_cam_exist`, then creates it
+    or updates the existing camera with
+    :meth:`~CAM2CameraDatabaseAPIClient.client.Client.write_camera`. Candidates are
+    processed concurrently, each one writing as soon as its own check returns.
+
+    The outcome of each check is remembered by retrieval key, including the keys that
+    do not exist yet, so feeding the pipeline successive batches of a stream checks
+    each camera only once; candidates sharing a key within a batch are written once.
+
+    Warning
+    ---------
+    Writing cameras requires admin permission.
+
+    Attributes
+    ----------
+    client : :obj:`Client`
+        Client used to check and write cameras.
+    max_workers : int
+        Maximum number of candidates processed at the same time.
+
+    Example
+    -------
+
+        pipeline = UpsertPipeline(client, max_rate=50)
+        for batch in scraper_batches:
+            results = pipeline.upsert(batch)
+
+    """
+
+    def __init__(self, client, max_workers=MAX_WORKERS, max_rate=None):
+
+        """UpsertPipeline initialization method.
+
+        Parameters
+        ----------
+        client : :obj:`Client`
+            Client used to check and write cameras.
+        max_workers : int, optional
+            Maximum number of candidates processed at the same time.
+        max_rate : float, optional
+            Maximum number of cameras written per second. Not limited if not provided.
+
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self._bucket = TokenBucket(max_rate) if max_rate is not None else None
+        self._known = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def retrieval_key(camera):
+        """
+        Return the key identifying a camera by its retrieval method.
+
+        Parameters
+        ----------
+        camera : dict
+            Keyword arguments of :meth:`Client.write_camera`.
+
+        Raises
+        ------
+        FormatError
+            If the camera type is not valid or its retrieval fields are missing.
+        """
+        camera_type = camera.get('camera_type')
+        if camera_type not in _RETRIEVAL_KEY_FIELDS:
+            raise FormatError('camera_type should be one of ' +
+                              str(sorted(_RETRIEVAL_KEY_FIELDS)) + '.')
+        fields = _RETRIEVAL_KEY_FIELDS[camera_type]
+        if camera.get(fields[0]) is None:
+            raise FormatError(fields[0] + ' is required to identify a ' + camera_type +
+                              ' camera.')
+        values = [camera.get(field) for field in fields]
+        if camera_type == 'ip':
+            # The API stores ip cameras without a port on port 80.
+            values[1] = str(values[1] if values[1] is not None else 80)
+        return (camera_type,) + tuple(values)
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._known:
+                return self._known[key]
+        camera_type = key[0]
+        params = {field: value for field, value in zip(_RETRIEVAL_KEY_FIELDS[camera_type],
+                                                       key[1:]) if value is not None}
+        cameras = self.client.check_cam_exist(camera_type, **params)
+        cameraID = cameras[0]['cameraID'] if cameras else None
+        with self._lock:
+            return self._known.setdefault(key, cameraID)
+
+    def _upsert_one(self, key, camera):
+        cameraID = self._lookup(key)
+        row = dict(camera, cameraID=cameraID)
+        if self._bucket is not None:
+            self._bucket.acquire()
+        cameraID = self.client.write_camera(**row)
+        with self._lock:
+            self._known[key] = cameraID
+        return UpsertResult(cameraID, row['cameraID'] is None, None)
+
+    def upsert(self, cameras):
+        """
+        Create or update a batch of cameras.
+
+        Parameters
+        ----------
+        cameras : iterable of dict
+            Keyword arguments of :meth:`Client.write_camera` for each camera,
+            without cameraID.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`UpsertResult`
+            The result of each camera, in order. A camera with the same retrieval key
+            as an earlier one of the batch gets the result of that one.
+
+        Raises
+        ------
+        AuthenticationError
+            If the client is not allowed to write cameras.
+            The cameras not processed yet are not sent.
+        InternalError
+            If there is an API internal error.
+            The cameras not processed yet are not sent.
+        """
+        cameras = list(cameras)
+        results = [None] * len(cameras)
+        first = {}
+        duplicates = []
+        for index, camera in enumerate(cameras):
+            try:
+                if camera.get('cameraID') is not None:
+                    raise FormatError('cameraID is found by the pipeline and cannot be set.')
+                self.client.check_camera(camera)
+                key = self.retrieval_key(camera)
+            except FormatError as err:
+                results[index] = UpsertResult(None, False, err)
+                continue
+            if key in first:
+                duplicates.append((index, first[key]))
+            else:
+                first[key] = index
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(index, pool.submit(self._upsert_one, key, cameras[index]))
+                       for key, index in first.items()]
+            for index, future in futures:
+                try:
+                    results[index] = future.result()
+                except (FormatError, ResourceConflictError, ResourceNotFoundError) as err:
+                    results[index] = UpsertResult(None, False, err)
+                except Error:
+                    for _, waiting in futures:
+                        waiting.cancel()
+                    raise
+        for index, original in duplicates:
+            results[index] = results[original]
+        return results
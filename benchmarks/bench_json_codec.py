@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of the JSON codecs on realistic camera payloads.
+
+Measures decoding a search response page and encoding the retrieval field of
+write_camera for every installed backend.
+
+Usage::
+
+    python benchmarks/bench_json_codec.py [rows] [repeat]
+
+"""
+import sys
+import timeit
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from CAM2CameraDatabaseAPIClient.codec import get_codec  # pylint: disable=wrong-import-position
+from bench_process_json import make_response  # pylint: disable=wrong-import-position
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    baseline = get_codec('json')
+    body = baseline.dumps(make_response(rows)).encode('utf-8')
+    retrieval = {'ip': '127.0.0.1', 'port': '80', 'brand': 'brand', 'model': None,
+                 'image_path': '/image.jpg', 'video_path': None}
+    number = max(1, 100000 // rows)
+
+    print('{0} cameras, {1} bytes per page'.format(rows, len(body)))
+    base_rates = {}
+    for name in ('json', 'ujson', 'orjson'):
+        try:
+            json_codec = get_codec(name)
+        except ImportError:
+            print('{0:<8} not installed'.format(name))
+            continue
+        assert json_codec.loads(body) == baseline.loads(body)
+        cases = [
+            ('decode page', lambda: json_codec.loads(body), number, rows),
+            ('encode retrieval', lambda: json_codec.dumps(retrieval, sort_keys=True),
+             number * rows, 1),
+        ]
+        for case, func, loops, items in cases:
+            best = min(timeit.repeat(func, number=loops, repeat=repeat))
+            rate = loops * items / best
+            base_rates.setdefault(case, rate)
+            print('{0:<8}{1:<18}{2:>14,.0f} rows/s{3:>8.2f}x'.format(
+                name, case, rate, rate / base_rates[case]))
+
+
+if __name__ == '__main__':
+    main()
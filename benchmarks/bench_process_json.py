@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of decoding a search response into camera objects.
+
+Compares the row by row ``process_json(**row)`` call used before with the
+bulk ``process_json_array`` path, for both record formats.
+
+Usage::
+
+    python benchmarks/bench_process_json.py [rows] [repeat]
+
+"""
+import sys
+import timeit
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from CAM2CameraDatabaseAPIClient.camera import Camera, IPCamera, NonIPCamera, \
+    StreamCamera, CameraRecord  # pylint: disable=wrong-import-position
+
+
+def legacy_process_json(**dict_entries):
+    """Camera.process_json as it was before the dispatch table."""
+    dict_entries['camera_type'] = dict_entries['type']
+    dict_entries.pop('type', None)
+    dict_entries.update(dict_entries['retrieval'])
+    dict_entries.pop('retrieval', None)
+
+    if dict_entries['camera_type'] == 'ip':
+        return IPCamera(**dict_entries)
+    if dict_entries['camera_type'] == 'non_ip':
+        return NonIPCamera(**dict_entries)
+    if dict_entries['camera_type'] == 'stream':
+        return StreamCamera(**dict_entries)
+    return None
+
+
+def make_response(rows):
+    """Build a search response of the given number of cameras of every type."""
+    retrievals = {
+        'ip': {'ip': '127.0.0.1', 'port': '80', 'brand': 'brand', 'model': 'model',
+               'image_path': '/image.jpg', 'video_path': '/video.mjpg'},
+        'non_ip': {'snapshot_url': 'http://example.com/snapshot.jpg'},
+        'stream': {'m3u8_url': 'http://example.com/stream.m3u8'},
+    }
+    types = sorted(retrievals)
+    response = []
+    for index in range(rows):
+        camera_type = types[index % len(types)]
+        response.append({
+            'cameraID': 'camera' + str(index), 'legacy_cameraID': index,
+            'type': camera_type, 'source': 'source', 'frame_rate': 10,
+            'country': 'USA', 'state': 'IN', 'city': 'West Lafayette',
+            'longitude': -86.9, 'latitude': 40.4, 'is_active_image': True,
+            'is_active_video': False, 'resolution_width': 1920, 'resolution_height': 1080,
+            'utc_offset': -5, 'timezone_id': 'America/Indiana/Indianapolis',
+            'timezone_name': 'Eastern Standard Time', 'reference_logo': None,
+            'reference_url': None, 'retrieval': dict(retrievals[camera_type]),
+        })
+    return response
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    response = make_response(rows)
+
+    cases = [
+        ('legacy process_json(**row)',
+         lambda: [legacy_process_json(**row) for row in response]),
+        ('Camera.process_json(**row)',
+         lambda: [Camera.process_json(**row) for row in response]),
+        ('Camera.process_json_array',
+         lambda: Camera.process_json_array(response)),
+        ('CameraRecord.process_json(**row)',
+         lambda: [CameraRecord.process_json(**row) for row in response]),
+        ('CameraRecord.process_json_array',
+         lambda: CameraRecord.process_json_array(response)),
+    ]
+    assert cases[0][1]() == cases[2][1]()
+    baseline = None
+    for name, case in cases:
+        best = min(timeit.repeat(case, number=1, repeat=repeat))
+        rate = rows / best
+        baseline = baseline or rate
+        print('{0:<36}{1:>12,.0f} rows/s{2:>8.2f}x'.format(name, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
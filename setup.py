@@ -23,4 +23,9 @@ setup(
     ],
     python_requires = '>=2.6, !=3.0.*, !=3.1.*, !=3.2.*, <4',
     #install_requires = []
+    extras_require = {
+        'async': ['aiohttp'],
+        'table': ['numpy'],
+        'fastjson': ['orjson'],
+    },
 )
\ No newline at end of file